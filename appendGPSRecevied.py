@@ -10,8 +10,23 @@
 # Author:      John Spence
 #
 # Created:     09/04/2019
-# Modified:    09/07/2019
+# Modified:    10/18/2026
 # Modification Purpose:
+#              10/18/2026 - Full sweeps also take every row after the watermark,
+#                           so rows sent before the lookback window are not
+#                           skipped.
+#              10/18/2026 - Extract capped at the SentToGIS_Date the watermark
+#                           moves to, and fixes already in storage skipped so
+#                           a full sweep does not append them twice.
+#              10/18/2026 - Scratch copy is now an extract of the complete
+#                           fixes in the window with coordinates, carrying
+#                           only the GPS fields, in place of a full table
+#                           copy that was then purged and trimmed.
+#              10/18/2026 - Runs transfer only rows completed since a persisted
+#                           SentToGIS_Date watermark, with the lookback window
+#                           swept every full_sweep_hours.
+#              10/18/2026 - Lookback predicate rewritten as a plain range on
+#                           SentToGIS_Date so it can use an index.
 #              09/07/2019 - Complete code review (internal) and cleaned up messy
 #                           code.  Expanding reporting capabilities along with 
 #                           making several changes that would take the code from
@@ -58,6 +73,13 @@ target_table = 'AMIReplacement2020'
 # Lookback window...To be used ONLY during testing.  Set to 0 otherwise.
 lookback = 0
 
+# High water mark.  Each run only transfers rows completed after the last
+# SentToGIS_Date transferred, kept in watermark_file next to this script.
+# Every full_sweep_hours the lookback window is used instead to pick up
+# stragglers.  Set watermark_file to '' to always use the lookback window.
+watermark_file = 'appendGPSRecevied_watermark.json'
+full_sweep_hours = 24
+
 # Projection settings
 # Set projection WKID
 pub_projectSRID = 2926
@@ -78,16 +100,78 @@ mail_from = ''
 # ------------------------------------------------------------------------------
 
 # Import Python libraries
-import arcpy, time, smtplib, string, re, os
+import arcpy, time, smtplib, string, re, os, json
 import pandas as pd
 import datetime
 from arcpy import env
 from datetime import datetime
 
+# Fields carried over to long term storage.
+gps_fields = ["WorkOrderNumber", "FoundLatitude", "FoundLongitude", "FoundGPSPDOP", "FoundGPSHDOP", "FoundGPSVDOP", "FoundAltitude"]
+
+def loadWatermark():
+
+    global watermark
+    global full_sweep
+
+    # Start from the lookback window unless a recent watermark says otherwise.
+    watermark = {'SentToGIS_Date': None, 'FullSweep': 0}
+    full_sweep = True
+
+    if watermark_file != '':
+        try:
+            with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), watermark_file)) as watermark_read:
+                watermark.update(json.load(watermark_read))
+            full_sweep = watermark['SentToGIS_Date'] == None or time.time() - watermark['FullSweep'] >= full_sweep_hours * 3600
+        except (IOError, ValueError) as watermark_fail:
+            print ("   No usable watermark found.  Using the lookback window.")
+            print (watermark_fail)
+
+    if full_sweep == True and watermark['SentToGIS_Date'] != None:
+        print ("   Sweeping the lookback window and rows completed after {0}.\n".format(watermark['SentToGIS_Date']))
+    elif full_sweep == True:
+        print ("   Sweeping the lookback window.\n")
+    else:
+        print ("   Reading rows completed after {0}.\n".format(watermark['SentToGIS_Date']))
+
+    return watermark, full_sweep
+
+def sent_predicate():
+
+    # Full sweeps keep the original lookback window, otherwise only rows sent
+    # after the watermark are looked at.  A full sweep still takes everything
+    # after the watermark too, since the window can start after it.
+    if full_sweep == True and watermark['SentToGIS_Date'] == None:
+        return '[SentToGIS_Date] >= convert (date, getdate()-{0})'.format(lookback)
+    elif full_sweep == True:
+        return "([SentToGIS_Date] > '{0}' or [SentToGIS_Date] >= convert (date, getdate()-{1}))".format(watermark['SentToGIS_Date'], lookback)
+    else:
+        return "[SentToGIS_Date] > '{0}'".format(watermark['SentToGIS_Date'])
+
+def saveWatermark():
+
+    if watermark_file == '':
+        return
+
+    if pending_max != None:
+        watermark['SentToGIS_Date'] = pending_max
+    if full_sweep == True:
+        watermark['FullSweep'] = time.time()
+
+    try:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), watermark_file), 'w') as watermark_write:
+            json.dump(watermark, watermark_write)
+    except IOError as watermark_fail:
+        print ("   FAILURE:  Watermark not saved.  Next run will start from the old one.")
+        print (watermark_fail)
+
+    return
+
 def check4udpate(source_db_connection, sd_schema, sd_table):
 
     global pending_update
     global update_count
+    global pending_max
 
  #   check_update_SQL = '''
  #   select [WorkOrderNumber] from [{0}].[{1}]
@@ -98,10 +182,10 @@ def check4udpate(source_db_connection, sd_schema, sd_table):
  #   '''.format(sd_schema, sd_table, lookback)
 
     check_update_SQL = '''
-    select count(*) from [{0}].[{1}]
-    where convert(date, [SentToGIS_Date]) >= convert (date, getdate()-{2})
+    select count(*), convert(varchar(23), max([SentToGIS_Date]), 121) from [{0}].[{1}]
+    where {2}
     and [SentToGIS_Status] = 'Complete'
-    '''.format(sd_schema, sd_table, lookback)
+    '''.format(sd_schema, sd_table, sent_predicate())
 
     check_update_return = arcpy.ArcSDESQLExecute(source_db_connection).execute(check_update_SQL)
 
@@ -113,10 +197,13 @@ def check4udpate(source_db_connection, sd_schema, sd_table):
     #    pending_update = [row for row in check_update_return]
     #    pending_update = len(pending_update)
 
-    if check_update_return == None:
+    pending_max = None
+
+    if check_update_return == None or check_update_return == True:
         pending_update = 0
     else:
-        pending_update = check_update_return
+        pending_update = int(check_update_return[0][0])
+        pending_max = check_update_return[0][1]
 
     # Build Connection String
     data_source = source_db_connection + '\\{0}.{1}'.format(sd_schema, sd_table)
@@ -154,7 +241,7 @@ def prepData(source_db_connection, processing_db_connection, sd_schema, sd_datas
     copy_layer_over (input_connection, output_connection, pub_layerfullname)
 
     # Cleanup data in layer
-    cleanup_layer (processing_db_connection, pub_layerfullname, sd_schema, sd_table, lookback)
+    cleanup_layer (processing_db_connection, pub_layerfullname)
 
     # Project layer to desired coordinate system
     project_layer (processing_db_connection, pub_layerfullname, pub_projectSRID, pub_transMethod)
@@ -233,14 +320,33 @@ def copy_layer_over (input_connection, output_connection, pub_layerfullname):
     input_connection = input_connection + '\\' + current_db + '.' + pub_layerfullname
     output_connection = output_connection + '\\' + target_db + '.' + pub_layerfullname
 
+    # Only complete fixes in the window with coordinates, and only the fields
+    # that go to long term storage, are pulled over.  The rest are hidden on
+    # the extract layer.  Rows sent after check4udpate took pending_max are
+    # left for the next run, which starts above it.
+    extract_where = '''{0}
+    and [SentToGIS_Date] <= '{1}'
+    and [SentToGIS_Status] = 'Complete'
+    and [FoundLatitude] is not NULL
+    and [FoundLongitude] is not NULL'''.format(sent_predicate(), pending_max)
+
+    extract_fields = []
+    for field in arcpy.ListFields(input_connection):
+        if field.required or field.name in gps_fields:
+            extract_fields.append('{0} {0} VISIBLE NONE'.format(field.name))
+        else:
+            extract_fields.append('{0} {0} HIDDEN NONE'.format(field.name))
+
     # Set workspace and keyword
     arcpy.env.workspace = output_connection
     arcpy.env.configKeyword= "Geometry"
 
     # Copy Over
     try:
-        print ("  Copying {0} from {1} to {2}.....".format(pub_layerfullname, current_db, target_db))
-        arcpy.Copy_management(input_connection, output_connection)
+        print ("  Extracting GPS fixes in {0} from {1} to {2}.....".format(pub_layerfullname, current_db, target_db))
+        extract_layer = arcpy.MakeFeatureLayer_management(input_connection, 'gps_extract', extract_where, None, ';'.join(extract_fields)).getOutput(0)
+        arcpy.CopyFeatures_management(extract_layer, output_connection)
+        arcpy.Delete_management(extract_layer)
         print ("     {0} successfully copied to {1}\n\n".format(pub_layerfullname, target_db))
 
     except:
@@ -248,40 +354,9 @@ def copy_layer_over (input_connection, output_connection, pub_layerfullname):
 
     return
 
-def cleanup_layer (processing_db_connection, pub_layerfullname, sd_schema, sd_table, lookback):
-
-    print ("  Preparing to scrub layer of undesireable data and reformating.....\n")
-
-    # Delete records that do not need to be added.
-    print ("  Removing non-complete and NULL Lat/Long Record records...")
-    try:
-        clean_tbl_sql = '''
-        delete from [{0}].[{1}]
-        where convert(date, [SentToGIS_Date]) >= convert (date, getdate()-{2})
-        and [SentToGIS_Status] <> 'Complete' 
-        or ([FoundLatitude] is NULL and [SentToGIS_Status] = 'Complete')
-        or ([FoundLongitude] is NULL and [SentToGIS_Status] = 'Complete')
-        '''.format(sd_schema, sd_table, lookback)
-        clean_tbl_return = arcpy.ArcSDESQLExecute(processing_db_connection).execute(clean_tbl_sql)
-        print ("     Records removed.\n\n")
-
-    except Exception as clean_tbl_return:
-        print ("     FAILURE:  Data cleaning failed.\n\n")
-        print (clean_tbl_return.args[0])
-
-    # Delete records that do not need to be added.
-    print ("  Removing NULL Record records...")
-    try:
-        clean_tbl_sql = '''
-        delete from [{0}].[{1}]
-        where [SentToGIS_Status] is NULL
-        '''.format(sd_schema, sd_table)
-        clean_tbl_return = arcpy.ArcSDESQLExecute(processing_db_connection).execute(clean_tbl_sql)
-        print ("     Records removed.\n\n")
+def cleanup_layer (processing_db_connection, pub_layerfullname):
 
-    except Exception as clean_tbl_return:
-        print ("     FAILURE:  Data cleaning failed.\n\n")
-        print (clean_tbl_return.args[0])
+    print ("  Preparing to reformat layer.....\n")
 
     print ("   Finding current DB...")
     check_db_sql = '''SELECT DB_NAME() AS [Database]'''
@@ -292,44 +367,6 @@ def cleanup_layer (processing_db_connection, pub_layerfullname, sd_schema, sd_ta
     # Build Connection String
     output_connection = processing_db_connection + '\\{0}.{1}'.format(target_db, pub_layerfullname)
 
-    # Prep for field removal.
-    print ("   Disable Editor Tracking...")
-    try:
-        arcpy.DisableEditorTracking_management(output_connection,
-                                           "DISABLE_CREATOR",
-                                           "DISABLE_CREATION_DATE",
-                                           "DISABLE_LAST_EDITOR",
-                                           "DISABLE_LAST_EDIT_DATE")
-        print ("     Success!\n\n")
-    except Exception as editor_tracking_fail:
-        print ("     FAILURE:  Failed to disable editor tracking.\n\n")
-        print (editor_tracking_fail.args[0])
-
-    print ("   Removing Fields.....")
-    try:
-        # Build list of fields to remove from FC.
-        # Excluded fields from deletion.
-        exclude = ["WorkOrderNumber", "FoundLatitude", "FoundLongitude", "FoundGPSPDOP", "FoundGPSHDOP", "FoundGPSVDOP", "FoundAltitude"]
-        fullList = []
-        fieldfullList = arcpy.ListFields(output_connection)
-
-        print ("     Removing the following fields:")
-        for field in fieldfullList:
-             if not field.required:
-                  if not field.name in exclude:
-                       fullList.append(field.name)
-
-        for field in fullList:
-            print ("        {0}".format(field))
-
-        arcpy.DeleteField_management(output_connection, fullList)
-        print ("     Success!\n\n")
-
-    except Exception as field_removal_fail:
-        print ("     FAILURE:  Failed to remove fields!\n\n")
-        print (field_removal_fail.args[0])
-
-
     print ("   Renaming Fields.....")
     print ("     Renaming WorkorderNumber to FacilityID")
     try: 
@@ -423,6 +460,36 @@ def project_layer (processing_db_connection, pub_layerfullname, pub_projectSRID,
 
     return
 
+def skip_loaded_fixes(input_connection, output_connection):
+
+    # A full sweep reads the whole lookback window again, so fixes an earlier
+    # run already appended are dropped from the scratch layer first.  A fix
+    # is the same when its FacilityID, Latitude and Longitude all match.
+    fix_fields = ['FacilityID', 'Latitude', 'Longitude']
+
+    with arcpy.da.SearchCursor(input_connection, fix_fields) as scratch_cursor:
+        scratch_facilities = sorted(set(['{}'.format(fix[0]) for fix in scratch_cursor]))
+
+    loaded_fixes = set()
+    for chunk_start in range(0, len(scratch_facilities), 1000):
+        chunk = scratch_facilities[chunk_start:chunk_start + 1000]
+        where_clause = "FacilityID in ({0})".format(', '.join(["'{0}'".format(FacilityID.replace("'", "''")) for FacilityID in chunk]))
+        with arcpy.da.SearchCursor(output_connection, fix_fields, where_clause) as loaded_cursor:
+            for fix in loaded_cursor:
+                loaded_fixes.add(('{}'.format(fix[0]), fix[1], fix[2]))
+
+    skipped_count = 0
+    if len(loaded_fixes) > 0:
+        with arcpy.da.UpdateCursor(input_connection, fix_fields) as scratch_cursor:
+            for fix in scratch_cursor:
+                if ('{}'.format(fix[0]), fix[1], fix[2]) in loaded_fixes:
+                    scratch_cursor.deleteRow()
+                    skipped_count += 1
+
+    print ("     {0} fixes already in storage skipped.".format(skipped_count))
+
+    return skipped_count
+
 def loadData(destination_db_connection, processing_db_connection, sd_schema, sd_dataset, sd_table, target_dataset, target_table):
     
     # Begin processing of existing data
@@ -448,6 +515,7 @@ def loadData(destination_db_connection, processing_db_connection, sd_schema, sd_
 
     print ("   Loading to storage...")
     try:
+        skip_loaded_fixes(input_connection, output_connection)
         arcpy.Append_management(input_connection, output_connection, "NO_TEST")
         print ("     Success!\n\n")
         completion_status = 1
@@ -515,12 +583,16 @@ def sendcompletetion_noUpdates(email_target, mail_server, mail_from):
 
 # ------ Main ------
 
+loadWatermark()
 pending_update = check4udpate(source_db_connection, sd_schema, sd_table)
 if pending_update == 0:
+    saveWatermark()
     #sendcompletetion_noUpdates(email_target, mail_server, mail_from)
     arcpy.ClearWorkspaceCache_management(source_db_connection)
 else:
     prepData(source_db_connection, processing_db_connection, sd_schema, sd_dataset, sd_table, lookback, pub_projectSRID, pub_transMethod)
     completion_status, failure_info = loadData(destination_db_connection, processing_db_connection, sd_schema, sd_dataset, sd_table, target_dataset, target_table)
+    if completion_status == 1:
+        saveWatermark()
     sendcompletetioninfo(email_target, mail_server, mail_from, completion_status, failure_info, pending_update)
     arcpy.ClearWorkspaceCache_management(source_db_connection)
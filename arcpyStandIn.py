@@ -0,0 +1,726 @@
+#-------------------------------------------------------------------------------
+# Name:        arcpy Stand In
+# Purpose:  Offline stand in for the part of arcpy that appendGPSRecevied and
+#           mergeODSreceived use, so their stages can be timed and checked on
+#           a box without ArcGIS.  Every workspace (.sde connection file or
+#           file geodatabase) is a SQLite file, every feature class a table in
+#           it, and every call is held up by a latency model: call_latency
+#           per call plus row_latency per row the call reads or writes.
+#
+#           installStandIn() puts this module in place of arcpy and
+#           loadScript() runs a script's definitions without its Main
+#           section, so each stage can be called and timed on its own.  Run
+#           this file directly to time the appendGPSRecevied stages and the
+#           mergeODSreceived merge, row by row and with bulk_edit.
+#
+#           Geometry is not modelled.  Project_management copies the rows
+#           without reprojecting them; only its cost is real.
+#
+# Author:      John Spence
+#
+# Created:  18 October 2026
+# Modified:
+# Modification Purpose:
+#
+#
+#-------------------------------------------------------------------------------
+
+# 888888888888888888888888888888888888888888888888888888888888888888888888888888
+# ------------------------------- Configuration --------------------------------
+# Pretty simple setup.  Just change your settings/configuration below.  Do not
+# go below the "DO NOT UPDATE...." line.
+#
+# 888888888888888888888888888888888888888888888888888888888888888888888888888888
+
+# Folder the stand in workspaces are kept in.  Rebuilt for every timed run.
+stand_in_folder = 'arcpyStandIn'
+
+# Seconds added to every call.
+call_latency = 0.005
+
+# Seconds added per row a call reads or writes.
+row_latency = 0.00005
+
+# Per call latency for particular tools in place of call_latency, e.g.
+# {'Project_management': 0.5}.
+tool_latency = {}
+
+# GPS fixes sent to GIS today, seeded for the appendGPSRecevied timings.  One
+# in five has no coordinates and one in ten failed to merge.
+stand_in_fixes = 200
+
+# Installs sent to GIS on earlier days, seeded ahead of the fixes.  Real
+# tables are mostly history.
+stand_in_history = 20000
+
+# Pending installs seeded for the mergeODSreceived timings.
+stand_in_installs = 200
+
+# ------------------------------------------------------------------------------
+# DO NOT UPDATE BELOW THIS LINE OR RISK DOOM AND DISPAIR!  Have a nice day!
+# ------------------------------------------------------------------------------
+
+# Import Python libraries
+import sqlite3, time, re, os, sys, types, shutil, datetime
+from odsStandIn import StandInSDEExecute, buildStandIn, install_columns, translateSQL
+
+# Workspace path -> (SQLite file, database name).
+workspaces = {}
+
+# Tool -> [calls, rows, seconds], for the timing report.
+call_log = {}
+
+# SQLite file -> connection of the open edit session on it.
+edit_connections = {}
+
+# Layer name -> (dataset, where clause, visible fields or None for all).
+layers = {}
+
+env = types.SimpleNamespace(workspace=None, configKeyword=None, overwriteOutput=False)
+
+class ExecuteError(Exception):
+    pass
+
+def registerWorkspace(workspace, database, file_name=None):
+#-------------------------------------------------------------------------------
+# Name:        Function - Register Workspace
+# Purpose:  Maps a connection file or geodatabase path onto a SQLite file in
+#           stand_in_folder.  Workspaces given the same file_name share it.
+#-------------------------------------------------------------------------------
+
+    if not os.path.exists(stand_in_folder):
+        os.makedirs(stand_in_folder)
+
+    workspaces[workspace] = (os.path.join(stand_in_folder, '{0}.sqlite'.format(file_name or database)), database)
+
+    return (workspaces[workspace][0])
+
+def resolve(path):
+#-------------------------------------------------------------------------------
+# Name:        Function - Resolve
+# Purpose:  Splits a dataset path into the SQLite file of its workspace, the
+#           database name and the table.  The table is the last part of the
+#           path with any database and schema qualifiers dropped; None when
+#           the path is the workspace itself.  A bare name is looked for in
+#           env.workspace, as arcpy does.
+#-------------------------------------------------------------------------------
+
+    matches = [workspace for workspace in workspaces if path == workspace or path.startswith(workspace + '\\')]
+    if len(matches) == 0 and env.workspace in workspaces:
+        return (resolve(env.workspace + '\\' + path))
+    if len(matches) == 0:
+        raise ExecuteError('ERROR 000732: {0} does not exist or is not supported'.format(path))
+
+    workspace = max(matches, key=len)
+    file_path, database = workspaces[workspace]
+    item = path[len(workspace):].strip('\\')
+
+    if item == '':
+        return (file_path, database, None)
+
+    return (file_path, database, item.split('\\')[-1].split('.')[-1])
+
+def logCall(tool, rows, start_time):
+#-------------------------------------------------------------------------------
+# Name:        Function - Log Call
+# Purpose:  Waits out the modelled latency of a call and adds it to call_log.
+#-------------------------------------------------------------------------------
+
+    time.sleep(tool_latency.get(tool, call_latency) + rows * row_latency)
+
+    tool_calls = call_log.setdefault(tool, [0, 0, 0.0])
+    tool_calls[0] += 1
+    tool_calls[1] += rows
+    tool_calls[2] += time.time() - start_time
+
+    return
+
+def tableColumns(conn, table, schema='main'):
+    return ([column[1] for column in conn.execute('pragma [{0}].table_info([{1}])'.format(schema, table))])
+
+def tableExists(conn, table):
+    return (conn.execute("select count(*) from sqlite_master where type = 'table' and name = ? collate nocase", (table,)).fetchone()[0] > 0)
+
+def copyTable(tool, in_data, out_data):
+#-------------------------------------------------------------------------------
+# Name:        Function - Copy Table
+# Purpose:  Copies a table into another workspace, or the same one under a
+#           new name.  A layer copies only its visible fields and the rows
+#           its where clause selects.  Shared by Copy_management,
+#           CopyFeatures_management and Project_management.
+#-------------------------------------------------------------------------------
+
+    start_time = time.time()
+    in_data, where_clause, visible_fields = layers.get(in_data, (in_data, None, None))
+    in_file, in_database, in_table = resolve(in_data)
+    out_file, out_database, out_table = resolve(out_data)
+
+    copy_conn = sqlite3.connect(out_file)
+    source_schema = 'main'
+    if os.path.abspath(in_file) != os.path.abspath(out_file):
+        copy_conn.execute('attach database ? as [source]', (in_file,))
+        source_schema = 'source'
+
+    copy_columns = '*'
+    if visible_fields != None:
+        copy_columns = ', '.join(['[{0}]'.format(field) for field in visible_fields])
+    copy_where = ''
+    if where_clause != None and where_clause != '':
+        copy_where = ' where {0}'.format(translateSQL(where_clause))
+
+    try:
+        if not tableExists(copy_conn, out_table):
+            pass
+        elif env.overwriteOutput == True:
+            copy_conn.execute('drop table [main].[{0}]'.format(out_table))
+        else:
+            raise ExecuteError('ERROR 000725: Output dataset {0} already exists.'.format(out_data))
+
+        copy_conn.execute('create table [main].[{0}] as select {1} from [{2}].[{3}]{4}'.format(out_table, copy_columns, source_schema, in_table, copy_where))
+        copy_count = copy_conn.execute('select count(*) from [main].[{0}]'.format(out_table)).fetchone()[0]
+        copy_conn.commit()
+    except sqlite3.Error as copy_error:
+        raise ExecuteError('{0}'.format(copy_error))
+    finally:
+        copy_conn.close()
+
+    logCall(tool, copy_count, start_time)
+
+    return (Result(out_data))
+
+class Result(object):
+#-------------------------------------------------------------------------------
+# Name:        Class - Result
+# Purpose:  What a geoprocessing tool hands back.
+#-------------------------------------------------------------------------------
+
+    def __init__(self, *outputs):
+        self.outputs = outputs
+
+    def getOutput(self, index):
+        return (self.outputs[index])
+
+class Field(object):
+    def __init__(self, name, required):
+        self.name = name
+        self.required = required
+
+class SpatialReference(object):
+    def __init__(self, factory_code=None):
+        self.factoryCode = factory_code
+
+class ArcSDESQLExecute(StandInSDEExecute):
+#-------------------------------------------------------------------------------
+# Name:        Class - ArcSDESQLExecute
+# Purpose:  Runs SQL on a workspace's SQLite file with the schema attached as
+#           UTIL, on top of the odsStandIn translation.  DB_NAME() gives the
+#           workspace's database name.
+#-------------------------------------------------------------------------------
+
+    def __init__(self, server=None):
+        start_time = time.time()
+        file_path, self.database, table = resolve(server or env.workspace)
+        StandInSDEExecute.__init__(self, file_path, 0)
+        logCall('ArcSDESQLExecute', 0, start_time)
+
+    def execute(self, sql_statement):
+        start_time = time.time()
+
+        sql_statement = re.sub(r'\bDB_NAME\(\)', "'{0}'".format(self.database), sql_statement, flags=re.I)
+        sql_statement = re.sub(r'convert\s*\(\s*varchar\s*\(\s*\d+\s*\)\s*,\s*(.+?)\s*,\s*\d+\s*\)', r'\1', sql_statement, flags=re.I)
+
+        try:
+            sde_return = StandInSDEExecute.execute(self, sql_statement)
+        except sqlite3.Error as sde_error:
+            raise ExecuteError('{0}'.format(sde_error))
+
+        logCall('ArcSDESQLExecute', len(sde_return) if isinstance(sde_return, list) else 0, start_time)
+
+        return (sde_return)
+
+def Exists(dataset):
+    start_time = time.time()
+
+    try:
+        file_path, database, table = resolve(dataset)
+    except ExecuteError:
+        return (False)
+
+    if table == None:
+        return (os.path.exists(file_path))
+
+    exists_conn = sqlite3.connect(file_path)
+    dataset_exists = tableExists(exists_conn, table)
+    exists_conn.close()
+
+    logCall('Exists', 0, start_time)
+
+    return (dataset_exists)
+
+class Describe(object):
+#-------------------------------------------------------------------------------
+# Name:        Class - Describe
+# Purpose:  arcpy.Describe, for the properties the scripts read.  Stand in
+#           files are never versioned.
+#-------------------------------------------------------------------------------
+
+    def __init__(self, value):
+        start_time = time.time()
+        file_path, database, table = resolve(value)
+        self.isVersioned = False
+        logCall('Describe', 0, start_time)
+
+def GetCount_management(in_rows):
+    start_time = time.time()
+    file_path, database, table = resolve(in_rows)
+
+    count_conn = sqlite3.connect(file_path)
+    try:
+        row_count = count_conn.execute('select count(*) from [{0}]'.format(table)).fetchone()[0]
+    except sqlite3.Error as count_error:
+        raise ExecuteError('{0}'.format(count_error))
+    finally:
+        count_conn.close()
+
+    logCall('GetCount_management', 0, start_time)
+
+    return (Result('{0}'.format(row_count)))
+
+def ListFields(dataset, wild_card=None, field_type=None):
+    start_time = time.time()
+    file_path, database, table = resolve(dataset)
+
+    fields_conn = sqlite3.connect(file_path)
+    fields = [Field(column, column.lower() in ('objectid', 'shape')) for column in tableColumns(fields_conn, table)]
+    fields_conn.close()
+
+    logCall('ListFields', 0, start_time)
+
+    return (fields)
+
+def Copy_management(in_data, out_data, data_type=None, associated_data=None):
+    return (copyTable('Copy_management', in_data, out_data))
+
+def MakeFeatureLayer_management(in_features, out_layer, where_clause=None, workspace=None, field_info=None):
+#-------------------------------------------------------------------------------
+# Name:        Function - Make Feature Layer
+# Purpose:  Records a layer over a dataset.  field_info is taken in its
+#           string form, "field new_name VISIBLE|HIDDEN NONE;...".  Nothing
+#           is read until the layer is copied.
+#-------------------------------------------------------------------------------
+
+    start_time = time.time()
+    resolve(in_features)
+
+    visible_fields = None
+    if field_info != None and field_info != '':
+        visible_fields = [entry.split()[0] for entry in field_info.split(';') if entry.split()[2].upper() == 'VISIBLE']
+
+    layers[out_layer] = (in_features, where_clause, visible_fields)
+
+    logCall('MakeFeatureLayer_management', 0, start_time)
+
+    return (Result(out_layer))
+
+def CopyFeatures_management(in_features, out_feature_class, *args):
+    return (copyTable('CopyFeatures_management', in_features, out_feature_class))
+
+def Project_management(in_dataset, out_dataset, out_coor_system, transform_method=None, *args):
+    return (copyTable('Project_management', in_dataset, out_dataset))
+
+def Delete_management(in_data, data_type=None):
+    start_time = time.time()
+
+    if in_data in layers:
+        layers.pop(in_data)
+        logCall('Delete_management', 0, start_time)
+        return (Result(in_data))
+
+    file_path, database, table = resolve(in_data)
+
+    delete_conn = sqlite3.connect(file_path)
+    delete_conn.execute('drop table if exists [{0}]'.format(table))
+    delete_conn.commit()
+    delete_conn.close()
+
+    logCall('Delete_management', 0, start_time)
+
+    return (Result(in_data))
+
+def DeleteField_management(in_table, drop_field, method=None):
+    start_time = time.time()
+    file_path, database, table = resolve(in_table)
+
+    if isinstance(drop_field, str):
+        drop_field = [field for field in drop_field.split(';') if field != '']
+
+    # Dropping a column rewrites the table, so every row is charged.
+    field_conn = sqlite3.connect(file_path)
+    try:
+        for field in drop_field:
+            field_conn.execute('alter table [{0}] drop column [{1}]'.format(table, field))
+        field_conn.commit()
+        row_count = field_conn.execute('select count(*) from [{0}]'.format(table)).fetchone()[0]
+    except sqlite3.Error as field_error:
+        raise ExecuteError('{0}'.format(field_error))
+    finally:
+        field_conn.close()
+
+    logCall('DeleteField_management', row_count, start_time)
+
+    return (Result(in_table))
+
+def AlterField_management(in_table, field, new_field_name=None, new_field_alias=None, *args):
+    start_time = time.time()
+    file_path, database, table = resolve(in_table)
+
+    field_conn = sqlite3.connect(file_path)
+    try:
+        if new_field_name != None:
+            field_conn.execute('alter table [{0}] rename column [{1}] to [{2}]'.format(table, field, new_field_name))
+        field_conn.commit()
+    except sqlite3.Error as field_error:
+        raise ExecuteError('{0}'.format(field_error))
+    finally:
+        field_conn.close()
+
+    logCall('AlterField_management', 0, start_time)
+
+    return (Result(in_table))
+
+def Append_management(inputs, target, schema_type='TEST', *args):
+#-------------------------------------------------------------------------------
+# Name:        Function - Append Management
+# Purpose:  Appends each input into target, matching fields by name.  Target
+#           fields missing from an input are left NULL, as with NO_TEST.
+#-------------------------------------------------------------------------------
+
+    start_time = time.time()
+    target_file, target_database, target_table = resolve(target)
+
+    if isinstance(inputs, str):
+        inputs = [in_data for in_data in inputs.split(';') if in_data != '']
+
+    append_conn = sqlite3.connect(target_file)
+    append_count = 0
+
+    try:
+        if not tableExists(append_conn, target_table):
+            raise ExecuteError('ERROR 000732: Target Dataset {0} does not exist or is not supported'.format(target))
+
+        target_columns = dict([(column.lower(), column) for column in tableColumns(append_conn, target_table) if column.lower() != 'objectid'])
+
+        for in_data in inputs:
+            in_file, in_database, in_table = resolve(in_data)
+            append_conn.execute('attach database ? as [source]', (in_file,))
+            try:
+                append_columns = [column for column in tableColumns(append_conn, in_table, 'source') if column.lower() in target_columns]
+                append_cursor = append_conn.execute('insert into [main].[{0}] ({1}) select {2} from [source].[{3}]'.format(
+                target_table, ', '.join(['[{0}]'.format(target_columns[column.lower()]) for column in append_columns]),
+                ', '.join(['[{0}]'.format(column) for column in append_columns]), in_table))
+                append_count += append_cursor.rowcount
+                append_conn.commit()
+            finally:
+                append_conn.execute('detach database [source]')
+
+    except sqlite3.Error as append_error:
+        raise ExecuteError('{0}'.format(append_error))
+    finally:
+        append_conn.close()
+
+    logCall('Append_management', append_count, start_time)
+
+    return (Result(target))
+
+def DisableEditorTracking_management(in_dataset, *args):
+    logCall('DisableEditorTracking_management', 0, time.time())
+    return (Result(in_dataset))
+
+def ClearWorkspaceCache_management(in_workspace=None):
+    return (Result(True))
+
+def SignInToPortal(*args):
+    return
+
+class Editor(object):
+#-------------------------------------------------------------------------------
+# Name:        Class - Editor
+# Purpose:  arcpy.da.Editor.  Holds one connection to the workspace's file
+#           while editing, which update cursors opened on the workspace
+#           write through.  Saving commits them; otherwise they roll back.
+#-------------------------------------------------------------------------------
+
+    def __init__(self, workspace):
+        self.file_path = resolve(workspace)[0]
+        self.conn = None
+
+    def startEditing(self, with_undo=True, multiuser_mode=True):
+        start_time = time.time()
+        self.conn = sqlite3.connect(self.file_path)
+        edit_connections[self.file_path] = self.conn
+        logCall('Editor', 0, start_time)
+
+    def startOperation(self):
+        return
+
+    def stopOperation(self):
+        return
+
+    def abortOperation(self):
+        return
+
+    def stopEditing(self, save_changes=True):
+        start_time = time.time()
+        edit_connections.pop(self.file_path, None)
+        if save_changes == True:
+            self.conn.commit()
+        else:
+            self.conn.rollback()
+        self.conn.close()
+        self.conn = None
+        logCall('Editor', 0, start_time)
+
+class UpdateCursor(object):
+#-------------------------------------------------------------------------------
+# Name:        Class - Update Cursor
+# Purpose:  arcpy.da.UpdateCursor.  Rows come back as lists in field_names
+#           order.  Outside an edit session its changes commit when it closes.
+#-------------------------------------------------------------------------------
+
+    def __init__(self, in_table, field_names, where_clause=None, *args):
+        self.start_time = time.time()
+        file_path, database, self.table = resolve(in_table)
+        self.field_names = list(field_names)
+
+        self.own_conn = file_path not in edit_connections
+        self.conn = sqlite3.connect(file_path) if self.own_conn else edit_connections[file_path]
+
+        query_string = 'select rowid, {0} from [{1}]'.format(', '.join(['[{0}]'.format(field) for field in self.field_names]), self.table)
+        if where_clause != None and where_clause != '':
+            query_string = query_string + ' where {0}'.format(where_clause)
+
+        try:
+            self.rows = self.conn.execute(query_string).fetchall()
+        except sqlite3.Error as cursor_error:
+            raise ExecuteError('{0}'.format(cursor_error))
+
+        self.current = None
+
+    def __iter__(self):
+        for row in self.rows:
+            self.current = row[0]
+            yield list(row[1:])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def updateRow(self, row):
+        values = []
+        for value in row:
+            if isinstance(value, datetime.datetime) and value.time() == datetime.time(0):
+                value = value.strftime('%Y-%m-%d')
+            elif isinstance(value, datetime.datetime):
+                value = value.strftime('%Y-%m-%d %H:%M:%S')
+            values.append(value)
+
+        self.conn.execute('update [{0}] set {1} where rowid = ?'.format(self.table, ', '.join(['[{0}] = ?'.format(field) for field in self.field_names])),
+        values + [self.current])
+
+    def deleteRow(self):
+        self.conn.execute('delete from [{0}] where rowid = ?'.format(self.table), (self.current,))
+
+    def close(self):
+        if self.conn == None:
+            return
+        if self.own_conn:
+            self.conn.commit()
+            self.conn.close()
+        self.conn = None
+        logCall(type(self).__name__, len(self.rows), self.start_time)
+
+class SearchCursor(UpdateCursor):
+#-------------------------------------------------------------------------------
+# Name:        Class - Search Cursor
+# Purpose:  arcpy.da.SearchCursor.  Rows come back as tuples in field_names
+#           order.
+#-------------------------------------------------------------------------------
+
+    def __iter__(self):
+        for row in self.rows:
+            yield tuple(row[1:])
+
+    def updateRow(self, row):
+        raise ExecuteError("'da.SearchCursor' object has no attribute 'updateRow'")
+
+    def deleteRow(self):
+        raise ExecuteError("'da.SearchCursor' object has no attribute 'deleteRow'")
+
+da = types.SimpleNamespace(Editor=Editor, UpdateCursor=UpdateCursor, SearchCursor=SearchCursor)
+
+def installStandIn():
+#-------------------------------------------------------------------------------
+# Name:        Function - Install Stand In
+# Purpose:  Puts this module in place of arcpy for everything imported after.
+#-------------------------------------------------------------------------------
+
+    sys.modules['arcpy'] = sys.modules[__name__]
+
+    return
+
+def loadScript(script_path):
+#-------------------------------------------------------------------------------
+# Name:        Function - Load Script
+# Purpose:  Runs a script's configuration and definitions, stopping at its
+#           Main section, and hands back its namespace.
+#-------------------------------------------------------------------------------
+
+    with open(script_path) as script_read:
+        script_source = script_read.read()
+
+    script_source = script_source[:script_source.index('# ------ Main ------')]
+    script = {'__name__': os.path.splitext(os.path.basename(script_path))[0], '__file__': os.path.abspath(script_path)}
+    exec(compile(script_source, script_path, 'exec'), script)
+
+    return (script)
+
+def buildGPSSource(file_path, fix_count, history_count):
+#-------------------------------------------------------------------------------
+# Name:        Function - Build GPS Source
+# Purpose:  Seeds ToHost2GIS_AMI with history_count installs sent on earlier
+#           days and fix_count sent today, with the GPS columns the append
+#           carries over.
+#-------------------------------------------------------------------------------
+
+    gps_columns = ('FoundLatitude', 'FoundLongitude', 'FoundGPSPDOP', 'FoundGPSHDOP', 'FoundGPSVDOP', 'FoundAltitude')
+    source_columns = [column for column in install_columns] + list(gps_columns)
+
+    build_conn = sqlite3.connect(file_path)
+    build_conn.execute('create table [TOHOST2GIS_AMI] ([ObjectID] integer primary key, {0})'.format(', '.join(['[{0}] text'.format(column) for column in source_columns])))
+
+    source_rows = []
+    now = datetime.datetime.now()
+
+    for install in range(history_count + fix_count):
+        if install < history_count:
+            sent_date = now - datetime.timedelta(days=1 + install % 730)
+        else:
+            sent_date = now - datetime.timedelta(minutes=install % 60)
+
+        source_row = dict.fromkeys(source_columns)
+        source_row.update({'WorkOrderNumber': 'WSC{0:06d}'.format(install), 'CompletedWorkType': ('MC', 'ME', 'EI')[install % 3],
+            'SentToGIS_Date': sent_date.strftime('%Y-%m-%d %H:%M:%S'), 'SentToGIS_Status': 'Failure' if install % 10 == 9 else 'Complete',
+            'SentToGIS_Confirmed': 'Yes', 'InstallDate': sent_date.strftime('%Y-%m-%d'), 'NewMeterNumber': 'NEW{0:06d}'.format(install)})
+        if install % 5 != 4:
+            source_row.update(dict(zip(gps_columns, ('47.61{0:04d}'.format(install % 10000), '-122.19{0:04d}'.format(install % 10000), '1.2', '0.8', '0.9', '30'))))
+
+        source_rows.append(tuple([source_row[column] for column in source_columns]))
+
+    build_conn.executemany('insert into [TOHOST2GIS_AMI] ({0}) values ({1})'.format(
+    ', '.join(['[{0}]'.format(column) for column in source_columns]), ', '.join(['?'] * len(source_columns))), source_rows)
+    build_conn.commit()
+    build_conn.close()
+
+    return
+
+def timeAppendGPS():
+#-------------------------------------------------------------------------------
+# Name:        Function - Time Append GPS
+# Purpose:  Builds the three appendGPSRecevied workspaces and times each of
+#           its stages against them.
+#-------------------------------------------------------------------------------
+
+    script = loadScript('appendGPSRecevied.py')
+    script['watermark_file'] = ''
+    layers.clear()
+
+    source_file = registerWorkspace(script['source_db_connection'], 'WebGIS')
+    registerWorkspace(script['processing_db_connection'], 'GISScratch')
+    destination_file = registerWorkspace(script['destination_db_connection'], 'Survey')
+
+    buildGPSSource(source_file, stand_in_fixes, stand_in_history)
+
+    destination_conn = sqlite3.connect(destination_file)
+    destination_conn.execute('create table [{0}] ([ObjectID] integer primary key, [FacilityID] text, [Latitude] text, [Longitude] text, [PDOP] text, [HDOP] text, [VDOP] text, [Altitude] text)'.format(script['target_table']))
+    destination_conn.commit()
+
+    pub_layerfullname = '{0}.{1}'.format(script['sd_schema'], script['sd_table'])
+    stages = [
+        ('check4udpate', lambda: script['check4udpate'](script['source_db_connection'], script['sd_schema'], script['sd_table'])),
+        ('check_for_existance', lambda: script['check_for_existance'](script['processing_db_connection'], pub_layerfullname)),
+        ('copy_layer_over', lambda: script['copy_layer_over'](script['source_db_connection'], script['processing_db_connection'], pub_layerfullname)),
+        ('cleanup_layer', lambda: script['cleanup_layer'](script['processing_db_connection'], pub_layerfullname)),
+        ('project_layer', lambda: script['project_layer'](script['processing_db_connection'], pub_layerfullname, script['pub_projectSRID'], script['pub_transMethod'])),
+        ('loadData', lambda: script['loadData'](script['destination_db_connection'], script['processing_db_connection'], script['sd_schema'], script['sd_dataset'], script['sd_table'], script['target_dataset'], script['target_table']))]
+
+    script['loadWatermark']()
+
+    stage_timings = []
+    for stage, run_stage in stages:
+        start_time = time.time()
+        run_stage()
+        stage_timings.append((stage, time.time() - start_time))
+
+    appended_count = destination_conn.execute('select count(*) from [{0}]'.format(script['target_table'])).fetchone()[0]
+    destination_conn.close()
+
+    return (stage_timings, appended_count)
+
+def timeMergeReceived(bulk_edit):
+#-------------------------------------------------------------------------------
+# Name:        Function - Time Merge Received
+# Purpose:  Times one mergeODSreceived merge, through the mergeODSWARP engine
+#           on the sde backend, against a fresh odsStandIn backlog.
+#-------------------------------------------------------------------------------
+
+    script = loadScript('mergeODSreceived.py')
+    script['watermark_file'] = ''
+    script['missing_cache_file'] = ''
+    script['bulk_edit'] = bulk_edit
+
+    # UTIL and WebGIS share one file, as they do in odsStandIn.
+    stand_in_file = registerWorkspace(script['db_connection'], 'Utilities', 'ODS')
+    registerWorkspace(script['source_db_connection'], 'WebGIS', 'ODS')
+    buildStandIn(stand_in_file, stand_in_installs)
+
+    script['configureEngine']()
+    merge_engine = script['merge_engine']
+
+    start_time = time.time()
+    merge_engine.connectBackend()
+    merge_engine.status_writer = merge_engine.StatusWriter(merge_engine.status_flush_size)
+    merge_engine.loadWatermark()
+    merge_engine.check4udpate()
+    update_attempt_count, install_counts = merge_engine.mergeODS2GIS()
+    merge_engine.db_pool.closeall()
+
+    return (time.time() - start_time, update_attempt_count)
+
+# ------ Main ------
+
+if __name__ == '__main__':
+    installStandIn()
+
+    shutil.rmtree(stand_in_folder, ignore_errors=True)
+    stage_timings, appended_count = timeAppendGPS()
+
+    print ("\nappendGPSRecevied  Rows:  {0}  Sent today:  {1}  Appended:  {2}".format(stand_in_history + stand_in_fixes, stand_in_fixes, appended_count))
+    for stage, stage_elapsed in stage_timings:
+        print ("{0:<24}{1:>8.2f}s".format(stage, stage_elapsed))
+
+    print ("\n{0:<36}{1:>8}{2:>10}{3:>10}".format('Call', 'Calls', 'Rows', 'Seconds'))
+    for tool in sorted(call_log):
+        print ("{0:<36}{1:>8}{2:>10}{3:>10.2f}".format(tool, call_log[tool][0], call_log[tool][1], call_log[tool][2]))
+
+    merge_timings = []
+    for bulk_edit in (False, True):
+        shutil.rmtree(stand_in_folder, ignore_errors=True)
+        merge_timings.append((bulk_edit,) + timeMergeReceived(bulk_edit))
+
+    print ("\nmergeODSreceived  Installs:  {0}  Latency:  {1}s per call".format(stand_in_installs, call_latency))
+    for bulk_edit, merge_elapsed, update_attempt_count in merge_timings:
+        print ("{0:<24}{1:>8.2f}s  {2} merged".format('bulk_edit' if bulk_edit else 'Row by row', merge_elapsed, update_attempt_count))
+
+    shutil.rmtree(stand_in_folder, ignore_errors=True)
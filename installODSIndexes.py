@@ -0,0 +1,143 @@
+#-------------------------------------------------------------------------------
+# Name:        Install ODS Indexes
+# Purpose:  Optional one time installer for the indexes behind the pending
+#           install queries in mergeODSWARP, mergeODSreceived and
+#           appendGPSRecevied.  Each index is only created when it is not
+#           already there, so the script is safe to run again.
+#
+#           The filtered indexes only hold rows still waiting to go to GIS,
+#           so they stay small however large ToHost2GIS_AMI grows.  Sessions
+#           writing to the table need ANSI_NULLS and QUOTED_IDENTIFIER on,
+#           which is the default for ODBC and ArcSDE connections.
+#
+# Author:      John Spence
+#
+# Created:  18 October 2026
+# Modified:
+# Modification Purpose:
+#
+#
+#-------------------------------------------------------------------------------
+
+# 888888888888888888888888888888888888888888888888888888888888888888888888888888
+# ------------------------------- Configuration --------------------------------
+# Pretty simple setup.  Just change your settings/configuration below.  Do not
+# go below the "DO NOT UPDATE...." line.
+#
+# 888888888888888888888888888888888888888888888888888888888888888888888888888888
+
+# Configure hard coded db connection here.
+UTIL_conn = ('Driver={ODBC Driver 17 for SQL Server};'  # This will require adjustment if you are using a different database.
+                      r'Server=;'
+                      'Database=Utilities;'
+                      'Trusted_Connection=yes;'  #Only if you are using a AD account.
+                      #r'UID=;'  # Comment out if you are using AD authentication.
+                      #r'PWD='     # Comment out if you are using AD authentication.
+                      )
+
+
+WebGIS_conn = ('Driver={ODBC Driver 17 for SQL Server};'  # This will require adjustment if you are using a different database.
+                      r'Server=;'
+                      'Database=WebGIS;'
+                      'Trusted_Connection=yes;'  #Only if you are using a AD account.
+                      #r'UID=;'  # Comment out if you are using AD authentication.
+                      #r'PWD='     # Comment out if you are using AD authentication.
+                      )
+
+# ------------------------------------------------------------------------------
+# DO NOT UPDATE BELOW THIS LINE OR RISK DOOM AND DISPAIR!  Have a nice day!
+# ------------------------------------------------------------------------------
+
+# Import Python libraries
+import pyodbc
+
+# Database, index name, table, key columns, included columns, filter.
+ods_indexes = [
+    # check4udpate count and keyset ([SentToGIS_Date] is NULL and
+    # [ObjectID] > ?, read in ObjectID order), and the keyset chunk lookups
+    # by ObjectID.  Only rows not yet sent are indexed, and every column the
+    # keyset reads is included so no row is looked up.
+    ('WebGIS', 'IX_TOHOST2GIS_AMI_PendingKeys', 'TOHOST2GIS_AMI',
+        ('ObjectID',), ('InstallDate', 'WorkOrderNumber', 'CompletedWorkType', 'WorkEndDatetime'),
+        '[SentToGIS_Date] is NULL'),
+    # The appendGPSRecevied pending count and watermark.
+    ('WebGIS', 'IX_TOHOST2GIS_AMI_SentToGIS', 'TOHOST2GIS_AMI',
+        ('SentToGIS_Date',), ('CompletedWorkType', 'SentToGIS_Status', 'SentToGIS_Confirmed'),
+        None),
+    # correctInstallDates.
+    ('WebGIS', 'IX_TOHOST2GIS_AMI_NullInstallDate', 'TOHOST2GIS_AMI',
+        ('ObjectID',), ('WorkEndDatetime',),
+        '[InstallDate] is NULL'),
+    # The wServiceConnection prefetch.
+    ('UTIL', 'IX_wServiceConnection_FacilityID', 'wServiceConnection',
+        ('FacilityID',), ('MeterManufacturer', 'MetSerialNum', 'MetInstDate', 'MetModel', 'ServiceType', 'XMTSerialNum'),
+        None),
+    # The mergeODSWARP missing facility cache check.
+    ('UTIL', 'IX_wServiceConnection_SysChangeDate', 'wServiceConnection',
+        ('SysChangeDate',), ('FacilityID',),
+        None)]
+
+def indexDDL(index):
+#-------------------------------------------------------------------------------
+# Name:        Function - Index DDL
+# Purpose:  Builds the create statement for one entry of ods_indexes.
+#-------------------------------------------------------------------------------
+
+    database, index_name, table, key_columns, include_columns, index_filter = index
+
+    create_string = 'create nonclustered index [{0}] on [UTIL].[{1}] ({2})'.format(
+    index_name, table, ', '.join(['[{0}]'.format(column) for column in key_columns]))
+
+    if len(include_columns) > 0:
+        create_string = create_string + ' include ({0})'.format(', '.join(['[{0}]'.format(column) for column in include_columns]))
+    if index_filter != None:
+        create_string = create_string + ' where {0}'.format(index_filter)
+
+    return (create_string)
+
+def installIndexes():
+#-------------------------------------------------------------------------------
+# Name:        Function - Install Indexes
+# Purpose:  Creates each index in ods_indexes that is missing.
+#-------------------------------------------------------------------------------
+
+    print ("Entering Index Install---->\n")
+
+    created_count = 0
+
+    for index in ods_indexes:
+        database, index_name, table = index[0], index[1], index[2]
+        conn_string = UTIL_conn if database == 'UTIL' else WebGIS_conn
+
+        try:
+            index_conn = pyodbc.connect(conn_string)
+            index_cursor = index_conn.cursor()
+
+            index_cursor.execute('''select count(*) from sys.indexes
+            where [name] = ? and [object_id] = object_id(?)''', index_name, '[UTIL].[{0}]'.format(table))
+
+            if index_cursor.fetchone()[0] > 0:
+                print ("   {0} already exists.".format(index_name))
+            else:
+                print ("   Creating {0} on {1}.{2}...".format(index_name, database, table))
+                index_cursor.execute(indexDDL(index))
+                index_conn.commit()
+                created_count += 1
+                print ("     Success!")
+
+            index_cursor.close()
+            index_conn.close()
+
+        except Exception as error_index_return:
+            print ("   FAILURE:  Unable to create {0}.".format(index_name))
+            print (error_index_return.args[0])
+
+    print ("\nIndexes created:  {0}\n".format(created_count))
+    print ("Leaving Index Install----< \n\n")
+
+    return (created_count)
+
+# ------ Main ------
+
+if __name__ == '__main__':
+    installIndexes()
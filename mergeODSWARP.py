@@ -8,8 +8,57 @@
 # Author:      John Spence
 #
 # Created:  16 April 2020
-# Modified:  
+# Modified:  18 October 2026
 # Modification Purpose:
+#  18 October 2026  Pooled, reusable connections to UTIL and WebGIS in place of
+#                   a new connection per statement.
+#  18 October 2026  wServiceConnection values prefetched for the whole pending
+#                   batch instead of looked up per row.
+#  18 October 2026  Added bulk_write mode that merges meter installs through a
+#                   staging table in one set based update.
+#  18 October 2026  SentToGIS statuses buffered and written back in batches.
+#  18 October 2026  Install date correction parses WorkEndDatetime as a column
+#                   and applies the fixes in one batched update.
+#  18 October 2026  Completion check counts per work type with one grouped query.
+#  18 October 2026  Pending ObjectIDs snapshotted once per run and used to drive
+#                   both merge stages, status write-back and the final count.
+#  18 October 2026  Added merge_workers to apply installs on parallel threads
+#                   partitioned by FacilityID.
+#  18 October 2026  Added async_pipeline mode overlapping the read, apply and
+#                   status stages, with pipeline_lanes applying chunks side by
+#                   side.  Main only runs when executed directly so
+#                   odsStandIn can drive the merge for timing runs.
+#  18 October 2026  Added stream_fetch_size to read pending installs and NULL
+#                   install dates with fetchmany on a dedicated connection.
+#  18 October 2026  Runs read only rows above a persisted ObjectID watermark,
+#                   with a full sweep every full_sweep_hours.
+#  18 October 2026  Pending install predicate rewritten as a plain range on
+#                   InstallDate so it can use an index.
+#  18 October 2026  Per install updates defined once with parameters and run
+#                   on a prepared cursor per connection.
+#  18 October 2026  Added transaction_batch_size to merge several facilities
+#                   per transaction with a savepoint per facility.
+#  18 October 2026  AsLeftQ1 / AsLeftQ2 box updates folded into the one meter
+#                   or transmitter update per facility.
+#  18 October 2026  Added change_detection to write only the wServiceConnection
+#                   columns an install changes and skip installs already there.
+#  18 October 2026  Added server_shift to move the current meter into the P*
+#                   columns inside the update instead of reading it first.
+#  18 October 2026  Added coalesce_pending to apply only the latest pending row
+#                   per facility and mark the rest Superseded.
+#  18 October 2026  Pending installs read in one scan and dispatched to a handler
+#                   per CompletedWorkType, with columns looked up by name.
+#  18 October 2026  FacilityIDs missing from wServiceConnection cached between
+#                   runs and failed without a lookup until the table changes.
+#  18 October 2026  Added db_backend to run the same merge through pyodbc or
+#                   ArcSDESQLExecute, and bulk_edit to apply installs in one
+#                   arcpy.da edit session.  mergeODSreceived now runs this
+#                   merge on the sde backend rather than its own copy.
+#  18 October 2026  bulk_edit works out its columns with installChanges, as the
+#                   row by row merge does, so both paths write the same values.
+#  18 October 2026  pyodbc and pandas imported only where used, so the sde
+#                   backend runs without them.  sde writes read @@ROWCOUNT in
+#                   a statement of their own.
 #
 #
 #-------------------------------------------------------------------------------
@@ -39,6 +88,14 @@ WebGIS_conn = ('Driver={ODBC Driver 17 for SQL Server};'  # This will require ad
                       #r'PWD='     # Comment out if you are using AD authentication.
                       )
 
+# Database backend.  'pyodbc' reaches UTIL and WebGIS through the connection
+# strings above.  'sde' runs the same statements through arcpy.ArcSDESQLExecute
+# on the connection files below instead, for deployments that go through
+# ArcGIS.  'pyodbc' is the faster of the two.
+db_backend = 'pyodbc'
+UTIL_sde = r'\database.sde'
+WebGIS_sde = r'database.sde'
+
 # Configure database update type here. (Prod, Stg, Test, Other)
 db_type = 'Test'
 
@@ -61,982 +118,2452 @@ email_target = ''
 mail_server = ''
 mail_from = ''
 
+# Put in front of the Success / Failure / Warning run summary subjects.  Set
+# to '' for production.
+mail_subject_prefix = 'Test '
+
+# Configure the connection pool here.  Connections to UTIL and WebGIS are
+# opened once and reused for the whole run rather than per statement.
+# Maximum connections held open per database.
+pool_size = 4
+
+# Seconds a pooled connection can sit idle before it is checked prior to reuse.
+pool_health_check = 60
+
+# Keys (ObjectIDs or FacilityIDs) sent per chunked query.  SQL Server caps a
+# statement at 2100 parameters, so keep this below that.
+keyset_chunk_size = 1000
+
+# Bulk write mode.  True stages the MC/ME batch and applies it to
+# wServiceConnection in one set based update.  False updates row by row.
+bulk_write = False
+
+# Merge worker threads.  Rows are split across workers by FacilityID, so rows
+# for the same facility still apply in order.  Capped at pool_size.
+merge_workers = 1
+
+# Streaming reads.  Above 0, pending installs and NULL install dates are read on
+# one dedicated read connection this many rows at a time and merged as they
+# arrive, so memory stays flat however large the backlog.  0 reads them in full.
+stream_fetch_size = 0
+
+# Async pipeline mode.  True reads pending rows, applies them to
+# wServiceConnection and writes statuses back as concurrent stages, so the
+# wait on one database overlaps work against the other.  Ignored in bulk_write.
+async_pipeline = False
+
+# Keyset chunks each pipeline stage may hold before the stage feeding it
+# waits.  Keeps a slow writer from letting reads pile up in memory.
+pipeline_queue_depth = 2
+
+# Apply lanes in the pipeline.  Each chunk read is split across the lanes by
+# FacilityID and every lane applies its share on a pooled connection of its
+# own, so several chunks are in flight at once.  Capped at pool_size.
+pipeline_lanes = 4
+
+# High water mark.  Each run only looks at ToHost2GIS_AMI rows with an ObjectID
+# above the last one processed, kept in watermark_file next to this script.
+# Every full_sweep_hours the whole table is swept again to pick up stragglers.
+# Set watermark_file to '' to sweep the whole table every run.
+watermark_file = 'mergeODSWARP_watermark.json'
+full_sweep_hours = 24
+
+# Missing facility cache.  FacilityIDs the prefetch could not find in
+# wServiceConnection are kept in missing_cache_file with the table's
+# SysChangeDate high water mark.  Their installs fail without a lookup until
+# wServiceConnection shows a change to that FacilityID past the mark.  Set
+# missing_cache_file to '' to look every facility up every run.
+missing_cache_file = 'mergeODSWARP_missing.json'
+
+# Facilities merged per wServiceConnection transaction.  Above 1, each facility
+# runs behind its own savepoint inside a shared transaction, so a bad row only
+# rolls itself back.  1 commits every statement on its own.
+transaction_batch_size = 1
+
+# Change detection.  True compares each install against the prefetched
+# wServiceConnection row and writes only the columns that differ.  Installs
+# already in place are marked complete without a write.  False writes every
+# column every time.  Not used by bulk_write.
+change_detection = False
+
+# Server side shift.  True moves the current meter and transmitter into the P*
+# (previous) columns inside the update itself (set [PMetSerial] =
+# [MetSerialNum], ...), so nothing is read first and no other edit can land in
+# between.  Skips the wServiceConnection prefetch and takes precedence over
+# change_detection, which needs it.  bulk_write already shifts server side.
+server_shift = False
+
+# Duplicate pending rows.  True keeps only the latest pending row (by
+# WorkEndDatetime, then ObjectID) per FacilityID and merge stage (Meter or
+# Endpoint) and marks the rest Superseded up front.  False applies every row.
+coalesce_pending = False
+
+# Bulk edit.  True applies each batch of installs through one arcpy.da.Editor
+# session on UTIL_sde and a single UpdateCursor pass over its FacilityIDs, so
+# versioning and editor tracking are honoured.  Statuses are only written once
+# the edits save.  Takes precedence over bulk_write.  Needs UTIL_sde whichever
+# db_backend is in use.
+bulk_edit = False
+
+# Install statuses buffered before they are written back to ToHost2GIS_AMI in
+# one batched update.
+status_flush_size = 500
+
 # ------------------------------------------------------------------------------
 # DO NOT UPDATE BELOW THIS LINE OR RISK DOOM AND DISPAIR!  Have a nice day!
 # ------------------------------------------------------------------------------
 
 # Import Python libraries
 import arcpy, time, smtplib, string, re, os
-#import pandas as pd
 import datetime
 from arcpy import env
 from datetime import datetime
-import pyodbc
+import threading, atexit, zlib, asyncio, json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# pyodbc is imported by connectBackend and pandas by correctInstallDateBatch,
+# so the sde backend runs where neither is installed.
+
+class DatabaseError(Exception):
+#-------------------------------------------------------------------------------
+# Name:        Class - Database Error
+# Purpose:  What the sde backend raises when an ArcSDESQLExecute call fails,
+#           so the merge catches one error type whatever the backend.
+#-------------------------------------------------------------------------------
+
+    pass
+
+# Errors the merge treats as a failed statement.  connectBackend adds
+# pyodbc.Error on the pyodbc backend.
+db_errors = (DatabaseError,)
+
+class ConnectionManager(object):
+#-------------------------------------------------------------------------------
+# Name:        Class - Connection Manager
+# Purpose:  Owns the long lived connections to UTIL and WebGIS.  Connections
+#           are handed out per statement and returned to the pool afterwards,
+#           checked for health when they have been idle, re-opened when the
+#           link drops and capped at pool_size per database.  Every block
+#           that writes commits before it hands its connection back, so only
+#           one that raised is rolled back on release.
+#-------------------------------------------------------------------------------
+
+    def __init__(self, pool_size, health_check, connect):
+        self.pool_size = pool_size
+        self.health_check = health_check
+        self.connect = connect
+        self.lock = threading.Lock()
+        self.slots = {}
+        self.idle = {}
+        self.opened = 0
+        self.reused = 0
+        self.prepared_cursors = {}
+        self.streams = {}
+
+    def _slot(self, conn_string):
+        with self.lock:
+            if conn_string not in self.slots:
+                self.slots[conn_string] = threading.BoundedSemaphore(self.pool_size)
+                self.idle[conn_string] = []
+            return self.slots[conn_string]
+
+    def _healthy(self, conn):
+        try:
+            health_cursor = conn.cursor()
+            health_cursor.execute('select 1')
+            health_cursor.fetchall()
+            health_cursor.close()
+            return True
+        except db_errors:
+            return False
+
+    def _discard(self, conn):
+        with self.lock:
+            self.prepared_cursors.pop(id(conn), None)
+        try:
+            conn.close()
+        except db_errors:
+            pass
+
+    def prepared(self, conn, statement_name):
+        # One cursor per statement per connection.  pyodbc keeps the last
+        # statement a cursor ran prepared, so a rerun skips the prepare.
+        with self.lock:
+            conn_cursors = self.prepared_cursors.setdefault(id(conn), {})
+            if statement_name not in conn_cursors:
+                conn_cursors[statement_name] = conn.cursor()
+            return conn_cursors[statement_name]
+
+    def isDisconnect(self, error):
+        # SQLSTATE class 08 covers every flavour of lost or refused connection.
+        return isinstance(error, db_errors) and len(error.args) > 0 and str(error.args[0]).startswith('08')
+
+    def acquire(self, conn_string):
+        slot = self._slot(conn_string)
+        slot.acquire()
+        try:
+            while True:
+                with self.lock:
+                    if len(self.idle[conn_string]) == 0:
+                        break
+                    conn, last_used = self.idle[conn_string].pop()
+                if time.time() - last_used < self.health_check or self._healthy(conn):
+                    with self.lock:
+                        self.reused += 1
+                    return conn
+                print ("     Pooled connection failed health check.  Reconnecting.")
+                self._discard(conn)
+            conn = self.connect(conn_string)
+            with self.lock:
+                self.opened += 1
+            return conn
+        except:
+            slot.release()
+            raise
+
+    def release(self, conn_string, conn, broken=False, rollback=False):
+        if broken:
+            self._discard(conn)
+        else:
+            try:
+                # Never hand the next caller work left uncommitted.
+                if rollback:
+                    conn.rollback()
+                with self.lock:
+                    self.idle[conn_string].append((conn, time.time()))
+            except db_errors:
+                self._discard(conn)
+        self.slots[conn_string].release()
+
+    @contextmanager
+    def connection(self, conn_string):
+        conn = self.acquire(conn_string)
+        try:
+            yield conn
+        except Exception as connection_error:
+            self.release(conn_string, conn, self.isDisconnect(connection_error), True)
+            raise
+        self.release(conn_string, conn)
+
+    def streamConnection(self, conn_string):
+        # One read connection per database, kept outside the pool for the
+        # whole run, so streamed chunks pay for a single handshake.
+        with self.lock:
+            stream_conn = self.streams.get(conn_string)
+        if stream_conn == None:
+            stream_conn = self.connect(conn_string)
+            with self.lock:
+                self.opened += 1
+                self.streams[conn_string] = stream_conn
+        return stream_conn
+
+    def dropStream(self, conn_string):
+        with self.lock:
+            stream_conn = self.streams.pop(conn_string, None)
+        if stream_conn != None:
+            self._discard(stream_conn)
+
+    def closeall(self):
+        with self.lock:
+            closing = list(self.streams.values())
+            self.streams = {}
+            for conn_string in self.idle:
+                closing += [conn for conn, last_used in self.idle[conn_string]]
+                self.idle[conn_string] = []
+
+        for conn in closing:
+            self._discard(conn)
+
+        print ("Connections opened: {0}  Connections reused: {1}\n".format(self.opened, self.reused))
+
+        return
+
+def sdeLiteral(value):
+#-------------------------------------------------------------------------------
+# Name:        Function - SDE Literal
+# Purpose:  Renders one statement parameter as a T-SQL literal.
+#           ArcSDESQLExecute takes no parameters, so the sde backend writes
+#           them into the statement instead.  Strings go in as N'' literals
+#           so nvarchar columns keep characters outside the code page.
+#-------------------------------------------------------------------------------
+
+    if value == None:
+        return ('NULL')
+    if isinstance(value, bool):
+        return ('1' if value else '0')
+    if isinstance(value, (int, float)):
+        return ('{0}'.format(value))
+    if isinstance(value, datetime):
+        return ("'{0}'".format(value.strftime('%Y-%m-%d %H:%M:%S')))
+    if hasattr(value, 'strftime'):
+        return ("'{0}'".format(value.strftime('%Y-%m-%d')))
+
+    return ("N'{0}'".format('{}'.format(value).replace("'", "''")))
+
+def sdeStatement(statement, params):
+#-------------------------------------------------------------------------------
+# Name:        Function - SDE Statement
+# Purpose:  Fills each ? placeholder outside a quoted literal with the next
+#           parameter, in order.
+#-------------------------------------------------------------------------------
+
+    literals = iter([sdeLiteral(param) for param in params])
+
+    # Even pieces sit outside quotes.  A doubled quote only adds an empty
+    # piece, so the pairing holds.
+    statement_pieces = statement.split("'")
+    for piece_index in range(0, len(statement_pieces), 2):
+        statement_pieces[piece_index] = re.sub(r'\?', lambda placeholder: next(literals), statement_pieces[piece_index])
+
+    return ("'".join(statement_pieces))
+
+class SDECursor(object):
+#-------------------------------------------------------------------------------
+# Name:        Class - SDE Cursor
+# Purpose:  The subset of a pyodbc cursor the merge uses, run through
+#           ArcSDESQLExecute.  Whatever shape ArcSDESQLExecute hands back
+#           (True, None, a single value or a list of rows) comes out as a
+#           list of rows.  Writes report their rowcount from a select
+#           @@ROWCOUNT run after them on the same executor.  It takes a round
+#           trip of its own, since what ArcSDESQLExecute returns for a
+#           multi-statement string is not documented.
+#-------------------------------------------------------------------------------
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.rows = []
+        self.rowcount = -1
+        self.fast_executemany = False
+
+    def execute(self, statement, *params):
+        # pyodbc takes parameters either spread out or as one sequence.
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            params = params[0]
+
+        statement = sdeStatement(statement, params)
+        is_query = statement.lstrip().lower().startswith('select')
+
+        sde_return = self.connection.run(statement, is_query == False)
+        with sde_lock:
+            sde_counts['statements'] += 1
+            if is_query == False:
+                sde_counts['writes'] += 1
+
+        # @@ROWCOUNT holds for the session, so it still reads the write.
+        if is_query == False:
+            sde_return = self.connection.run('select @@ROWCOUNT', False)
+
+        # Identity checks, since a count of 1 == True.
+        if sde_return is True or sde_return is None:
+            sde_rows = []
+        elif isinstance(sde_return, list):
+            sde_rows = [row if isinstance(row, (list, tuple)) else [row] for row in sde_return]
+        else:
+            sde_rows = [[sde_return]]
+
+        if is_query == True:
+            self.rows = sde_rows
+            self.rowcount = len(sde_rows)
+        else:
+            self.rows = []
+            self.rowcount = int(sde_rows[0][0]) if len(sde_rows) > 0 else -1
+
+        return self
+
+    def executemany(self, statement, param_rows):
+        for params in param_rows:
+            self.execute(statement, params)
+        return self
+
+    def fetchall(self):
+        sde_rows = self.rows
+        self.rows = []
+        return sde_rows
+
+    def fetchone(self):
+        if len(self.rows) == 0:
+            return None
+        return self.rows.pop(0)
+
+    def fetchmany(self, size):
+        sde_rows = self.rows[:size]
+        self.rows = self.rows[size:]
+        return sde_rows
+
+    def close(self):
+        self.rows = []
+
+class SDEConnection(object):
+#-------------------------------------------------------------------------------
+# Name:        Class - SDE Connection
+# Purpose:  Wraps one ArcSDESQLExecute as a pyodbc style connection, so
+#           ConnectionManager pools it and every merge stage runs on it
+#           unchanged.  A transaction is started on the first write and held
+#           until commit or rollback, as pyodbc does.  Errors are raised as
+#           DatabaseError so the merge handles them the same either way.
+#           Executors and commits are counted in sde_counts for the report.
+#-------------------------------------------------------------------------------
+
+    def __init__(self, sde_executor):
+        self.sde_executor = sde_executor
+        self.in_transaction = False
+        with sde_lock:
+            sde_counts['executors'] += 1
+
+    def run(self, statement, writes):
+        try:
+            if writes == True and self.in_transaction == False:
+                self.sde_executor.startTransaction()
+                self.in_transaction = True
+            return (self.sde_executor.execute(statement))
+        except Exception as sde_error:
+            raise DatabaseError('{0}'.format(sde_error))
+
+    def cursor(self):
+        return SDECursor(self)
+
+    def commit(self):
+        if self.in_transaction == True:
+            self.in_transaction = False
+            try:
+                self.sde_executor.commitTransaction()
+            except Exception as sde_error:
+                raise DatabaseError('{0}'.format(sde_error))
+            with sde_lock:
+                sde_counts['commits'] += 1
+
+    def rollback(self):
+        if self.in_transaction == True:
+            self.in_transaction = False
+            try:
+                self.sde_executor.rollbackTransaction()
+            except Exception as sde_error:
+                raise DatabaseError('{0}'.format(sde_error))
+
+    def close(self):
+        self.rollback()
+
+# ArcSDESQLExecute instances built and transactions committed on the sde
+# backend, for the end of run report.  The statements and writes sent are what
+# the per statement code would have built an executor and committed for.
+sde_counts = {'executors': 0, 'commits': 0, 'statements': 0, 'writes': 0}
+sde_lock = threading.Lock()
+
+def sdeConnect(conn_string):
+#-------------------------------------------------------------------------------
+# Name:        Function - SDE Connect
+# Purpose:  Opens an sde backend connection on the connection file that
+#           stands for UTIL_conn or WebGIS_conn.  Handed to ConnectionManager
+#           in place of pyodbc.connect.  The pool keeps each one for the whole
+#           run, so a workspace only gets a new ArcSDESQLExecute when every
+#           one it has is busy on another thread.
+#-------------------------------------------------------------------------------
+
+    workspace = UTIL_sde if conn_string == UTIL_conn else WebGIS_sde
+
+    return (SDEConnection(arcpy.ArcSDESQLExecute(workspace)))
+
+def connectBackend():
+#-------------------------------------------------------------------------------
+# Name:        Function - Connect Backend
+# Purpose:  Builds the connection pool on db_backend.  bulk_write is turned
+#           off on 'sde', since its staging table load and output clause need
+#           pyodbc.
+#-------------------------------------------------------------------------------
+
+    global db_pool
+    global bulk_write
+    global db_errors
+
+    if db_backend == 'sde':
+        if bulk_write == True:
+            print ("bulk_write needs the pyodbc backend.  Merging row by row.")
+            bulk_write = False
+        db_pool = ConnectionManager(pool_size, pool_health_check, sdeConnect)
+    else:
+        import pyodbc
+        db_errors = (pyodbc.Error, DatabaseError)
+        db_pool = ConnectionManager(pool_size, pool_health_check, pyodbc.connect)
+
+    print ("Database backend:  {0}\n".format(db_backend))
+
+    return (db_pool)
+
+def queryDB(conn_string, query_string, params=()):
+#-------------------------------------------------------------------------------
+# Name:        Function - Query DB
+# Purpose:  Runs a select through the pool and returns all rows.  A dropped
+#           connection is re-opened and the statement retried once.
+#-------------------------------------------------------------------------------
+
+    for attempt in (1, 2):
+        try:
+            with db_pool.connection(conn_string) as query_conn:
+                query_cursor = query_conn.cursor()
+                query_cursor.execute(query_string, *params)
+                query_return = query_cursor.fetchall()
+                query_cursor.close()
+            return query_return
+        except db_errors as query_error:
+            if attempt == 2 or not db_pool.isDisconnect(query_error):
+                raise
+            print ("     Connection lost.  Reconnecting and retrying.")
+
+def updateDB(conn_string, update_string, params=()):
+#-------------------------------------------------------------------------------
+# Name:        Function - Update DB
+# Purpose:  Runs and commits a statement through the pool.  A dropped
+#           connection rolls the statement back server side, so it is safe to
+#           re-open and retry once.
+#-------------------------------------------------------------------------------
+
+    for attempt in (1, 2):
+        try:
+            with db_pool.connection(conn_string) as update_conn:
+                update_cursor = update_conn.cursor()
+                update_cursor.execute(update_string, *params)
+                update_conn.commit()
+                update_cursor.close()
+            return
+        except db_errors as update_error:
+            if attempt == 2 or not db_pool.isDisconnect(update_error):
+                raise
+            print ("     Connection lost.  Reconnecting and retrying.")
+
+# Statements run once per install.  Each is defined once with ? parameters, so
+# SQL Server compiles it a single time and every row reuses the plan.  The box
+# columns only move when their flag parameter is 1 (AsLeftQ1 / AsLeftQ2
+# answered), so one statement covers every install.  The _shift statements read
+# the P* values from the row being updated; the right hand side of every set
+# sees the row as it was before the update.
+merge_statements = {
+    'meter_install': '''
+    Update [UTIL].[wServiceConnection]
+    set [PMeterManufacturer] = ?
+    , [PMetSerial] = ?
+    , [PMetFinalRead] = ?
+    , [PMeterSize] = ?
+    , [PMetInstDate] = ?
+    , [PMETModel] = ?
+    , [PServiceType] = ?
+    , [MeterManufacturer] = ?
+    , [MetModel] = ?
+    , [MetSerialNum] = ?
+    , [MetInitialRead] = ?
+    , [DialCount] = ?
+    , [MeterSize] = ?
+    , [MetInstDate] = ?
+    , [XMTInstDate] = ?
+    , [XMTMFG] = ?
+    , [XMTModel] = ?
+    , [XMTSerialNum] = ?
+    , [XMTMTType] = ?
+    , [XMTShipDate] = ?
+    , [XMTPart] = ?
+    , [XMTPSerial] = ?
+    , [InstallDate] = case when ? = 1 then ? else [InstallDate] end
+    , [BoxModel] = case when ? = 1 then ? else [BoxModel] end
+    , [BoxCover] = case when ? = 1 then ? else [BoxCover] end
+    , [SysChangeDate] = SYSDATETIME()
+    , [SysChangeUser] = REPLACE(system_user,'COBNT1\\','')
+    where [FacilityID] = ?''',
+
+    'meter_shift': '''
+    Update [UTIL].[wServiceConnection]
+    set [PMeterManufacturer] = coalesce(?, [MeterManufacturer])
+    , [PMetSerial] = [MetSerialNum]
+    , [PMetFinalRead] = ?
+    , [PMeterSize] = ?
+    , [PMetInstDate] = convert (date, [MetInstDate])
+    , [PMETModel] = [MetModel]
+    , [PServiceType] = [ServiceType]
+    , [MeterManufacturer] = ?
+    , [MetModel] = ?
+    , [MetSerialNum] = ?
+    , [MetInitialRead] = ?
+    , [DialCount] = ?
+    , [MeterSize] = ?
+    , [MetInstDate] = ?
+    , [XMTInstDate] = ?
+    , [XMTMFG] = ?
+    , [XMTModel] = ?
+    , [XMTSerialNum] = ?
+    , [XMTMTType] = ?
+    , [XMTShipDate] = ?
+    , [XMTPart] = ?
+    , [XMTPSerial] = [XMTSerialNum]
+    , [InstallDate] = case when ? = 1 then ? else [InstallDate] end
+    , [BoxModel] = case when ? = 1 then ? else [BoxModel] end
+    , [BoxCover] = case when ? = 1 then ? else [BoxCover] end
+    , [SysChangeDate] = SYSDATETIME()
+    , [SysChangeUser] = REPLACE(system_user,'COBNT1\\','')
+    where [FacilityID] = ?''',
+
+    'xmit_install': '''
+    Update [UTIL].[wServiceConnection]
+    set [XMTInstDate] = ?
+    , [XMTMFG] = ?
+    , [XMTModel] = ?
+    , [XMTSerialNum] = ?
+    , [XMTMTType] = ?
+    , [XMTShipDate] = ?
+    , [XMTPart] = ?
+    , [XMTPSerial] = ?
+    , [InstallDate] = case when ? = 1 then ? else [InstallDate] end
+    , [BoxModel] = case when ? = 1 then ? else [BoxModel] end
+    , [BoxCover] = case when ? = 1 then ? else [BoxCover] end
+    , [SysChangeDate] = SYSDATETIME()
+    , [SysChangeUser] = REPLACE(system_user,'COBNT1\\','')
+    where [FacilityID] = ?''',
+
+    'xmit_shift': '''
+    Update [UTIL].[wServiceConnection]
+    set [XMTInstDate] = ?
+    , [XMTMFG] = ?
+    , [XMTModel] = ?
+    , [XMTSerialNum] = ?
+    , [XMTMTType] = ?
+    , [XMTShipDate] = ?
+    , [XMTPart] = ?
+    , [XMTPSerial] = [XMTSerialNum]
+    , [InstallDate] = case when ? = 1 then ? else [InstallDate] end
+    , [BoxModel] = case when ? = 1 then ? else [BoxModel] end
+    , [BoxCover] = case when ? = 1 then ? else [BoxCover] end
+    , [SysChangeDate] = SYSDATETIME()
+    , [SysChangeUser] = REPLACE(system_user,'COBNT1\\','')
+    where [FacilityID] = ?'''}
+
+# The open transaction batch, if any, of the current merge worker, whether
+# its transaction has been opened by a write yet, and whether the row being
+# merged has written yet.  No begin transaction is sent: pyodbc runs with
+# implicit transactions on, where one would leave a second transaction open
+# past the commit, and the sde backend starts its own on the first write.
+merge_batch = threading.local()
+row_savepoint = 'save transaction [merge_row]\n'
+
+def executeDB(conn_string, statement_name, params):
+#-------------------------------------------------------------------------------
+# Name:        Function - Execute DB
+# Purpose:  Runs and commits one of merge_statements on the pooled
+#           connection's own cursor for it, so the prepared statement is
+#           reused rather than prepared again.  None goes to the server as NULL.
+#           A dropped connection is re-opened and the statement retried once.
+#           Returns the number of rows the statement touched.
+#-------------------------------------------------------------------------------
+
+    # Inside a transaction batch the statement joins the batch's transaction.
+    # The row's savepoint goes out in front of its first write, in the same
+    # round trip, so a batched row costs no more trips than a lone one.  The
+    # write that opens the transaction needs none; rolling the transaction
+    # back undoes only that row.
+    batch_conn = getattr(merge_batch, 'conn', None)
+    if batch_conn != None and conn_string == UTIL_conn:
+        batch_statement = merge_statements[statement_name]
+        if merge_batch.savepoint == False:
+            merge_batch.savepoint = True
+            if merge_batch.opened == True:
+                statement_name = 'savepoint:' + statement_name
+                batch_statement = row_savepoint + batch_statement
+            else:
+                merge_batch.opened = True
+                merge_batch.row_opened = True
+        batch_cursor = db_pool.prepared(batch_conn, statement_name)
+        batch_cursor.execute(batch_statement, *params)
+        return (batch_cursor.rowcount)
+
+    for attempt in (1, 2):
+        try:
+            with db_pool.connection(conn_string) as update_conn:
+                update_cursor = db_pool.prepared(update_conn, statement_name)
+                update_cursor.execute(merge_statements[statement_name], *params)
+                update_conn.commit()
+            return (update_cursor.rowcount)
+        except db_errors as update_error:
+            if attempt == 2 or not db_pool.isDisconnect(update_error):
+                raise
+            print ("     Connection lost.  Reconnecting and retrying.")
+
+# wServiceConnection columns pulled by the prefetch, in row order.  Dates come
+# back as yyyy-mm-dd text to match the values read from ToHost2GIS_AMI.
+service_columns = ('FacilityID', 'MeterManufacturer', 'MetSerialNum', 'MetInstDate', 'MetModel', 'ServiceType', 'XMTSerialNum',
+    'PMeterManufacturer', 'PMetSerial', 'PMetFinalRead', 'PMeterSize', 'PMetInstDate', 'PMETModel', 'PServiceType',
+    'MetInitialRead', 'DialCount', 'MeterSize', 'XMTInstDate', 'XMTMFG', 'XMTModel', 'XMTMTType', 'XMTShipDate', 'XMTPart',
+    'XMTPSerial', 'InstallDate', 'BoxModel', 'BoxCover')
+service_date_columns = ('MetInstDate', 'PMetInstDate', 'XMTInstDate', 'XMTShipDate', 'InstallDate')
+
+# Skipped installs and written columns for the run summary.
+change_counts = {'skipped': 0, 'written': 0, 'columns': 0}
+change_lock = threading.Lock()
+
+def sameValue(current_value, new_value):
+#-------------------------------------------------------------------------------
+# Name:        Function - Same Value
+# Purpose:  True when an incoming value matches what wServiceConnection holds.
+#           Prefetched values keep their SQL types while ToHost2GIS_AMI hands
+#           back text, so text is compared first and numbers second.
+#-------------------------------------------------------------------------------
+
+    if current_value == None or new_value == None:
+        return (current_value == None and new_value == None)
+
+    current_text = '{}'.format(current_value).strip()
+    new_text = '{}'.format(new_value).strip()
+    if current_text == new_text:
+        return (True)
+
+    # Two strings that differ are different, even if both look like numbers.
+    if isinstance(current_value, str) and isinstance(new_value, str):
+        return (False)
+
+    try:
+        return (float(current_text) == float(new_text))
+    except ValueError:
+        return (False)
+
+def applyChanges(FacilityID, set_columns, service_row):
+#-------------------------------------------------------------------------------
+# Name:        Function - Apply Changes
+# Purpose:  Writes only the set_columns whose value differs from service_row.
+#           Each distinct column set gets its own statement in merge_statements
+#           so it is prepared once like the fixed ones.  The facility's entry
+#           in service_state is brought up to date, so a later row for the same
+#           facility compares against what was just written.  In a transaction
+#           batch the change is undone by undoServiceState if it rolls back.
+#           Returns the number of columns written.
+#-------------------------------------------------------------------------------
+
+    current_values = dict(zip(service_columns, service_row))
+    changes = [(column, value) for column, value in set_columns if not sameValue(current_values[column], value)]
+
+    if len(changes) == 0:
+        print ("     No changes found.  Skipping update.")
+        with change_lock:
+            change_counts['skipped'] += 1
+        return (0)
+
+    statement_name = 'service_change:{0}'.format(','.join([column for column, value in changes]))
+    if statement_name not in merge_statements:
+        merge_statements[statement_name] = '''
+    Update [UTIL].[wServiceConnection]
+    set {0}
+    , [SysChangeDate] = SYSDATETIME()
+    , [SysChangeUser] = REPLACE(system_user,'COBNT1\\','')
+    where [FacilityID] = ?'''.format('\n    , '.join(['[{0}] = ?'.format(column) for column, value in changes]))
+
+    print ("     Changed columns:  {0}".format(', '.join([column for column, value in changes])))
+
+    executeDB(UTIL_conn, statement_name, [value for column, value in changes] + ['{}'.format(FacilityID)])
+
+    recordServiceState(FacilityID, changes, service_row)
+
+    with change_lock:
+        change_counts['written'] += 1
+        change_counts['columns'] += len(changes)
+
+    return (len(changes))
+
+def recordServiceState(FacilityID, set_columns, service_row):
+#-------------------------------------------------------------------------------
+# Name:        Function - Record Service State
+# Purpose:  Brings the facility's entry in service_state up to date with the
+#           set_columns just written over service_row, so a later row for the
+#           same facility shifts what was just written into the P* columns
+#           rather than the value from before the run.  In a transaction batch
+#           the old entry is kept so undoServiceState can put it back.
+#-------------------------------------------------------------------------------
+
+    batch_undo = getattr(merge_batch, 'undo', None)
+    if batch_undo != None:
+        batch_undo.append(('{}'.format(FacilityID), service_row))
+
+    current_values = dict(zip(service_columns, service_row))
+    current_values.update(set_columns)
+    service_state['{}'.format(FacilityID)] = tuple([current_values[column] for column in service_columns])
+
+    return
+
+def undoServiceState(undo_count):
+#-------------------------------------------------------------------------------
+# Name:        Function - Undo Service State
+# Purpose:  Puts back the service_state entries the current transaction batch
+#           changed after its first undo_count changes, newest first, once
+#           their writes have been rolled back.
+#-------------------------------------------------------------------------------
+
+    batch_undo = getattr(merge_batch, 'undo', None)
+    if batch_undo == None:
+        return
+
+    while len(batch_undo) > undo_count:
+        FacilityID, service_row = batch_undo.pop()
+        service_state[FacilityID] = service_row
+
+    return
+
+def streamDB(conn_string, query_string, params=(), fetch_size=500):
+#-------------------------------------------------------------------------------
+# Name:        Function - Stream DB
+# Purpose:  Runs a select on the run's dedicated read connection, kept
+#           outside the pool, and yields the rows fetch_size at a time, so a
+#           large result is never held in memory all at once.  Every stream
+#           of the run goes over the same connection, one after another; a
+#           dropped one is re-opened by the next.  Writes made while the rows
+#           are being worked through go through the pool as usual.
+#-------------------------------------------------------------------------------
+
+    stream_conn = db_pool.streamConnection(conn_string)
+    stream_cursor = stream_conn.cursor()
+
+    try:
+        stream_cursor.execute(query_string, *params)
+        while True:
+            stream_return = stream_cursor.fetchmany(fetch_size)
+            if len(stream_return) == 0:
+                break
+            yield stream_return
+    except Exception as stream_error:
+        if db_pool.isDisconnect(stream_error):
+            db_pool.dropStream(conn_string)
+        raise
+    finally:
+        try:
+            stream_cursor.close()
+        except db_errors:
+            pass
+
+def pendingBatches(query_string):
+#-------------------------------------------------------------------------------
+# Name:        Function - Pending Batches
+# Purpose:  Yields the run's pending rows for query_string.  Streams them
+#           stream_fetch_size at a time over the run's read connection when
+#           that is set, otherwise reads every keyset chunk and yields the lot
+#           as one batch.
+#-------------------------------------------------------------------------------
+
+    if stream_fetch_size > 0:
+        for chunk in keysetChunks(pending_keys, keyset_chunk_size):
+            for stream_return in streamDB(WebGIS_conn, query_string.format(', '.join(['?'] * len(chunk))), chunk, stream_fetch_size):
+                yield stream_return
+    else:
+        pull_update_return = []
+        for chunk in keysetChunks(pending_keys, keyset_chunk_size):
+            pull_update_return += queryDB(WebGIS_conn, query_string.format(', '.join(['?'] * len(chunk))), chunk)
+        yield pull_update_return
+
+class StatusWriter(object):
+#-------------------------------------------------------------------------------
+# Name:        Class - Status Writer
+# Purpose:  Buffers the SentToGIS status of each install and writes them back
+#           to ToHost2GIS_AMI with one set based update per outcome per chunk.
+#           The buffer is flushed once status_flush_size rows are waiting, at
+#           the end of each merge stage and when the script exits.  ObjectIDs
+#           whose status write committed are kept for saveWatermark.
+#-------------------------------------------------------------------------------
+
+    # Key columns each kind of status is matched back to ToHost2GIS_AMI on.
+    match_columns = {
+        'object': ('ObjectID',)}
+
+    # SentToGIS_Status and SentToGIS_Confirmed written for each outcome.
+    outcomes = {
+        'Complete': ('Complete', 'Yes'),
+        'Failure': ('Failure', 'Pending'),
+        'Superseded': ('Superseded', 'No')}
+
+    def __init__(self, flush_size):
+        self.flush_size = flush_size
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.written = 0
+        self.statements = 0
+        self.held = threading.local()
+        self.committed = set()
+
+    def mark(self, match, outcome, keys):
+        held_marks = getattr(self.held, 'marks', None)
+        if held_marks != None:
+            held_marks.append((match, outcome, keys))
+            return
+
+        with self.lock:
+            self.pending.setdefault((match, outcome), []).append(keys)
+            flush_needed = len(self.pending[(match, outcome)]) >= self.flush_size
+        if flush_needed:
+            self.flush()
+
+    def hold(self):
+        # Marks made on this thread wait for release, so a transaction batch's
+        # statuses are only written once it has committed.
+        self.held.marks = []
+
+    def heldCount(self):
+        return (len(self.held.marks))
+
+    def drop(self, held_count):
+        del self.held.marks[held_count:]
+
+    def release(self, committed):
+        held_marks = self.held.marks
+        self.held.marks = None
+        if committed:
+            for match, outcome, keys in held_marks:
+                self.mark(match, outcome, keys)
+
+    def flush(self):
+        with self.lock:
+            waiting = self.pending
+            self.pending = {}
+
+        for (match, outcome), status_rows in waiting.items():
+            key_columns = self.match_columns[match]
+
+            # Stay under the 2100 parameter limit of a single statement.
+            chunk_size = max(1, min(self.flush_size, 2000 // len(key_columns)))
+
+            for chunk_start in range(0, len(status_rows), chunk_size):
+                chunk = status_rows[chunk_start:chunk_start + chunk_size]
+
+                update_string = '''
+                Update [status]
+                set [SentToGIS_Status] = '{0}'
+                , [SentToGIS_Date] = SYSDATETIME()
+                , [SentToGIS_Confirmed] = '{1}'
+                from [UTIL].[ToHost2GIS_AMI] [status]
+                inner join (values {2}) [batch] ({3})
+                on {4}
+                where [status].[SentToGIS_Status] is NULL'''.format(
+                self.outcomes[outcome][0], self.outcomes[outcome][1],
+                ', '.join(['({0})'.format(', '.join(['?'] * len(key_columns)))] * len(chunk)),
+                ', '.join(['[{0}]'.format(key_column) for key_column in key_columns]),
+                ' and '.join(['[status].[{0}] = [batch].[{0}]'.format(key_column) for key_column in key_columns]))
+
+                try:
+                    updateDB(WebGIS_conn, update_string, [key for keys in chunk for key in keys])
+                    with self.lock:
+                        self.written += len(chunk)
+                        self.statements += 1
+                        if match == 'object':
+                            self.committed.update([keys[0] for keys in chunk])
+                except Exception as error_status_return:
+                    print ("Status:  Failure to write back {0} {1} status for {2} installs!  They remain pending.".format(match, outcome, len(chunk)))
+                    print (error_status_return.args[0])
+
+        return
+
+def loadWatermark():
+#-------------------------------------------------------------------------------
+# Name:        Function - Load Watermark
+# Purpose:  Reads the high water mark left by the last run and decides whether
+#           this run is due a full sweep.  watermark_floor is the ObjectID the
+#           pending queries start above; 0 on a full sweep.
+#-------------------------------------------------------------------------------
+
+    global watermark
+    global full_sweep
+    global watermark_floor
+
+    watermark = {'ObjectID': 0, 'FullSweep': 0}
+    full_sweep = True
+
+    if watermark_file != '':
+        try:
+            with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), watermark_file)) as watermark_read:
+                watermark.update(json.load(watermark_read))
+            full_sweep = time.time() - watermark['FullSweep'] >= full_sweep_hours * 3600
+        except (IOError, ValueError) as error_watermark_return:
+            print ("Status:  No usable watermark found.  Running a full sweep.")
+            print (error_watermark_return)
+
+    if full_sweep == True:
+        watermark_floor = 0
+        print ("Full sweep of ToHost2GIS_AMI.\n")
+    else:
+        watermark_floor = watermark['ObjectID']
+        print ("Reading ToHost2GIS_AMI above ObjectID {0}.\n".format(watermark_floor))
+
+    return (watermark, full_sweep)
+
+def saveWatermark():
+#-------------------------------------------------------------------------------
+# Name:        Function - Save Watermark
+# Purpose:  Moves the high water mark up to just below the lowest ObjectID in
+#           this run's keyset whose status was not written back, or to the
+#           highest one when every status landed.  Rows that failed to write
+#           or stayed pending are read again on the next run, not left for
+#           the next full sweep.  A full sweep may bring the mark down to an
+#           older row it found still pending.
+#-------------------------------------------------------------------------------
+
+    if watermark_file == '':
+        return
+
+    run_keys = sorted(pending_keys + superseded_keys)
+    if len(run_keys) > 0:
+        open_keys = [ObjectID for ObjectID in run_keys if ObjectID not in status_writer.committed]
+        if len(open_keys) > 0:
+            watermark['ObjectID'] = open_keys[0] - 1
+            print ("Status:  {0} installs left pending.  Watermark held at ObjectID {1}.".format(len(open_keys), watermark['ObjectID']))
+        else:
+            watermark['ObjectID'] = run_keys[-1]
+    if full_sweep == True:
+        watermark['FullSweep'] = time.time()
+
+    try:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), watermark_file), 'w') as watermark_write:
+            json.dump(watermark, watermark_write)
+    except IOError as error_watermark_return:
+        print ("Status:  Failure to save watermark!  Next run will start from the old one.")
+        print (error_watermark_return)
+
+    return
 
 def check4udpate():
 #-------------------------------------------------------------------------------
 # Name:        Function - Check 4 Update
 # Purpose:  This looks into WebGIS and identifies if there are awaiting installs.
+#           The pending ObjectIDs are snapshotted once here and that frozen
+#           keyset drives the rest of the run.
 #-------------------------------------------------------------------------------
 
     global pending_update
     global update_count
+    global pending_keys
+    global pending_facilities
+    global superseded_keys
 
     print ("Entering Check For Updates---->\n")
 
+    pending_keys = []
+    pending_facilities = []
+    superseded_keys = []
+
     query_string = '''select
-    [ProvidedPremiseNumber]
-    ,[NewMeterNumber]
-    from [UTIL].[TOHOST2GIS_AMI] where convert(date, [InstallDate]) <= convert (date, getdate()) and [SentToGIS_Date] is NULL'''
+    count(*)
+    from [UTIL].[TOHOST2GIS_AMI] where [InstallDate] < convert (date, getdate() + 1) and [SentToGIS_Date] is NULL
+    and [ObjectID] > ?'''
+
+    update_count = queryDB(WebGIS_conn, query_string, (watermark_floor,))[0][0]
+
+    if update_count > 0:
+        query_string = '''select
+        [ObjectID]
+        ,[WorkOrderNumber]
+        ,[CompletedWorkType]
+        ,[WorkEndDatetime]
+        from [UTIL].[TOHOST2GIS_AMI] where [InstallDate] < convert (date, getdate() + 1) and [SentToGIS_Date] is NULL
+        and [ObjectID] > ?
+        order by [ObjectID]'''
 
-    query_conn = pyodbc.connect(WebGIS_conn)
-    query_cursor = query_conn.cursor()
-    query_cursor.execute(query_string)
-    check_update_return = query_cursor.fetchall()
-    query_cursor.close()
-    query_conn.close()
+        check_update_return = queryDB(WebGIS_conn, query_string, (watermark_floor,))
 
-    pending_update = len(check_update_return)
+        if coalesce_pending == True:
+            check_update_return, superseded_keys = coalescePending(check_update_return)
+
+        pending_keys = [row[0] for row in check_update_return]
+        pending_facilities = sorted(set(['{}'.format(row[1]) for row in check_update_return if row[1] != None]))
+
+    pending_update = len(pending_keys)
 
     # Check record count
-    update_count = pending_update
     print ("Meters available at target: {0}".format(update_count))
-    print ("Meter records pending insertion:  {0}\n".format(pending_update))
+    print ("Meter records pending insertion:  {0}".format(pending_update))
+    print ("Meter records superseded by a later record:  {0}\n".format(len(superseded_keys)))
     print ("Leaving Check For Updates----< \n\n")
 
     return (update_count, pending_update)
 
+def workEndKey(work_end):
+    # WorkEndDatetime is mmddYYYYHHMMSS stored as a number, so it is turned
+    # into YYYYmmddHHMMSS to sort.  Anything unreadable sorts first.
+    try:
+        work_end = '{0:014d}'.format(int(float(work_end)))
+    except (TypeError, ValueError):
+        return (0)
+
+    return (int(work_end[4:8] + work_end[0:4] + work_end[8:]))
+
+def coalescePending(check_update_return):
+#-------------------------------------------------------------------------------
+# Name:        Function - Coalesce Pending
+# Purpose:  Keeps one pending row per FacilityID per merge stage, the one with
+#           the latest WorkEndDatetime and then ObjectID.  The rows it replaces
+#           are marked Superseded in bulk before the merge starts, so each
+#           facility is written once and the P* shift never runs against
+#           values this same run wrote.  Returns the kept rows in ObjectID
+#           order and the superseded ObjectIDs.
+#-------------------------------------------------------------------------------
+
+    latest = {}
+    kept_rows = []
+    superseded_keys = []
+
+    for row in check_update_return:
+        if row[1] == None:
+            kept_rows.append(row)
+            continue
+
+        # Work types sharing a merge stage (MC and ME) coalesce together.
+        merge_stage = install_handlers.get(row[2], install_handlers['MC'])[0]
+        facility_key = ('{}'.format(row[1]), merge_stage)
+
+        if facility_key not in latest:
+            latest[facility_key] = row
+        elif (workEndKey(row[3]), row[0]) > (workEndKey(latest[facility_key][3]), latest[facility_key][0]):
+            superseded_keys.append(latest[facility_key][0])
+            latest[facility_key] = row
+        else:
+            superseded_keys.append(row[0])
+
+    kept_rows = sorted(kept_rows + list(latest.values()), key=lambda row: row[0])
+
+    if len(superseded_keys) > 0:
+        for ObjectID in superseded_keys:
+            status_writer.mark('object', 'Superseded', (ObjectID,))
+        status_writer.flush()
+
+    return (kept_rows, sorted(superseded_keys))
+
+def keysetChunks(keys, chunk_size):
+#-------------------------------------------------------------------------------
+# Name:        Function - Keyset Chunks
+# Purpose:  Splits a list of keys into IN list sized chunks.  SQL Server caps a
+#           statement at 2100 parameters, so chunk_size has to stay below that.
+#-------------------------------------------------------------------------------
+
+    for chunk_start in range(0, len(keys), chunk_size):
+        yield keys[chunk_start:chunk_start + chunk_size]
+
 def correctInstallDates():
+#-------------------------------------------------------------------------------
+# Name:        Function - Correct Install Dates
+# Purpose:  Fills NULL InstallDate / XMTInstDate from WorkEndDatetime.  The
+#           whole column is parsed at once and every correction is applied in
+#           one batched update.  Values that will not parse are reported back
+#           as rejects and left alone.  With stream_fetch_size set the rows are
+#           read and corrected stream_fetch_size at a time instead.
+#-------------------------------------------------------------------------------
 
     print ("Entering Installation Date Correction---->\n")
 
+    fixed_count = 0
+    null_count = 0
+    rejects = []
+
     try:
         query_string = '''
         select [ObjectID], [WorkEndDatetime]
         from [UTIL].[ToHost2GIS_AMI]
-        where [InstallDate] is NULL
+        where [InstallDate] is NULL and [ObjectID] > ?
         '''
 
-        query_conn = pyodbc.connect(WebGIS_conn)
-        query_cursor = query_conn.cursor()
-        query_cursor.execute(query_string)
-        located_nulls = query_cursor.fetchall()
-        query_cursor.close()
-        query_conn.close()
-
-        for row in located_nulls:
-            objectID = row[0]
-            date_target = '{}'.format(int(row[1]))
-            if len(date_target) == 13:
-                date_target = '0' + date_target
-            try:
-                print (date_target)
-                date_target = datetime.strptime(date_target, "%m%d%Y%H%M%S")
-                print (date_target)
-                date_target = date_target.strftime("%m-%d-%Y")
+        if stream_fetch_size > 0:
+            null_batches = streamDB(WebGIS_conn, query_string, (watermark_floor,), stream_fetch_size)
+        else:
+            null_batches = [queryDB(WebGIS_conn, query_string, (watermark_floor,))]
 
-                try:
-                    update_string = '''
-                    update [UTIL].[ToHost2GIS_AMI]
-                    set [InstallDate] = '{}',
-                    [XMTInstDate] = '{}'
-                    where [ObjectID] = '{}'
-                    '''.format(date_target, date_target, objectID)
-
-                    update_conn = pyodbc.connect(WebGIS_conn)
-                    update_cursor = update_conn.cursor()
-                    update_cursor.execute(update_string)
-                    update_conn.commit()
-                    update_cursor.close()
-                    update_conn.close()
-
-                except:
-                    print ("Status:  Failure to correct installation dates!  Check for no NULLS in [UTIL].[TOHOST2GIS_AMI] before raising alarm.")
-            except:
-                print ('Unable to adjust date.  Check date.')
-    except:
-        print ('Status:  No updates needed')
+        for located_nulls in null_batches:
+            null_count += len(located_nulls)
+            batch_fixed, batch_rejects = correctInstallDateBatch(located_nulls)
+            fixed_count += batch_fixed
+            rejects += batch_rejects
+
+        if null_count == 0:
+            print ('Status:  No updates needed')
+        else:
+            print ("Installation dates corrected:  {0}".format(fixed_count))
+            print ("Installation dates rejected:  {0}".format(len(rejects)))
+            for objectID, work_end_date in rejects:
+                print ('     Unable to adjust date for ObjectID {0} ({1}).  Check date.'.format(objectID, work_end_date))
+
+    except Exception as error_null_date_return:
+        print ("Status:  Failure to pull NULL installation dates!")
+        print (error_null_date_return.args[0])
 
     print ("Leaving Installation Date Correction----< \n\n")
 
-    return
+    return (fixed_count, rejects)
+
+def correctInstallDateBatch(located_nulls):
+#-------------------------------------------------------------------------------
+# Name:        Function - Correct Install Date Batch
+# Purpose:  Parses one batch of WorkEndDatetime values and applies the
+#           corrections in one transaction.  Returns the number fixed and the
+#           rows that would not parse.
+#-------------------------------------------------------------------------------
+
+    fixed_count = 0
+    rejects = []
+
+    if len(located_nulls) == 0:
+        return (fixed_count, rejects)
+
+    import pandas as pd
+
+    null_dates = pd.DataFrame.from_records([tuple(row) for row in located_nulls], columns=['ObjectID', 'WorkEndDatetime'])
+
+    # WorkEndDatetime is mmddYYYYHHMMSS stored as a number, so months
+    # before October lose their leading zero and arrive as 13 digits.
+    work_end = pd.to_numeric(null_dates['WorkEndDatetime'], errors='coerce').dropna()
+    date_target = (work_end // 1).astype('int64').astype(str)
+    date_target = date_target.where(date_target.str.len() != 13, '0' + date_target)
+    date_target = pd.to_datetime(date_target, format='%m%d%Y%H%M%S', errors='coerce').reindex(null_dates.index)
+
+    corrections = null_dates[date_target.notna()]
+    rejects = [tuple(reject) for reject in null_dates[date_target.isna()].itertuples(index=False)]
+    update_rows = list(zip(date_target[date_target.notna()].dt.date.tolist(), corrections['ObjectID'].tolist()))
+
+    try:
+        with db_pool.connection(WebGIS_conn) as update_conn:
+            update_cursor = update_conn.cursor()
+
+            # Stay under the 2100 parameter limit of a single statement.
+            for chunk_start in range(0, len(update_rows), 1000):
+                chunk = update_rows[chunk_start:chunk_start + 1000]
+
+                update_string = '''
+                update [target]
+                set [InstallDate] = [batch].[InstallDate],
+                [XMTInstDate] = [batch].[InstallDate]
+                from [UTIL].[ToHost2GIS_AMI] [target]
+                inner join (values {0}) [batch] ([InstallDate], [ObjectID])
+                on [target].[ObjectID] = [batch].[ObjectID]
+                '''.format(', '.join(['(?, ?)'] * len(chunk)))
+
+                update_cursor.execute(update_string, [value for update_row in chunk for value in update_row])
+
+            update_conn.commit()
+            update_cursor.close()
+
+        fixed_count = len(update_rows)
+
+    except Exception as error_correction_return:
+        print ("Status:  Failure to correct installation dates!  Check for no NULLS in [UTIL].[TOHOST2GIS_AMI] before raising alarm.")
+        print (error_correction_return.args[0])
+
+    return (fixed_count, rejects)
 
 def mergeODS2GIS():
 
     global update_attempt_count
     update_attempt_count = 0
 
+    change_counts.update({'skipped': 0, 'written': 0, 'columns': 0})
+
     print ("Entering ODS Merge---->\n")
-    print ("Entering Meter Installation---->\n")
+    print ("Entering wServiceConnection Prefetch---->\n")
 
-    mergeMeterInstalls()
+    prefetchServiceConnections()
 
-    print ("\n\n")
-    print ("Install Count:  {0}\n\n".format(mc_count))
-    print ("Leaving Meter Installation----< \n\n")
-    print ("Entering Endpoint Installation---->\n")
+    print ("Leaving wServiceConnection Prefetch----< \n\n")
+    print ("Entering Installation Merge---->\n")
 
-    mergeXMITInstalls(mc_count)
+    try:
+        mergeInstalls()
+    finally:
+        status_writer.flush()
 
     print ("\n\n")
-    print ("Install Count:  {0}\n\n".format(ei_count))
-    print ("Leaving Endpoint Installation----< \n\n")
+    for install_stage in install_counts:
+        print ("{0} Install Count:  {1}".format(install_stage, install_counts[install_stage]))
+    print ("\nStatus rows written back:  {0} in {1} statements\n".format(status_writer.written, status_writer.statements))
+    if change_detection == True:
+        print ("Installs already in place and skipped:  {0}".format(change_counts['skipped']))
+        print ("Columns written:  {0} across {1} updates\n".format(change_counts['columns'], change_counts['written']))
+    print ("Leaving Installation Merge----< \n\n")
 
-    update_attempt_count = mc_count + ei_count
+    update_attempt_count = sum(install_counts.values())
 
     print ("Leaving ODS Merge----< \n\n")
 
-    return (update_attempt_count, mc_count, ei_count)
+    return (update_attempt_count, install_counts)
 
-def mergeMeterInstalls():
+def prefetchServiceConnections():
+#-------------------------------------------------------------------------------
+# Name:        Function - Prefetch Service Connections
+# Purpose:  Pulls the current wServiceConnection values for every pending
+#           WorkOrderNumber in the run's keyset up front, in chunks of
+#           keyset_chunk_size, so the merge loops read them from memory rather
+#           than the database.
+#-------------------------------------------------------------------------------
 
-    global mc_count
-    mc_count = 0
+    global service_state
+    service_state = {}
 
-    query_string = '''select
-    [ProvidedPremiseNumber]
-    ,[FoundMeterManufacturer]
-    ,[FoundMeterNumber]
-    ,[FoundMeterReading]
-    ,[FoundMeterSizeCode]
-    ,[NewMeterManufacturer]
-    ,[NewMeterNumber]
-    ,[NewMeterReading]
-    ,[NewMeterNumberOfDials]
-    ,[NewMeterSizeCode]
-    ,[Comments]
-    ,[WorkOrderNumber]
-    ,cast (convert (date,[InstallDate]) as varchar(10)) as [InstallDate]
-    ,cast (convert (date, [XMTInstDate]) as varchar (10)) as [XMTInstDate]
-    ,[XMTMFG]
-    ,[XMTModel]
-    ,[XMTSerialNum]
-    ,[XMTMTType]
-    ,cast (convert (date, [XMTShipDate]) as varchar (10)) as [XMTShipDate]
-    ,[XMTPart]
-    ,[XMTPSerial]
-    ,[AsLeftQ1]
-    ,[AsLeftQ2]
-    ,[AsLeftQ9]
-    ,[NewMeterModel]
-    ,[NewEndpointType]
-    ,[CompletedWorkType]
-    from [UTIL].[TOHOST2GIS_AMI] where [CompletedWorkType] <> 'EI'
-	and convert(date, [InstallDate]) <= convert (date, getdate()) and [SentToGIS_Date] is NULL'''
+    if server_shift == True and bulk_write == False:
+        print ("Server side shift on.  Prefetch not needed.\n")
+        return (service_state)
+
+    select_columns = '\n            , '.join([
+        'cast (convert (date, [{0}]) as varchar(10)) as [{0}]'.format(column) if column in service_date_columns else '[{0}]'.format(column)
+        for column in service_columns])
+
+    missing_facilities, change_mark = loadMissingCache()
+    lookup_facilities = [FacilityID for FacilityID in pending_facilities if FacilityID not in missing_facilities]
 
     try:
-        query_conn = pyodbc.connect(WebGIS_conn)
-        query_cursor = query_conn.cursor()
-        query_cursor.execute(query_string)
-        pull_update_return = query_cursor.fetchall()
-        query_cursor.close()
-        query_conn.close()
-
-        for row in pull_update_return:
-            AccountID = row[0]  ##ProvidedPremiseNumber <compare> accountid
-            PMeterManufacturer = row[1] ## FoundMeterManufacturer -> PMeterManufacturer
-            PMetSerial = row[2] ## FoundMeterNumber -> PMetSerial
-            PMetFinalRead = row[3] ## FoundMeterReading -> PMetFinalRead
-            PMeterSize = row[4] ##  FoundMeterSizeCode ->  PMeterSize
-            MeterManufacturer = row[5] ## NewMeterManufacturer -> MeterManufacturer
-            MetModel = row[24]  ## NewMeterModel -> MetModel
-            MetSerialNum = row[6] ## NewMeterNumber -> MetSerialNum
-            MetInitialRead = row[7] ##  NewMeterReading -> MetInitialRead
-            DialCount = row[8] ##  NewMeterNumberOfDials -> DialCount
-            MeterSize = row[9] ## NewMeterSizeCode -> MeterSize
-            Comments = row[10] ##  Comments -> Comments
-            FacilityID = row[11] ## WorkdOrderNumber = FacilityID
-            MetInstDate = row[12] ##  InstallDate ->  MetInstDate
-            completed_work = row[26]
-
-            if completed_work == 'ME':
-                XMTInstDate = 'NULL'
-                XMTMFG = "'NA'"
-                XMTModel = "'NA'"
-                XMTSerialNum = 'NULL'
-                XMTMTType = "'NA'"
-                XMTShipDate = 'NULL'
-                XMTPart = 'NULL'
-                XMTPSerial = 'NULL'
+        for chunk in keysetChunks(lookup_facilities, keyset_chunk_size):
 
-            else:
-                XMTInstDate = "'{}'".format(row[13]) ## XMTInstDate -> XMTInstDate
-                XMTMFG = "'{}'".format(row[14])  ## XMTMFG -> XMTMFG
-                XMTModel = "'{}'".format(row[15])  ## XMTModel -> XMTModel
-                XMTSerialNum = "'{}'".format(row[16])  ## XMTSerialNum -> XMTSerialNum
-                XMTMTType = "'{}'".format(row[17]) ## XMTMTType -> XMTMTType
-                XMTShipDate = "'{}'".format(row[18]) ## XMTShipDate -> XMTShipDate
-                XMTPart = "'{}'".format(row[19]) ## XMTPart -> XMTPart
-                XMTPSerial = "'{}'".format(row[20]) ## XMTPSerial -> XMTPSerial
-
-            AsLeftQ1 = row[21]  ## If NULL, Do not change [InstallDate].  If <> NULL, update [InstallDate] = row [12] and [BoxModel] = row [21]
-            AsLeftQ2 = row[22]  ## If NULL do not update [BoxCover].  If <> NULL, update [BoxCover]
-            AsLeftQ9 = row[23]  ## AsLeftQ9 -> XMTMTType
-
-            print ("Attempting Update of Asset ID: {0}".format(FacilityID))
-            print ("     Found Meter Number: {0}".format(PMetSerial))
-
-            if MetModel == None:
-                MetModel = 'None'
-            else:
-                MetModel = MetModel
+            query_string = '''select
+            {0}
+            from [UTIL].[wServiceConnection]
+            where [FacilityID] in ({1})'''.format(select_columns, ', '.join(['?'] * len(chunk)))
 
-            if "." not in MetInitialRead:
-                MetInitialRead = MetInitialRead
-            else:
-                MetInitialRead = '0'
+            for row in queryDB(UTIL_conn, query_string, chunk):
+                service_state['{}'.format(row[0])] = row
 
-            if PMeterManufacturer == None:
-                try:
-                    query_string = '''select
-                    [METERMANUFACTURER]
-                    from [UTIL].[wServiceConnection]
-                    where [FacilityID] = {0} '''.format(FacilityID)
-
-                    query_conn = pyodbc.connect(UTIL_conn)
-                    query_cursor = query_conn.cursor()
-                    query_cursor.execute(query_string)
-                    old_wServiceConnectionMeterManufacturer_return = query_cursor.fetchall()
-                    query_cursor.close()
-                    query_conn.close()
-
-                    for response in old_wServiceConnectionMeterManufacturer_return:
-                        if response[0] == None:
-                            print ("     No current manufacturer found.")
-                            PMeterManufacturer = 'NULL'
-                        else:
-                            PMeterManufacturer = response[0]
-                            print ("     Current manufacturer found:  {0}".format(PMeterManufacturer))
-                            PMeterManufacturer = "'{}'".format(PMeterManufacturer)
-
-                except Exception as old_wServiceConnectionMeterManufacturer_return:
-                    print ("Status:  Failure to pull original MeterManufacturer!")
-                    print (old_wServiceConnectionMeterManufacturer_return.args[0])
-            else:
-                PMeterManufacturer = "'{0}'".format(PMeterManufacturer)
+        print ("Pending facilities:  {0}".format(len(pending_facilities)))
+        print ("Facilities known missing and not looked up:  {0}".format(len(pending_facilities) - len(lookup_facilities)))
+        print ("Facilities found in wServiceConnection:  {0}\n".format(len(service_state)))
 
-            try:
-                query_string = '''
-                select [FacilityID] from [UTIL].[wServiceConnection] where [FacilityID] = '{0}' '''.format(FacilityID)
+        saveMissingCache(missing_facilities | set([FacilityID for FacilityID in lookup_facilities if FacilityID not in service_state]), change_mark)
 
-                query_conn = pyodbc.connect(UTIL_conn)
-                query_cursor = query_conn.cursor()
-                query_cursor.execute(query_string)
-                check_wServiceConnection_return = query_cursor.fetchall()
-                query_cursor.close()
-                query_conn.close()
+    except Exception as error_prefetch_return:
+        print ("Status:  Failure to prefetch wServiceConnection!")
+        print (error_prefetch_return.args[0])
+        service_state = None
 
-                for response in check_wServiceConnection_return:
-                    if response[0] == None:
-                        error_catch = 1
-                    else:
-                        error_catch = 0
+    return (service_state)
 
-            except Exception as check_wServiceConnection_return:
-                print ("Status:  Failure to pull original Service Type!")
-                print (check_wServiceConnection_return.args[0])
+def loadMissingCache():
+#-------------------------------------------------------------------------------
+# Name:        Function - Load Missing Cache
+# Purpose:  Reads the FacilityIDs known to be missing from wServiceConnection
+#           and drops any with a SysChangeDate past the cached high water mark,
+#           since they have been added or changed since.  Returns the ones
+#           still missing and the high water mark to store with them next.
+#           Any trouble falls back to looking every facility up.
+#-------------------------------------------------------------------------------
 
-                error_catch = 1
+    missing_cache = {'SysChangeDate': None, 'Facilities': []}
 
-                update_string ='''
-                Update [UTIL].[ToHost2GIS_AMI]
-                set [SentToGIS_Status] = 'Failure'
-                , [SentToGIS_Date] = SYSDATETIME()
-                , [SentToGIS_Confirmed] = 'Pending'
-                where [WorkOrderNumber] = '{0}' and [NewMeterNumber] = '{1}' and [InstallDate] = '{2}' and [SentToGIS_Status] is NULL'''.format(
-                FacilityID, MetSerialNum, MetInstDate)
+    if missing_cache_file == '':
+        return (set(), None)
 
-                update_conn = pyodbc.connect(WebGIS_conn)
-                update_cursor = update_conn.cursor()
-                update_cursor.execute(update_string)
-                update_conn.commit()
-                update_cursor.close()
-                update_conn.close()
+    try:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), missing_cache_file)) as cache_read:
+            missing_cache.update(json.load(cache_read))
+    except (IOError, ValueError) as error_cache_return:
+        print ("Status:  No usable missing facility cache found.  Looking every facility up.")
+        print (error_cache_return)
 
-                return
+    try:
+        if missing_cache['SysChangeDate'] == None or len(missing_cache['Facilities']) == 0:
+            change_mark = queryDB(UTIL_conn, '''select max([SysChangeDate]) from [UTIL].[wServiceConnection]''')[0][0]
+            return (set(), None if change_mark == None else '{}'.format(change_mark))
 
-            if error_catch == 0:
+        changed_return = queryDB(UTIL_conn, '''select [FacilityID], [SysChangeDate] from [UTIL].[wServiceConnection]
+        where [SysChangeDate] > ?''', (missing_cache['SysChangeDate'],))
 
-                # ADDED 2019 Sept 13 - Addressed PMetSerial issue for bug 980.
-                #                      Additionally, condensed 3 separate DB
-                #                      calls into 1 call for 4 items.
-                try:
-                    query_string = '''select
-                    [MetSerialNum]
-                    , cast (convert (date, [MetInstDate]) as varchar(10)) as [MetInstDate]
-                    , [MetModel]
-                    , [ServiceType]
-                    , [XMTSerialNum]
-                    from [UTIL].[wServiceConnection]
-                    where [FacilityID] = {0} '''.format(FacilityID)
-
-                    query_conn = pyodbc.connect(UTIL_conn)
-                    query_cursor = query_conn.cursor()
-                    query_cursor.execute(query_string)
-                    old_wServiceConnectionData_return = query_cursor.fetchall()
-                    query_cursor.close()
-                    query_conn.close()
-
-                    if len(old_wServiceConnectionData_return) == 0:
-                        print ("     No Meter Serial Number found.")
-                        PMetSerial = 'NULL'
-                        print ("     No Installation date found.")
-                        PMetInstDate = 'NULL'
-                        print ("     No Installation model found.")
-                        PMETModel = 'NULL'
-                        print ("     No service type found.\n")
-                        PServiceType = 'NULL'
-                        print ("     No previous transmitter found.\n")
-                        XMTPSerial = 'NULL'
-                    else:
-                        for row in old_wServiceConnectionData_return:
-                            PMetSerial = row[0]
-                            if PMetSerial == None:
-                                print ("     No Serial Number Found.")
-                                PMetSerial = 'NULL'
-                            else:
-                                print ("     Serial Number found:  {0}".format(PMetSerial))
-                                PMetSerial = "'{0}'".format(PMetSerial)
-
-                            PMetInstDate = row[1]
-                            if PMetInstDate == None:
-                                print ("     No Installation date found.")
-                                PMetInstDate = 'NULL'
-                            else:
-                                print ("     Installation date found:  {0}".format(PMetInstDate))
-                                PMetInstDate = "'{0}'".format(PMetInstDate)
-
-                            PMETModel = row[2]
-                            if PMETModel == None:
-                                print ("     No Installation model found.")
-                                PMETModel = 'NULL'
-                            else:
-                                print ("     Meter Model found:  {0}".format(PMETModel))
-                                PMETModel = "'{0}'".format(PMETModel)
-
-                            PServiceType = row[3]
-                            if PServiceType == None:
-                                print ("     No service type found.")
-                                PServiceType = 'NULL'
-                            else:
-                                print ("     Service type found:  {0}".format(PServiceType))
-                                PServiceType = "'{0}'".format(PServiceType)
-
-                            XMTPSerial = row[4]
-                            if XMTPSerial == None:
-                                print ("     No transmitter serial number found.\n")
-                                XMTPSerial = 'NULL'
-                            else:
-                                print ("     Transmitter serial number found:  {0}\n".format(XMTPSerial))
-                                XMTPSerial = "'{0}'".format(XMTPSerial)
-
-                except Exception as old_wServiceConnectionData_return:
-                    print ("Status:  Failure to pull original Meter Variables for Serial Number, Installation Date, Installation Model and Service Type!")
-                    print (old_wServiceConnectionData_return.args[0])
+    except Exception as error_cache_return:
+        print ("Status:  Failure to check wServiceConnection for changes!  Looking every facility up.")
+        print (error_cache_return.args[0])
+        return (set(), None)
 
-                try:
-                    # Begin update of UTIL.wServiceConnection mass data.
-
-                    # Set SQL statement for update based upon current record row.
-                    update_string = '''
-                    Update [UTIL].[wServiceConnection]
-                    set [PMeterManufacturer] = {0}
-                    , [PMetSerial] = {1}
-                    , [PMetFinalRead] = '{2}'
-                    , [PMeterSize] = '{3}'
-                    , [PMetInstDate] = {4}
-                    , [PMETModel] = {5}
-                    , [PServiceType] = {6}
-                    , [MeterManufacturer] = '{7}'
-                    , [MetModel] = '{8}'
-                    , [MetSerialNum] = '{9}'
-                    , [MetInitialRead] = '{10}'
-                    , [DialCount] = '{11}'
-                    , [MeterSize] = '{12}'
-                    , [MetInstDate] = '{13}'
-                    , [XMTInstDate] = {14}
-                    , [XMTMFG] = {15}
-                    , [XMTModel] = {16}
-                    , [XMTSerialNum] = {17}
-                    , [XMTMTType] = {18}
-                    , [XMTShipDate] = {19}
-                    , [XMTPart] = {20}
-                    , [XMTPSerial] = {21}
-                    , [SysChangeDate] = SYSDATETIME()
-                    , [SysChangeUser] = REPLACE(system_user,'COBNT1\\','')
-                    where [FacilityID] = '{22}' '''.format(
-                    PMeterManufacturer, PMetSerial, PMetFinalRead, PMeterSize, PMetInstDate, PMETModel, PServiceType, MeterManufacturer, MetModel, MetSerialNum,
-                    MetInitialRead, DialCount, MeterSize, MetInstDate, XMTInstDate, XMTMFG, XMTModel, XMTSerialNum, XMTMTType, XMTShipDate, XMTPart, XMTPSerial,
-                    FacilityID)
-
-                    update_conn = pyodbc.connect(UTIL_conn)
-                    update_cursor = update_conn.cursor()
-                    update_cursor.execute(update_string)
-                    update_conn.commit()
-                    update_cursor.close()
-                    update_conn.close()
-
-                except Exception as error_test_accountID_return:
-                    error_catch = 1
-                    print ("Status:  Failure to push update to record!")
-                    print (error_test_accountID_return.args[0])
-                    update_string ='''
-                    Update [UTIL].[ToHost2GIS_AMI]
-                    set [SentToGIS_Status] = 'Failure'
-                    , [SentToGIS_Date] = SYSDATETIME()
-                    , [SentToGIS_Confirmed] = 'Pending'
-                    where [WorkOrderNumber] = '{0}' and [NewMeterNumber] = '{1}' and [InstallDate] = '{2}' and [SentToGIS_Status] is NULL'''.format(
-                    FacilityID, MetSerialNum, MetInstDate)
-
-                    update_conn = pyodbc.connect(WebGIS_conn)
-                    update_cursor = update_conn.cursor()
-                    update_cursor.execute(update_string)
-                    update_conn.commit()
-                    update_cursor.close()
-                    update_conn.close()
-
-                    return
-
-                if AsLeftQ1 is None:
-                    AsLeftQ1 = 'No (Default)'
-
-                if (AsLeftQ1 != 'No' and AsLeftQ1 != 'No (Default)') and error_catch == 0:
-
-                    try:
-                        # Begin update of UTIL.wServiceConnection Box Installation Related.
-
-                        # Set SQL statement for update based upon current record row.
-                        update_string = '''
-                        Update [UTIL].[wServiceConnection]
-                        set [InstallDate] = '{0}'
-                        , [BoxModel] = '{1}'
-                        , [SysChangeDate] = SYSDATETIME()
-                        , [SysChangeUser] = REPLACE(system_user,'COBNT1\\','')
-                        where [FacilityID] = '{2}' '''.format(MetInstDate, AsLeftQ1, FacilityID)
-
-                        print ("    MC Asleft Q1")
-
-                        update_conn = pyodbc.connect(UTIL_conn)
-                        update_cursor = update_conn.cursor()
-                        update_cursor.execute(update_string)
-                        update_conn.commit()
-                        update_cursor.close()
-                        update_conn.close()
-
-                    except Exception as error_test_accountID_return:
-                        print ("Status:  Failure to push Q1 update to record!")
-                        print (error_test_accountID_return.args[0])
-
-                if AsLeftQ2 is None:
-                    AsLeftQ2 = 'No (Default)'
-
-                if (AsLeftQ2 != 'No' and AsLeftQ2 != 'No (Default)') and error_catch == 0:
-
-                    try:
-                        # Begin update of UTIL.wServiceConnection Box Installation Related.
-
-                        # Set SQL statement for update based upon current record row.
-                        update_string = '''
-                        Update [UTIL].[wServiceConnection]
-                        set [BoxCover] = '{0}'
-                        , [SysChangeDate] = SYSDATETIME()
-                        , [SysChangeUser] = REPLACE(system_user,'COBNT1\\','')
-                        where [FacilityID] = '{1}' '''.format(AsLeftQ2, FacilityID,)
-
-                        print ("    MC Asleft Q2")
-
-                        update_conn = pyodbc.connect(UTIL_conn)
-                        update_cursor = update_conn.cursor()
-                        update_cursor.execute(update_string)
-                        update_conn.commit()
-                        update_cursor.close()
-                        update_conn.close()
-
-                    except Exception as error_test_accountID_return:
-                        print ("Status:  Failure to push Q2 update to record!")
-                        print (error_test_accountID_return.args[0])
-
-                if error_catch == 0:
-
-                    update_string ='''
-                    Update [UTIL].[ToHost2GIS_AMI]
-                    set [SentToGIS_Status] = 'Complete'
-                    , [SentToGIS_Date] = SYSDATETIME()
-                    , [SentToGIS_Confirmed] = 'Yes'
-                    where [WorkOrderNumber] = '{0}' and [NewMeterNumber] = '{1}' and [InstallDate] = '{2}' and [SentToGIS_Status] is NULL'''.format(
-                    FacilityID, MetSerialNum, MetInstDate)
-
-                    update_conn = pyodbc.connect(WebGIS_conn)
-                    update_cursor = update_conn.cursor()
-                    update_cursor.execute(update_string)
-                    update_conn.commit()
-                    update_cursor.close()
-                    update_conn.close()
-
-                    mc_count += 1
-
-                print ("\n\nCompleted {0} of {1} updates.\n\n".format(mc_count, pending_update))
+    missing_facilities = set(missing_cache['Facilities']) - set(['{}'.format(row[0]) for row in changed_return])
 
-            else:
+    change_mark = missing_cache['SysChangeDate']
+    if len(changed_return) > 0:
+        change_mark = '{}'.format(max([row[1] for row in changed_return]))
 
-                update_string ='''
-                Update [UTIL].[ToHost2GIS_AMI]
-                set [SentToGIS_Status] = 'Failure'
-                , [SentToGIS_Date] = SYSDATETIME()
-                , [SentToGIS_Confirmed] = 'Pending'
-                where [WorkOrderNumber] = '{0}' and [NewMeterNumber] = '{1}' and [InstallDate] = '{2}' and [SentToGIS_Status] is NULL'''.format(
-                FacilityID, MetSerialNum, MetInstDate)
+    return (missing_facilities, change_mark)
 
-                update_conn = pyodbc.connect(WebGIS_conn)
-                update_cursor = update_conn.cursor()
-                update_cursor.execute(update_string)
-                update_conn.commit()
-                update_cursor.close()
-                update_conn.close()
+def saveMissingCache(missing_facilities, change_mark):
+#-------------------------------------------------------------------------------
+# Name:        Function - Save Missing Cache
+# Purpose:  Writes the missing FacilityIDs back out with the high water mark
+#           they were checked against.
+#-------------------------------------------------------------------------------
 
-    except Exception as error_pull_update_return:
-        print ("Status:  Failure to pull update return!")
-        print (error_pull_update_return.args[0])
+    if missing_cache_file == '' or change_mark == None:
+        return
 
-    return (mc_count)
+    try:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), missing_cache_file), 'w') as cache_write:
+            json.dump({'SysChangeDate': change_mark, 'Facilities': sorted(missing_facilities)}, cache_write)
+    except IOError as error_cache_return:
+        print ("Status:  Failure to save missing facility cache!  Next run will look them up again.")
+        print (error_cache_return)
 
+    return
 
-def mergeXMITInstalls(mc_count):
+def runMergeWorkers(pull_update_return, facility_index, apply_install):
+#-------------------------------------------------------------------------------
+# Name:        Function - Run Merge Workers
+# Purpose:  Applies a batch of installs with merge_workers threads.  Rows are
+#           partitioned on a hash of FacilityID so every row for a facility
+#           lands on the same worker and applies there in its original order.
+#           Each worker returns its own count; nothing else is shared between
+#           them but the connection pool and the status writer.
+#-------------------------------------------------------------------------------
 
-    global ei_count
-    ei_count = 0
+    # Each worker needs a connection of its own, so the pool size caps them.
+    worker_count = max(1, min(merge_workers, pool_size, len(pull_update_return)))
 
-    remaining_updates = pending_update - mc_count
+    if worker_count < merge_workers:
+        print ("Merge workers capped at {0}.".format(worker_count))
 
-    query_string = '''select
-    [ProvidedPremiseNumber]
-    ,[FoundMeterManufacturer]
-    ,[FoundMeterNumber]
-    ,[FoundMeterReading]
-    ,[FoundMeterSizeCode]
-    ,[Comments]
-    ,[WorkOrderNumber]
-    ,cast (convert (date, [XMTInstDate]) as varchar (10)) as [XMTInstDate]
-    ,[XMTMFG]
-    ,[XMTModel]
-    ,[XMTSerialNum]
-    ,[XMTMTType]
-    ,cast (convert (date, [XMTShipDate]) as varchar (10)) as [XMTShipDate]
-    ,[XMTPart]
-    ,[XMTPSerial]
-    ,[AsLeftQ1]
-    ,[AsLeftQ2]
-    ,[AsLeftQ9]
-    ,[InstallDate]
-    from [UTIL].[TOHOST2GIS_AMI] where [CompletedWorkType] = 'EI'
-	and convert(date, [InstallDate]) <= convert (date, getdate()) and [SentToGIS_Date] is NULL'''
+    partitions = [[] for worker in range(worker_count)]
+    for row in pull_update_return:
+        partition = zlib.crc32('{}'.format(row[facility_index]).encode('utf-8')) % worker_count
+        partitions[partition].append(row)
+
+    if worker_count == 1:
+        return (runPartition(partitions[0], apply_install))
+
+    with ThreadPoolExecutor(max_workers=worker_count) as executor:
+        partition_counts = list(executor.map(runPartition, partitions, [apply_install] * worker_count))
+
+    return (sum(partition_counts))
+
+def runPartition(partition, apply_install):
+#-------------------------------------------------------------------------------
+# Name:        Function - Run Partition
+# Purpose:  Applies one worker's rows in order.  A row that blows up is left
+#           pending for the next run rather than stopping the rest.
+#-------------------------------------------------------------------------------
+
+    partition_count = 0
+
+    if transaction_batch_size > 1:
+        for batch_start in range(0, len(partition), transaction_batch_size):
+            partition_count += runTransactionBatch(partition[batch_start:batch_start + transaction_batch_size], apply_install)
+            print ("\n\nCompleted {0} of {1} updates.\n\n".format(partition_count, len(partition)))
+        return (partition_count)
+
+    for row in partition:
+        try:
+            partition_count += apply_install(row)
+        except Exception as error_apply_return:
+            print ("Status:  Failure to apply install!  Leaving it pending.")
+            print (error_apply_return.args[0])
+
+        print ("\n\nCompleted {0} of {1} updates.\n\n".format(partition_count, len(partition)))
+
+    return (partition_count)
+
+def runTransactionBatch(batch, apply_install):
+#-------------------------------------------------------------------------------
+# Name:        Function - Run Transaction Batch
+# Purpose:  Applies a batch of rows to wServiceConnection in one transaction.
+#           Each row runs behind a savepoint, set with its first write, and is
+#           rolled back to it when it does not complete, so the rest of the
+#           batch still commits.  One commit per batch in place of one per row
+#           is the saving.  The batch's statuses are held until the commit; if
+#           the commit fails, or leaves a transaction open, the whole batch is
+#           left pending.
+#-------------------------------------------------------------------------------
+
+    batch_count = 0
+    start_time = time.time()
+
+    status_writer.hold()
 
     try:
-        query_conn = pyodbc.connect(WebGIS_conn)
-        query_cursor = query_conn.cursor()
-        query_cursor.execute(query_string)
-        pull_update_return = query_cursor.fetchall()
-        query_cursor.close()
-        query_conn.close()
-
-        if len(pull_update_return) == 0:
-            print ("No endpoint installations found.")
-        else:
-            for row in pull_update_return:
-                AccountID = row[0]  ##ProvidedPremiseNumber <compare> accountid
-                MeterManufacturer = row[1] ## FoundMeterManufacturer -> MeterManufacturer
-                MetSerialNum = row[2] ## FoundMeterNumber -> MetSerialNum
-                MetInitialRead = row[3] ##  FoundMeterReading -> MetInitialRead
-                MeterSize = row[4] ## FoundMeterSizeCode -> MeterSize
-                Comments = row[5] ##  Comments -> Comments
-                FacilityID = row[6] ## WorkdOrderNumber = FacilityID
-                XMTInstDate = row [7] ## XMTInstDate -> XMTInstDate
-                XMTMFG = row [8]  ## XMTMFG -> XMTMFG
-                XMTModel = row [9]  ## XMTModel -> XMTModel
-                XMTSerialNum = row [10]  ## XMTSerialNum -> XMTSerialNum
-                XMTMTType = row [11] ## XMTMTType -> XMTMTType
-                XMTShipDate = row [12] ## XMTShipDate -> XMTShipDate
-                XMTPart = row [13] ## XMTPart -> XMTPart
-                XMTPSerial = row [14] ## XMTPSerial -> XMTPSerial
-                AsLeftQ1 = row [15]  ## If NULL, Do not change [InstallDate].  If <> NULL, update [InstallDate] = row [12] and [BoxModel] = row [21]
-                AsLeftQ2 = row [16]  ## If NULL do not update [BoxCover].  If <> NULL, update [BoxCover].
-                AsLeftQ9 = row [17]  ## AsLeftQ9 -> XMTMTType
-
-                print ("Attempting Update of Asset ID: {0}".format(FacilityID))
-                print ("     Found Meter Number: {0}".format(MetSerialNum))
+        with db_pool.connection(UTIL_conn) as batch_conn:
+            merge_batch.conn = batch_conn
+            merge_batch.undo = []
+            merge_batch.opened = False
+            batch_cursor = batch_conn.cursor()
+
+            for row in batch:
+                held_count = status_writer.heldCount()
+                undo_count = len(merge_batch.undo)
+                merge_batch.savepoint = False
+                merge_batch.row_opened = False
 
                 try:
-                    query_string = '''
-                    select [FacilityID] from [UTIL].[wServiceConnection] where [FacilityID] = '{0}' '''.format(FacilityID)
-
-                    query_conn = pyodbc.connect(UTIL_conn)
-                    query_cursor = query_conn.cursor()
-                    query_cursor.execute(query_string)
-                    check_wServiceConnection_return = query_cursor.fetchall()
-                    query_cursor.close()
-                    query_conn.close()
-
-                    if len(check_wServiceConnection_return) == 0:
-                        error_catch = 1
-                    else:
-                        error_catch = 0
-
-
-                except Exception as check_wServiceConnection_return:
-                    print ("Status:  Failure to pull original Service Type!")
-                    print (check_wServiceConnection_return.args[0])
-
-                    error_catch = 1
-
-                    update_string ='''
-                    Update [UTIL].[ToHost2GIS_AMI]
-                    set [SentToGIS_Status] = 'Failure'
-                    , [SentToGIS_Date] = SYSDATETIME()
-                    , [SentToGIS_Confirmed] = 'Pending'
-                    where [WorkOrderNumber] = '{0}' and [XMTSerialNum] = '{1}' and [XMTInstDate] = '{2}' and [SentToGIS_Status] is NULL'''.format(
-                    FacilityID, XMTSerialNum, XMTInstDate)
-
-                    update_conn = pyodbc.connect(WebGIS_conn)
-                    update_cursor = update_conn.cursor()
-                    update_cursor.execute(update_string)
-                    update_conn.commit()
-                    update_cursor.close()
-                    update_conn.close()
-
-                if error_catch == 0:
-
-                    # ADDED 2019 Sept 13 - Addressed PMetSerial issue for bug 980.
-                    #                      Additionally, condensed 3 separate DB
-                    #                      calls into 1 call for 4 items.
-                    try:
-                        query_string = '''select
-                        [XMTSerialNum]
-                        from [UTIL].[wServiceConnection]
-                        where [FacilityID] = {0} '''.format(FacilityID)
-
-                        query_conn = pyodbc.connect(UTIL_conn)
-                        query_cursor = query_conn.cursor()
-                        query_cursor.execute(query_string)
-                        old_wServiceConnectionData_return = query_cursor.fetchall()
-                        query_cursor.close()
-                        query_conn.close()
-
-                        for response in old_wServiceConnectionData_return:
-                            XMTPSerial = response[0]
-
-                        if XMTPSerial == None:
-                            print ("     No transmitter serial number found.\n")
-                            XMTPSerial = 'NULL'
-                        else:
-                            print ("     Transmitter serial number found:  {0}\n".format(XMTPSerial))
-                            XMTPSerial = "'{0}'".format(XMTPSerial)
-
-                    except Exception as old_wServiceConnectionData_return:
-                        print ("Status:  Failure to pull original Meter Variables for Serial Number, Installation Date, Installation Model and Service Type!")
-                        print (old_wServiceConnectionData_return.args[0])
-
-                if error_catch == 0:
-
-                        try:
-                            # Set SQL statement for update based upon current record row.
-                            update_string = '''
-                            Update [UTIL].[wServiceConnection]
-                            set [XMTInstDate] = '{0}'
-                            , [XMTMFG] = '{1}'
-                            , [XMTModel] = '{2}'
-                            , [XMTSerialNum] = '{3}'
-                            , [XMTMTType] = '{4}'
-                            , [XMTShipDate] = '{5}'
-                            , [XMTPart] = '{6}'
-                            , [XMTPSerial] = {7}
-                            , [SysChangeDate] = SYSDATETIME()
-                            , [SysChangeUser] = REPLACE(system_user,'COBNT1\\','')
-                            where [FacilityID] = '{8}' '''.format(XMTInstDate, XMTMFG, XMTModel, XMTSerialNum, XMTMTType,
-                            XMTShipDate, XMTPart, XMTPSerial, FacilityID)
-
-                            update_conn = pyodbc.connect(UTIL_conn)
-                            update_cursor = update_conn.cursor()
-                            update_cursor.execute(update_string)
-                            update_conn.commit()
-                            update_cursor.close()
-                            update_conn.close()
-
-                        except Exception as error_test_accountID_return:
-                            print ("Status:  Failure to push update to record!")
-                            print (error_test_accountID_return.args[0])
-
-                        if AsLeftQ1 is None:
-                            AsLeftQ1 = 'No (Default)'
-
-                        if (AsLeftQ1 != 'No' and AsLeftQ1 != 'No (Default)') and error_catch == 0:
-
-                            try:
-                                # Set SQL statement for update based upon current record row.
-                                update_string = '''
-                                Update [UTIL].[wServiceConnection]
-                                set [InstallDate] = '{0}'
-                                , [BoxModel] = '{1}'
-                                , [SysChangeDate] = SYSDATETIME()
-                                , [SysChangeUser] = REPLACE(system_user,'COBNT1\\','')
-                                where [FacilityID] = '{2}' '''.format(XMTInstDate, AsLeftQ1, FacilityID)
-
-                                print ("    EI Asleft Q1")
-
-                                update_conn = pyodbc.connect(UTIL_conn)
-                                update_cursor = update_conn.cursor()
-                                update_cursor.execute(update_string)
-                                update_conn.commit()
-                                update_cursor.close()
-                                update_conn.close()
-
-
-                            except Exception as error_test_accountID_return:
-                                print ("Status:  Failure to push Q1 update to record!")
-                                print (error_test_accountID_return.args[0])
-
-                        if AsLeftQ2 is None:
-                            AsLeftQ2 = 'No (Default)'
-
-                        if (AsLeftQ2 != 'No' and AsLeftQ2 != 'No (Default)') and error_catch == 0:
-
-                            try:
-                                # Begin update of UTIL.wServiceConnection Box Installation Related.
-
-                                # Set SQL statement for update based upon current record row.
-                                update_string = '''
-                                Update [UTIL].[wServiceConnection]
-                                set [BoxCover] = '{0}'
-                                , [SysChangeDate] = SYSDATETIME()
-                                , [SysChangeUser] = REPLACE(system_user,'COBNT1\\','')
-                                where [FacilityID] = '{1}' '''.format(AsLeftQ2, FacilityID)
-
-                                print ("    EI Asleft Q2")
-
-                                update_conn = pyodbc.connect(UTIL_conn)
-                                update_cursor = update_conn.cursor()
-                                update_cursor.execute(update_string)
-                                update_conn.commit()
-                                update_cursor.close()
-                                update_conn.close()
-
-                            except Exception as error_test_accountID_return:
-                                print ("Status:  Failure to push Q2 update to record!")
-                                print (error_test_accountID_return.args[0])
-
-                        if error_catch == 0:
-
-                            update_string ='''
-                            Update [UTIL].[ToHost2GIS_AMI]
-                            set [SentToGIS_Status] = 'Complete'
-                            , [SentToGIS_Date] = SYSDATETIME()
-                            , [SentToGIS_Confirmed] = 'Yes'
-                            where [WorkOrderNumber] = '{0}' and [XMTSerialNum] = '{1}' and [XMTInstDate] = '{2}' and [SentToGIS_Status] is NULL'''.format(
-                            FacilityID, XMTSerialNum, XMTInstDate)
-
-                            update_conn = pyodbc.connect(WebGIS_conn)
-                            update_cursor = update_conn.cursor()
-                            update_cursor.execute(update_string)
-                            update_conn.commit()
-                            update_cursor.close()
-                            update_conn.close()
-
-                            ei_count += 1
-
-                        print ("\n\nCompleted {0} of {1} remainnig updates of {2} total updates.\n\n".format(ei_count, remaining_updates, pending_update))
-                else:
+                    row_count = apply_install(row)
+                except Exception as error_apply_return:
+                    print ("Status:  Failure to apply install!  Leaving it pending.")
+                    print (error_apply_return.args[0])
+                    status_writer.drop(held_count)
+                    row_count = 0
+
+                # A row that never wrote has nothing of its own to undo.  One
+                # whose write opened the transaction has it to itself.
+                if row_count == 0 and merge_batch.row_opened == True:
+                    batch_conn.rollback()
+                    merge_batch.opened = False
+                    undoServiceState(undo_count)
+                elif row_count == 0 and merge_batch.savepoint == True:
+                    batch_cursor.execute('rollback transaction [merge_row]')
+                    undoServiceState(undo_count)
+
+                batch_count += row_count
+
+            batch_conn.commit()
+
+            # A commit that leaves a transaction open has not saved the batch.
+            batch_cursor.execute('select @@trancount')
+            open_count = int(batch_cursor.fetchall()[0][0])
+            if open_count != 0:
+                raise DatabaseError('Commit left {0} transactions open.'.format(open_count))
+            batch_cursor.close()
+
+    except Exception as error_batch_return:
+        print ("Status:  Failure to commit merge batch!  Leaving {0} installs pending.".format(len(batch)))
+        print (error_batch_return.args[0])
+        undoServiceState(0)
+        status_writer.release(False)
+        return (0)
+
+    finally:
+        merge_batch.conn = None
+        merge_batch.undo = None
+
+    status_writer.release(True)
+
+    elapsed = time.time() - start_time
+    print ("     Batch of {0} committed in {1:.2f}s ({2:.1f} installs/s).".format(len(batch), elapsed, len(batch) / max(elapsed, 0.001)))
+
+    return (batch_count)
+
+def runPipeline(query_string):
+#-------------------------------------------------------------------------------
+# Name:        Function - Run Pipeline
+# Purpose:  Runs the merge as concurrent steps joined by bounded queues.  The
+#           reader pulls the pending rows a keyset chunk at a time and splits
+#           each chunk across pipeline_lanes by FacilityID.  Each lane merges
+#           its share into wServiceConnection with dispatchInstalls on its own
+#           thread and pooled connection, and the status step writes the
+#           statuses back as each share finishes.  Every row for a facility
+#           lands in the same lane, so it still applies in ObjectID order.  A
+#           full queue holds up the step feeding it.
+#-------------------------------------------------------------------------------
+
+    return (asyncio.run(pipelineStages(query_string)))
+
+async def pipelineStages(query_string):
+
+    # Each lane holds a UTIL connection while it applies, so the pool caps them.
+    lane_count = max(1, min(pipeline_lanes, pool_size))
+
+    lane_queues = [asyncio.Queue(maxsize=pipeline_queue_depth) for lane in range(lane_count)]
+    status_queue = asyncio.Queue(maxsize=pipeline_queue_depth * lane_count)
+
+    # The default executor would cap the lanes at its own worker count.
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=lane_count + 2))
+
+    read_task = asyncio.create_task(pipelineRead(query_string, lane_queues))
+    lane_tasks = [asyncio.create_task(pipelineApply(lane_queue, status_queue)) for lane_queue in lane_queues]
+    status_task = asyncio.create_task(pipelineStatus(status_queue, lane_count))
+
+    try:
+        await asyncio.gather(read_task, status_task, *lane_tasks)
+    except Exception:
+        for task in [read_task, status_task] + lane_tasks:
+            task.cancel()
+        raise
+
+    return (sum([lane_task.result() for lane_task in lane_tasks]))
+
+async def pipelineRead(query_string, lane_queues):
+
+    loop = asyncio.get_running_loop()
+    facility_index = pending_columns.index('WorkOrderNumber')
+
+    for chunk in keysetChunks(pending_keys, keyset_chunk_size):
+        read_return = await loop.run_in_executor(None, queryDB, WebGIS_conn, query_string.format(', '.join(['?'] * len(chunk))), chunk)
+
+        lane_rows = [[] for lane_queue in lane_queues]
+        for row in read_return:
+            lane_rows[zlib.crc32('{}'.format(row[facility_index]).encode('utf-8')) % len(lane_queues)].append(row)
+
+        for lane_queue, rows in zip(lane_queues, lane_rows):
+            if len(rows) > 0:
+                await lane_queue.put(rows)
+
+    for lane_queue in lane_queues:
+        await lane_queue.put(None)
+
+    return
+
+async def pipelineApply(lane_queue, status_queue):
+
+    loop = asyncio.get_running_loop()
+    pipeline_count = 0
+
+    while True:
+        read_return = await lane_queue.get()
+        if read_return == None:
+            break
+        pipeline_count += await loop.run_in_executor(None, dispatchInstalls, read_return)
+        await status_queue.put(len(read_return))
+
+    await status_queue.put(None)
+
+    return (pipeline_count)
 
-                    update_string ='''
-                    Update [UTIL].[ToHost2GIS_AMI]
-                    set [SentToGIS_Status] = 'Failure'
-                    , [SentToGIS_Date] = SYSDATETIME()
-                    , [SentToGIS_Confirmed] = 'Pending'
-                    where [WorkOrderNumber] = '{0}' and [XMTSerialNum] = '{1}' and [XMTInstDate] = '{2}' and [SentToGIS_Status] is NULL'''.format(
-                    FacilityID, XMTSerialNum, XMTInstDate)
+async def pipelineStatus(status_queue, lane_count):
 
-                    update_conn = pyodbc.connect(WebGIS_conn)
-                    update_cursor = update_conn.cursor()
-                    update_cursor.execute(update_string)
-                    update_conn.commit()
-                    update_cursor.close()
-                    update_conn.close()
+    loop = asyncio.get_running_loop()
+    lanes_open = lane_count
 
+    while lanes_open > 0:
+        applied_rows = await status_queue.get()
+        if applied_rows == None:
+            lanes_open -= 1
+            continue
+        await loop.run_in_executor(None, status_writer.flush)
+
+    return
+
+# ToHost2GIS_AMI columns read for every pending install, whatever its work
+# type.  Handlers look them up by name.  Dates come back as yyyy-mm-dd text.
+pending_columns = ('ObjectID', 'CompletedWorkType', 'WorkOrderNumber', 'ProvidedPremiseNumber', 'FoundMeterManufacturer',
+    'FoundMeterNumber', 'FoundMeterReading', 'FoundMeterSizeCode', 'NewMeterManufacturer', 'NewMeterModel', 'NewMeterNumber',
+    'NewMeterReading', 'NewMeterNumberOfDials', 'NewMeterSizeCode', 'NewEndpointType', 'Comments', 'InstallDate', 'XMTInstDate',
+    'XMTMFG', 'XMTModel', 'XMTSerialNum', 'XMTMTType', 'XMTShipDate', 'XMTPart', 'XMTPSerial', 'AsLeftQ1', 'AsLeftQ2', 'AsLeftQ9')
+pending_date_columns = ('InstallDate', 'XMTInstDate', 'XMTShipDate')
+
+def mergeInstalls():
+#-------------------------------------------------------------------------------
+# Name:        Function - Merge Installs
+# Purpose:  Reads the run's pending installs of every work type in one scan of
+#           ToHost2GIS_AMI and hands them to dispatchInstalls.
+#-------------------------------------------------------------------------------
+
+    global install_counts
+    install_counts = dict([(install_stage, 0) for install_stage, apply_install in install_handlers.values()])
+
+    if service_state == None:
+        print ("Status:  wServiceConnection prefetch unavailable.  Leaving installs pending.")
+        return (install_counts)
+
+    select_columns = '\n    , '.join([
+        'cast (convert (date, [{0}]) as varchar(10)) as [{0}]'.format(column) if column in pending_date_columns else '[{0}]'.format(column)
+        for column in pending_columns])
+
+    query_string = '''select
+    {0}
+    from [UTIL].[TOHOST2GIS_AMI] where [SentToGIS_Date] is NULL and [ObjectID] in ({{0}})
+    order by [ObjectID]'''.format(select_columns)
+
+    try:
+        if async_pipeline == True and bulk_write == False:
+            runPipeline(query_string)
+            return (install_counts)
+
+        pulled_count = 0
+        for pull_update_return in pendingBatches(query_string):
+            pulled_count += len(pull_update_return)
+            dispatchInstalls(pull_update_return)
+
+        if pulled_count == 0:
+            print ("No installations found.")
 
     except Exception as error_pull_update_return:
         print ("Status:  Failure to pull update return!")
         print (error_pull_update_return.args[0])
-        update_string ='''
-        Update [UTIL].[ToHost2GIS_AMI]
-        set [SentToGIS_Status] = 'Failure'
-        , [SentToGIS_Date] = SYSDATETIME()
-        , [SentToGIS_Confirmed] = 'Pending'
-        where [WorkOrderNumber] = '{0}' and [XMTSerialNum] = '{1}' and [XMTInstDate] = '{2}' and [SentToGIS_Status] is NULL'''.format(
-        FacilityID, XMTSerialNum, XMTInstDate)
-
-        update_conn = pyodbc.connect(WebGIS_conn)
-        update_cursor = update_conn.cursor()
-        update_cursor.execute(update_string)
-        update_conn.commit()
-        update_cursor.close()
-        update_conn.close()
-
-    return (ei_count)
 
-def checkupdated():
+    return (install_counts)
 
-    print ("Entering Check Update Installations---->\n")
+def dispatchInstalls(pull_update_return):
+#-------------------------------------------------------------------------------
+# Name:        Function - Dispatch Installs
+# Purpose:  Sends each pending row to the handler install_handlers registers
+#           for its CompletedWorkType.  Rows are grouped by merge stage and the
+#           stages run in the order they are registered, so meter installs
+#           still land before endpoint installs.  Each stage's count is added
+#           to install_counts and the batch total returned.
+#-------------------------------------------------------------------------------
 
-    global checked_updates
-    global checked_updates_fail
-    checked_updates = 0
-    checked_updates_fail = 0
+    pull_update_return = [dict(zip(pending_columns, row)) for row in pull_update_return]
 
-    query_string = '''select
-    [ProvidedPremiseNumber]
-    ,[NewMeterNumber]
-    from [UTIL].[TOHOST2GIS_AMI] where [CompletedWorkType] = 'MC' and convert(date, [SentToGIS_Date]) = convert (date, getdate()) and [SentToGIS_Status] = 'Complete' and [SentToGIS_Confirmed] = 'Yes' '''
+    if bulk_edit == True:
+        edit_counts = editInstalls(pull_update_return)
+        with change_lock:
+            for install_stage in edit_counts:
+                install_counts[install_stage] += edit_counts[install_stage]
+        return (sum(edit_counts.values()))
+
+    stage_rows = {}
+    for row in pull_update_return:
+        install_stage, apply_install = install_handlers.get(row['CompletedWorkType'], install_handlers['MC'])
+        stage_rows.setdefault(install_stage, []).append(row)
 
-    query_conn = pyodbc.connect(WebGIS_conn)
-    query_cursor = query_conn.cursor()
-    query_cursor.execute(query_string)
-    check_mc_return = query_cursor.fetchall()
-    query_cursor.close()
-    query_conn.close()
+    batch_count = 0
+
+    for install_stage, apply_install in install_handlers.values():
+        if install_stage not in stage_rows:
+            continue
+
+        if bulk_write == True and apply_install == applyMeterInstall:
+            stage_count = bulkMergeMeterInstalls(stage_rows.pop(install_stage))
+        else:
+            stage_count = runMergeWorkers(stage_rows.pop(install_stage), 'WorkOrderNumber', apply_install)
 
-    mc_check = len(check_mc_return)
+        # Pipeline lanes dispatch side by side.
+        with change_lock:
+            install_counts[install_stage] += stage_count
+        batch_count += stage_count
 
-    if mc_check == 0:
-        mc_update = 0
+    return (batch_count)
+
+def applyMeterInstall(row):
+#-------------------------------------------------------------------------------
+# Name:        Function - Apply Meter Install
+# Purpose:  Merges one MC/ME row into wServiceConnection and marks its status.
+#           Returns 1 when the install completed and 0 when it did not.
+#-------------------------------------------------------------------------------
+
+    AccountID = row['ProvidedPremiseNumber']  ##ProvidedPremiseNumber <compare> accountid
+    PMeterManufacturer = row['FoundMeterManufacturer'] ## FoundMeterManufacturer -> PMeterManufacturer
+    PMetSerial = row['FoundMeterNumber'] ## FoundMeterNumber -> PMetSerial
+    PMetFinalRead = row['FoundMeterReading'] ## FoundMeterReading -> PMetFinalRead
+    PMeterSize = row['FoundMeterSizeCode'] ##  FoundMeterSizeCode ->  PMeterSize
+    MeterManufacturer = row['NewMeterManufacturer'] ## NewMeterManufacturer -> MeterManufacturer
+    MetModel = row['NewMeterModel']  ## NewMeterModel -> MetModel
+    MetSerialNum = row['NewMeterNumber'] ## NewMeterNumber -> MetSerialNum
+    MetInitialRead = row['NewMeterReading'] ##  NewMeterReading -> MetInitialRead
+    DialCount = row['NewMeterNumberOfDials'] ##  NewMeterNumberOfDials -> DialCount
+    MeterSize = row['NewMeterSizeCode'] ## NewMeterSizeCode -> MeterSize
+    Comments = row['Comments'] ##  Comments -> Comments
+    FacilityID = row['WorkOrderNumber'] ## WorkdOrderNumber = FacilityID
+    MetInstDate = row['InstallDate'] ##  InstallDate ->  MetInstDate
+    completed_work = row['CompletedWorkType']
+    ObjectID = row['ObjectID']
+
+    if completed_work == 'ME':
+        XMTInstDate = None
+        XMTMFG = 'NA'
+        XMTModel = 'NA'
+        XMTSerialNum = None
+        XMTMTType = 'NA'
+        XMTShipDate = None
+        XMTPart = None
+        XMTPSerial = None
+
+    else:
+        XMTInstDate = row['XMTInstDate'] ## XMTInstDate -> XMTInstDate
+        XMTMFG = row['XMTMFG']  ## XMTMFG -> XMTMFG
+        XMTModel = row['XMTModel']  ## XMTModel -> XMTModel
+        XMTSerialNum = row['XMTSerialNum']  ## XMTSerialNum -> XMTSerialNum
+        XMTMTType = row['XMTMTType'] ## XMTMTType -> XMTMTType
+        XMTShipDate = row['XMTShipDate'] ## XMTShipDate -> XMTShipDate
+        XMTPart = row['XMTPart'] ## XMTPart -> XMTPart
+        XMTPSerial = row['XMTPSerial'] ## XMTPSerial -> XMTPSerial
+
+    AsLeftQ1 = row['AsLeftQ1']  ## If NULL, Do not change [InstallDate].  If <> NULL, update [InstallDate] = InstallDate and [BoxModel] = AsLeftQ1
+    AsLeftQ2 = row['AsLeftQ2']  ## If NULL do not update [BoxCover].  If <> NULL, update [BoxCover]
+    AsLeftQ9 = row['AsLeftQ9']  ## AsLeftQ9 -> XMTMTType
+
+    print ("Attempting Update of Asset ID: {0}".format(FacilityID))
+    print ("     Found Meter Number: {0}".format(PMetSerial))
+
+    if MetModel == None:
+        MetModel = 'None'
     else:
-        mc_update = mc_check
+        MetModel = MetModel
 
-    query_string = '''select
-    [ProvidedPremiseNumber]
-    ,[NewMeterNumber]
-    from [UTIL].[TOHOST2GIS_AMI] where [CompletedWorkType] = 'MC' and convert(date, [SentToGIS_Date]) = convert (date, getdate()) and [SentToGIS_Status] <> 'Complete' and [SentToGIS_Confirmed] <> 'Yes' '''
+    # A NULL reading goes through as NULL rather than failing the batch.
+    if MetInitialRead == None or "." not in MetInitialRead:
+        MetInitialRead = MetInitialRead
+    else:
+        MetInitialRead = '0'
+
+    if AsLeftQ1 is None:
+        AsLeftQ1 = 'No (Default)'
+
+    if AsLeftQ2 is None:
+        AsLeftQ2 = 'No (Default)'
+
+    # Box installation and cover go out with the meter in one update.
+    box_install = 1 if (AsLeftQ1 != 'No' and AsLeftQ1 != 'No (Default)') else 0
+    box_cover = 1 if (AsLeftQ2 != 'No' and AsLeftQ2 != 'No (Default)') else 0
+
+    if box_install == 1:
+        print ("    MC Asleft Q1")
+    if box_cover == 1:
+        print ("    MC Asleft Q2")
+
+    if server_shift == True:
+
+        # The current meter moves into the P* columns inside the update, so
+        # there is nothing to read first.  No row touched means no facility.
+        try:
+            shift_count = executeDB(UTIL_conn, 'meter_shift', (PMeterManufacturer, PMetFinalRead, PMeterSize, MeterManufacturer, MetModel,
+            MetSerialNum, MetInitialRead, DialCount, MeterSize, MetInstDate, XMTInstDate, XMTMFG, XMTModel, XMTSerialNum, XMTMTType,
+            XMTShipDate, XMTPart, box_install, MetInstDate, box_install, AsLeftQ1, box_cover, AsLeftQ2, '{}'.format(FacilityID)))
 
-    query_conn = pyodbc.connect(WebGIS_conn)
-    query_cursor = query_conn.cursor()
-    query_cursor.execute(query_string)
-    check_mc_return = query_cursor.fetchall()
-    query_cursor.close()
-    query_conn.close()
+        except Exception as error_test_accountID_return:
+            print ("Status:  Failure to push update to record!")
+            print (error_test_accountID_return.args[0])
+            status_writer.mark('object', 'Failure', (ObjectID,))
 
-    mc_check = len(check_mc_return)
+            return (0)
 
-    if mc_check == 0:
-        mc_update_fail = 0
+        if shift_count == 0:
+            print ("     Facility not found in wServiceConnection.")
+            status_writer.mark('object', 'Failure', (ObjectID,))
+
+            return (0)
+
+        status_writer.mark('object', 'Complete', (ObjectID,))
+
+        return (1)
+
+    # Current wServiceConnection values come from the prefetch stage.
+    service_row = service_state.get('{}'.format(FacilityID))
+
+    if PMeterManufacturer == None:
+        if service_row == None or service_row[1] == None:
+            print ("     No current manufacturer found.")
+        else:
+            PMeterManufacturer = service_row[1]
+            print ("     Current manufacturer found:  {0}".format(PMeterManufacturer))
+
+    if service_row == None:
+        error_catch = 1
     else:
-        mc_update_fail = mc_check
+        error_catch = 0
 
-    query_string = '''select
-    [ProvidedPremiseNumber]
-    ,[NewMeterNumber]
-    from [UTIL].[TOHOST2GIS_AMI] where [CompletedWorkType] = 'ME' and convert(date, [SentToGIS_Date]) = convert (date, getdate()) and [SentToGIS_Status] = 'Complete' and [SentToGIS_Confirmed] = 'Yes' '''
+    if error_catch == 0:
+
+        # ADDED 2019 Sept 13 - Addressed PMetSerial issue for bug 980.
+        #                      Additionally, condensed 3 separate DB
+        #                      calls into 1 call for 4 items.
+        PMetSerial = service_row[2]
+        if PMetSerial == None:
+            print ("     No Serial Number Found.")
+        else:
+            print ("     Serial Number found:  {0}".format(PMetSerial))
+
+        PMetInstDate = service_row[3]
+        if PMetInstDate == None:
+            print ("     No Installation date found.")
+        else:
+            print ("     Installation date found:  {0}".format(PMetInstDate))
+
+        PMETModel = service_row[4]
+        if PMETModel == None:
+            print ("     No Installation model found.")
+        else:
+            print ("     Meter Model found:  {0}".format(PMETModel))
+
+        PServiceType = service_row[5]
+        if PServiceType == None:
+            print ("     No service type found.")
+        else:
+            print ("     Service type found:  {0}".format(PServiceType))
+
+        XMTPSerial = service_row[6]
+        if XMTPSerial == None:
+            print ("     No transmitter serial number found.\n")
+        else:
+            print ("     Transmitter serial number found:  {0}\n".format(XMTPSerial))
+
+        try:
+            # Begin update of UTIL.wServiceConnection mass data.
+
+            if change_detection == True:
+                applyChanges(FacilityID, installChanges(row, service_row), service_row)
 
-    query_conn = pyodbc.connect(WebGIS_conn)
-    query_cursor = query_conn.cursor()
-    query_cursor.execute(query_string)
-    check_me_return = query_cursor.fetchall()
-    query_cursor.close()
-    query_conn.close()
+            else:
+                executeDB(UTIL_conn, 'meter_install', (PMeterManufacturer, PMetSerial, PMetFinalRead, PMeterSize, PMetInstDate, PMETModel,
+                PServiceType, MeterManufacturer, MetModel, MetSerialNum, MetInitialRead, DialCount, MeterSize, MetInstDate, XMTInstDate,
+                XMTMFG, XMTModel, XMTSerialNum, XMTMTType, XMTShipDate, XMTPart, XMTPSerial,
+                box_install, MetInstDate, box_install, AsLeftQ1, box_cover, AsLeftQ2, '{}'.format(FacilityID)))
+                recordServiceState(FacilityID, installChanges(row, service_row, True), service_row)
+
+        except Exception as error_test_accountID_return:
+            error_catch = 1
+            print ("Status:  Failure to push update to record!")
+            print (error_test_accountID_return.args[0])
+            status_writer.mark('object', 'Failure', (ObjectID,))
+
+            return (0)
+
+        if error_catch == 0:
 
-    me_check = len(check_me_return)
+            status_writer.mark('object', 'Complete', (ObjectID,))
+
+            return (1)
 
-    if me_check == 0:
-        me_update = 0
     else:
-        me_update = me_check
 
-    query_string = '''select
-    [ProvidedPremiseNumber]
-    ,[NewMeterNumber]
-    from [UTIL].[TOHOST2GIS_AMI] where [CompletedWorkType] = 'ME' and convert(date, [SentToGIS_Date]) = convert (date, getdate()) and [SentToGIS_Status] <> 'Complete' and [SentToGIS_Confirmed] <> 'Yes' '''
+        status_writer.mark('object', 'Failure', (ObjectID,))
+
+    return (0)
 
-    query_conn = pyodbc.connect(WebGIS_conn)
-    query_cursor = query_conn.cursor()
-    query_cursor.execute(query_string)
-    check_me_return = query_cursor.fetchall()
-    query_cursor.close()
-    query_conn.close()
+def bulkMergeMeterInstalls(pull_update_return):
+#-------------------------------------------------------------------------------
+# Name:        Function - Bulk Merge Meter Installs
+# Purpose:  Loads the transformed MC/ME batch into a staging table with
+#           fast_executemany and applies it to wServiceConnection with one set
+#           based update joined on FacilityID.  The previous meter columns are
+#           shifted from the current row inside the same statement.
+#-------------------------------------------------------------------------------
+
+    bulk_count = 0
+    stage_passes = []
+    failed_installs = []
+
+    for row in pull_update_return:
+        FacilityID = row['WorkOrderNumber'] ## WorkdOrderNumber = FacilityID
+        MetSerialNum = row['NewMeterNumber'] ## NewMeterNumber -> MetSerialNum
+        MetInstDate = row['InstallDate'] ##  InstallDate ->  MetInstDate
+        ObjectID = row['ObjectID']
+
+        if service_state.get('{}'.format(FacilityID)) == None:
+            failed_installs.append(ObjectID)
+            continue
+
+        MetModel = row['NewMeterModel']  ## NewMeterModel -> MetModel
+        if MetModel == None:
+            MetModel = 'None'
+
+        MetInitialRead = row['NewMeterReading'] ##  NewMeterReading -> MetInitialRead
+        if MetInitialRead != None and "." in MetInitialRead:
+            MetInitialRead = '0'
 
-    me_check = len(check_me_return)
+        if row['CompletedWorkType'] == 'ME':
+            xmt_values = (None, 'NA', 'NA', None, 'NA', None, None)
+        else:
+            xmt_values = tuple([row[column] for column in ('XMTInstDate', 'XMTMFG', 'XMTModel', 'XMTSerialNum', 'XMTMTType', 'XMTShipDate', 'XMTPart')])
+
+        AsLeftQ1 = row['AsLeftQ1']
+        if AsLeftQ1 is None:
+            AsLeftQ1 = 'No (Default)'
+
+        AsLeftQ2 = row['AsLeftQ2']
+        if AsLeftQ2 is None:
+            AsLeftQ2 = 'No (Default)'
+
+        stage_row = (FacilityID, row['FoundMeterManufacturer'], row['FoundMeterReading'], row['FoundMeterSizeCode'],
+                     row['NewMeterManufacturer'], MetModel, MetSerialNum, MetInitialRead, row['NewMeterNumberOfDials'],
+                     row['NewMeterSizeCode'], MetInstDate) + xmt_values + (AsLeftQ1, AsLeftQ2)
+
+        # A FacilityID may only appear once per pass, otherwise the join is
+        # ambiguous.  Repeats roll into the next pass so they apply in order.
+        for stage_pass in stage_passes:
+            if '{}'.format(FacilityID) not in stage_pass:
+                stage_pass['{}'.format(FacilityID)] = (ObjectID, stage_row, row)
+                break
+        else:
+            stage_passes.append({'{}'.format(FacilityID): (ObjectID, stage_row, row)})
+
+    print ("Bulk merge staging {0} installs in {1} pass(es).".format(sum([len(stage_pass) for stage_pass in stage_passes]), len(stage_passes)))
+
+    create_string = '''
+    if object_id('tempdb..#wServiceConnection_Stage') is not null drop table #wServiceConnection_Stage
+    create table #wServiceConnection_Stage (
+    [FacilityID] nvarchar(50) not null
+    , [PMeterManufacturer] nvarchar(255) null
+    , [PMetFinalRead] nvarchar(255) null
+    , [PMeterSize] nvarchar(255) null
+    , [MeterManufacturer] nvarchar(255) null
+    , [MetModel] nvarchar(255) null
+    , [MetSerialNum] nvarchar(255) null
+    , [MetInitialRead] nvarchar(255) null
+    , [DialCount] nvarchar(255) null
+    , [MeterSize] nvarchar(255) null
+    , [MetInstDate] varchar(10) null
+    , [XMTInstDate] varchar(10) null
+    , [XMTMFG] nvarchar(255) null
+    , [XMTModel] nvarchar(255) null
+    , [XMTSerialNum] nvarchar(255) null
+    , [XMTMTType] nvarchar(255) null
+    , [XMTShipDate] varchar(10) null
+    , [XMTPart] nvarchar(255) null
+    , [AsLeftQ1] nvarchar(255) null
+    , [AsLeftQ2] nvarchar(255) null
+    , primary key ([FacilityID]))'''
+
+    insert_string = '''
+    insert into #wServiceConnection_Stage values ({0})'''.format(', '.join(['?'] * 20))
+
+    # An output clause without into is refused on a table with enabled
+    # triggers, which SDE registered tables often have, so the merged
+    # FacilityIDs go through a table variable and are selected back.
+    update_string = '''
+    set nocount on
+    declare @merged table ([FacilityID] nvarchar(50) not null)
+    Update [target]
+    set [PMeterManufacturer] = coalesce([stage].[PMeterManufacturer], [target].[MeterManufacturer])
+    , [PMetSerial] = [target].[MetSerialNum]
+    , [PMetFinalRead] = [stage].[PMetFinalRead]
+    , [PMeterSize] = [stage].[PMeterSize]
+    , [PMetInstDate] = convert (date, [target].[MetInstDate])
+    , [PMETModel] = [target].[MetModel]
+    , [PServiceType] = [target].[ServiceType]
+    , [MeterManufacturer] = [stage].[MeterManufacturer]
+    , [MetModel] = [stage].[MetModel]
+    , [MetSerialNum] = [stage].[MetSerialNum]
+    , [MetInitialRead] = [stage].[MetInitialRead]
+    , [DialCount] = [stage].[DialCount]
+    , [MeterSize] = [stage].[MeterSize]
+    , [MetInstDate] = [stage].[MetInstDate]
+    , [XMTInstDate] = [stage].[XMTInstDate]
+    , [XMTMFG] = [stage].[XMTMFG]
+    , [XMTModel] = [stage].[XMTModel]
+    , [XMTSerialNum] = [stage].[XMTSerialNum]
+    , [XMTMTType] = [stage].[XMTMTType]
+    , [XMTShipDate] = [stage].[XMTShipDate]
+    , [XMTPart] = [stage].[XMTPart]
+    , [XMTPSerial] = [target].[XMTSerialNum]
+    , [InstallDate] = case when [stage].[AsLeftQ1] not in ('No', 'No (Default)') then [stage].[MetInstDate] else [target].[InstallDate] end
+    , [BoxModel] = case when [stage].[AsLeftQ1] not in ('No', 'No (Default)') then [stage].[AsLeftQ1] else [target].[BoxModel] end
+    , [BoxCover] = case when [stage].[AsLeftQ2] not in ('No', 'No (Default)') then [stage].[AsLeftQ2] else [target].[BoxCover] end
+    , [SysChangeDate] = SYSDATETIME()
+    , [SysChangeUser] = REPLACE(system_user,'COBNT1\\','')
+    output inserted.[FacilityID] into @merged
+    from [UTIL].[wServiceConnection] [target]
+    inner join #wServiceConnection_Stage [stage] on [target].[FacilityID] = [stage].[FacilityID]
+    select [FacilityID] from @merged'''
+
+    for stage_pass in stage_passes:
+        try:
+            with db_pool.connection(UTIL_conn) as bulk_conn:
+                bulk_cursor = bulk_conn.cursor()
+                bulk_cursor.fast_executemany = True
+                bulk_cursor.execute(create_string)
+                bulk_cursor.executemany(insert_string, [stage_row for ObjectID, stage_row, row in stage_pass.values()])
+                bulk_cursor.execute(update_string)
+                merged_facilities = set(['{}'.format(response[0]) for response in bulk_cursor.fetchall()])
+                bulk_cursor.execute('drop table #wServiceConnection_Stage')
+                bulk_conn.commit()
+                bulk_cursor.close()
+
+        except Exception as error_bulk_merge_return:
+            print ("Status:  Failure to push bulk update to records!")
+            print (error_bulk_merge_return.args[0])
+            merged_facilities = set()
+
+        for stage_key in stage_pass:
+            ObjectID, stage_row, row = stage_pass[stage_key]
+            if stage_key in merged_facilities:
+                # The next pass and the endpoint stage shift from this write.
+                service_row = service_state[stage_key]
+                recordServiceState(stage_key, installChanges(row, service_row, True), service_row)
+                status_writer.mark('object', 'Complete', (ObjectID,))
+                bulk_count += 1
+            else:
+                failed_installs.append(ObjectID)
+
+    for ObjectID in failed_installs:
+        status_writer.mark('object', 'Failure', (ObjectID,))
 
-    if me_check == 0:
-        me_update_fail = 0
+    print ("\n\nCompleted {0} of {1} updates.\n\n".format(bulk_count, len(pull_update_return)))
+
+    return (bulk_count)
+
+def applyXMITInstall(row):
+#-------------------------------------------------------------------------------
+# Name:        Function - Apply XMIT Install
+# Purpose:  Merges one EI row into wServiceConnection and marks its status.
+#           Returns 1 when the install completed and 0 when it did not.
+#-------------------------------------------------------------------------------
+
+    AccountID = row['ProvidedPremiseNumber']  ##ProvidedPremiseNumber <compare> accountid
+    MeterManufacturer = row['FoundMeterManufacturer'] ## FoundMeterManufacturer -> MeterManufacturer
+    MetSerialNum = row['FoundMeterNumber'] ## FoundMeterNumber -> MetSerialNum
+    MetInitialRead = row['FoundMeterReading'] ##  FoundMeterReading -> MetInitialRead
+    MeterSize = row['FoundMeterSizeCode'] ## FoundMeterSizeCode -> MeterSize
+    Comments = row['Comments'] ##  Comments -> Comments
+    FacilityID = row['WorkOrderNumber'] ## WorkdOrderNumber = FacilityID
+    XMTInstDate = row['XMTInstDate'] ## XMTInstDate -> XMTInstDate
+    XMTMFG = row['XMTMFG']  ## XMTMFG -> XMTMFG
+    XMTModel = row['XMTModel']  ## XMTModel -> XMTModel
+    XMTSerialNum = row['XMTSerialNum']  ## XMTSerialNum -> XMTSerialNum
+    XMTMTType = row['XMTMTType'] ## XMTMTType -> XMTMTType
+    XMTShipDate = row['XMTShipDate'] ## XMTShipDate -> XMTShipDate
+    XMTPart = row['XMTPart'] ## XMTPart -> XMTPart
+    XMTPSerial = row['XMTPSerial'] ## XMTPSerial -> XMTPSerial
+    AsLeftQ1 = row['AsLeftQ1']  ## If NULL, Do not change [InstallDate].  If <> NULL, update [InstallDate] = XMTInstDate and [BoxModel] = AsLeftQ1
+    AsLeftQ2 = row['AsLeftQ2']  ## If NULL do not update [BoxCover].  If <> NULL, update [BoxCover].
+    AsLeftQ9 = row['AsLeftQ9']  ## AsLeftQ9 -> XMTMTType
+    ObjectID = row['ObjectID']
+
+    print ("Attempting Update of Asset ID: {0}".format(FacilityID))
+    print ("     Found Meter Number: {0}".format(MetSerialNum))
+
+    if AsLeftQ1 is None:
+        AsLeftQ1 = 'No (Default)'
+
+    if AsLeftQ2 is None:
+        AsLeftQ2 = 'No (Default)'
+
+    # Box installation and cover go out with the transmitter in one update.
+    box_install = 1 if (AsLeftQ1 != 'No' and AsLeftQ1 != 'No (Default)') else 0
+    box_cover = 1 if (AsLeftQ2 != 'No' and AsLeftQ2 != 'No (Default)') else 0
+
+    if box_install == 1:
+        print ("    EI Asleft Q1")
+    if box_cover == 1:
+        print ("    EI Asleft Q2")
+
+    if server_shift == True:
+
+        # The current transmitter moves into XMTPSerial inside the update.
+        try:
+            shift_count = executeDB(UTIL_conn, 'xmit_shift', (XMTInstDate, XMTMFG, XMTModel, XMTSerialNum, XMTMTType, XMTShipDate, XMTPart,
+            box_install, XMTInstDate, box_install, AsLeftQ1, box_cover, AsLeftQ2, '{}'.format(FacilityID)))
+
+        except Exception as error_test_accountID_return:
+            print ("Status:  Failure to push update to record!")
+            print (error_test_accountID_return.args[0])
+            status_writer.mark('object', 'Failure', (ObjectID,))
+
+            return (0)
+
+        if shift_count == 0:
+            print ("     Facility not found in wServiceConnection.")
+            status_writer.mark('object', 'Failure', (ObjectID,))
+
+            return (0)
+
+        status_writer.mark('object', 'Complete', (ObjectID,))
+
+        return (1)
+
+    # Current wServiceConnection values come from the prefetch stage.
+    service_row = service_state.get('{}'.format(FacilityID))
+
+    if service_row == None:
+        error_catch = 1
     else:
-        me_update_fail = me_check
+        error_catch = 0
 
+    if error_catch == 0:
 
-    query_string = '''select
-    [ProvidedPremiseNumber]
-    ,[XMTSerialNum]
-    from [UTIL].[TOHOST2GIS_AMI] where [CompletedWorkType] = 'EI' and convert(date, [SentToGIS_Date]) = convert (date, getdate()) and [SentToGIS_Status] = 'Complete' and [SentToGIS_Confirmed] = 'Yes' '''
+        # ADDED 2019 Sept 13 - Addressed PMetSerial issue for bug 980.
+        #                      Additionally, condensed 3 separate DB
+        #                      calls into 1 call for 4 items.
+        XMTPSerial = service_row[6]
+
+        if XMTPSerial == None:
+            print ("     No transmitter serial number found.\n")
+        else:
+            print ("     Transmitter serial number found:  {0}\n".format(XMTPSerial))
+
+    if error_catch == 0:
+
+            try:
+                if change_detection == True:
+                    applyChanges(FacilityID, installChanges(row, service_row), service_row)
+
+                else:
+                    executeDB(UTIL_conn, 'xmit_install', (XMTInstDate, XMTMFG, XMTModel, XMTSerialNum, XMTMTType, XMTShipDate, XMTPart,
+                    XMTPSerial, box_install, XMTInstDate, box_install, AsLeftQ1, box_cover, AsLeftQ2, '{}'.format(FacilityID)))
+                    recordServiceState(FacilityID, installChanges(row, service_row, True), service_row)
 
-    query_conn = pyodbc.connect(WebGIS_conn)
-    query_cursor = query_conn.cursor()
-    query_cursor.execute(query_string)
-    check_ei_return = query_cursor.fetchall()
-    query_cursor.close()
-    query_conn.close()
+            except Exception as error_test_accountID_return:
+                error_catch = 1
+                print ("Status:  Failure to push update to record!")
+                print (error_test_accountID_return.args[0])
+                status_writer.mark('object', 'Failure', (ObjectID,))
+
+                return (0)
+
+            if error_catch == 0:
 
-    ei_check = len(check_ei_return)
+                status_writer.mark('object', 'Complete', (ObjectID,))
+
+                return (1)
 
-    if ei_check == 0:
-        ei_update = 0
     else:
-        ei_update = ei_check
 
-    query_string = '''select
-    [ProvidedPremiseNumber]
-    ,[XMTSerialNum]
-    from [UTIL].[TOHOST2GIS_AMI] where [CompletedWorkType] = 'EI' and convert(date, [SentToGIS_Date]) = convert (date, getdate()) and [SentToGIS_Status] <> 'Complete' and [SentToGIS_Confirmed] <> 'Yes' '''
+        status_writer.mark('object', 'Failure', (ObjectID,))
+
+    return (0)
+
+def installChanges(row, service_row, shift_resends=False):
+#-------------------------------------------------------------------------------
+# Name:        Function - Install Changes
+# Purpose:  The wServiceConnection columns one install sets, as (column,
+#           value) pairs, worked out against the facility's current values in
+#           service_row (prefetch order, dates as yyyy-mm-dd text).  The
+#           current meter and transmitter shift into the P* columns unless the
+#           install resends what is already current.  Shared by the row by
+#           row merge and bulk_edit so both write the same values.  With
+#           shift_resends a resend shifts as well, as the fixed install
+#           statements and the bulk merge do.
+#-------------------------------------------------------------------------------
+
+    current_values = dict(zip(service_columns, service_row))
 
-    query_conn = pyodbc.connect(WebGIS_conn)
-    query_cursor = query_conn.cursor()
-    query_cursor.execute(query_string)
-    check_ei_return = query_cursor.fetchall()
-    query_cursor.close()
-    query_conn.close()
+    AsLeftQ1 = row['AsLeftQ1']
+    if AsLeftQ1 is None:
+        AsLeftQ1 = 'No (Default)'
 
-    ei_check = len(check_ei_return)
+    AsLeftQ2 = row['AsLeftQ2']
+    if AsLeftQ2 is None:
+        AsLeftQ2 = 'No (Default)'
+
+    if install_handlers.get(row['CompletedWorkType'], install_handlers['MC'])[1] == applyXMITInstall:
+        install_date = row['XMTInstDate']
+        set_columns = [(column, row[column]) for column in ('XMTInstDate', 'XMTMFG', 'XMTModel', 'XMTSerialNum', 'XMTMTType', 'XMTShipDate', 'XMTPart')]
+
+        # A resent transmitter is already current, so it must not be shifted
+        # over the one it replaced.
+        if shift_resends == True or not sameValue(current_values['XMTSerialNum'], row['XMTSerialNum']):
+            set_columns.append(('XMTPSerial', current_values['XMTSerialNum']))
 
-    if ei_check == 0:
-        ei_update_fail = 0
     else:
-        ei_update_fail = ei_check
+        install_date = row['InstallDate']
+
+        MetModel = row['NewMeterModel']
+        if MetModel == None:
+            MetModel = 'None'
+
+        MetInitialRead = row['NewMeterReading']
+        if MetInitialRead != None and "." in MetInitialRead:
+            MetInitialRead = '0'
+
+        if row['CompletedWorkType'] == 'ME':
+            xmt_values = (None, 'NA', 'NA', None, 'NA', None, None)
+        else:
+            xmt_values = tuple([row[column] for column in ('XMTInstDate', 'XMTMFG', 'XMTModel', 'XMTSerialNum', 'XMTMTType', 'XMTShipDate', 'XMTPart')])
+
+        PMeterManufacturer = row['FoundMeterManufacturer']
+        if PMeterManufacturer == None:
+            PMeterManufacturer = current_values['MeterManufacturer']
+
+        set_columns = [('PMeterManufacturer', PMeterManufacturer), ('PMetSerial', current_values['MetSerialNum']),
+        ('PMetFinalRead', row['FoundMeterReading']), ('PMeterSize', row['FoundMeterSizeCode']),
+        ('PMetInstDate', current_values['MetInstDate']), ('PMETModel', current_values['MetModel']),
+        ('PServiceType', current_values['ServiceType']), ('MeterManufacturer', row['NewMeterManufacturer']), ('MetModel', MetModel),
+        ('MetSerialNum', row['NewMeterNumber']), ('MetInitialRead', MetInitialRead), ('DialCount', row['NewMeterNumberOfDials']),
+        ('MeterSize', row['NewMeterSizeCode']), ('MetInstDate', install_date)]
+        set_columns += list(zip(('XMTInstDate', 'XMTMFG', 'XMTModel', 'XMTSerialNum', 'XMTMTType', 'XMTShipDate', 'XMTPart'), xmt_values))
+        set_columns.append(('XMTPSerial', current_values['XMTSerialNum']))
+
+        # A resent meter is already current, so shifting it into the
+        # previous columns would overwrite the meter it replaced.
+        shifted_columns = []
+        if shift_resends == False and sameValue(current_values['MetSerialNum'], row['NewMeterNumber']):
+            shifted_columns += ['PMetSerial', 'PMetInstDate', 'PMETModel', 'PServiceType']
+            if row['FoundMeterManufacturer'] == None:
+                shifted_columns.append('PMeterManufacturer')
+        if shift_resends == False and sameValue(current_values['XMTSerialNum'], xmt_values[3]):
+            shifted_columns.append('XMTPSerial')
+        set_columns = [(column, value) for column, value in set_columns if column not in shifted_columns]
+
+    if AsLeftQ1 != 'No' and AsLeftQ1 != 'No (Default)':
+        set_columns += [('InstallDate', install_date), ('BoxModel', AsLeftQ1)]
+    if AsLeftQ2 != 'No' and AsLeftQ2 != 'No (Default)':
+        set_columns.append(('BoxCover', AsLeftQ2))
+
+    return (set_columns)
+
+# Handler for each CompletedWorkType, with the merge stage it counts under.  A
+# new work type plugs in with a line here.  Stages run in the order listed
+# within each batch; types not listed go through the meter stage, as every
+# non EI install always has.
+install_handlers = {
+    'MC': ('Meter', applyMeterInstall),
+    'ME': ('Meter', applyMeterInstall),
+    'EI': ('Endpoint', applyXMITInstall)}
+
+def editDate(value):
+#-------------------------------------------------------------------------------
+# Name:        Function - Edit Date
+# Purpose:  Turns a yyyy-mm-dd string from ToHost2GIS_AMI into the datetime
+#           an UpdateCursor date field takes.
+#-------------------------------------------------------------------------------
+
+    if value == None or value == '':
+        return (None)
+
+    return (datetime.strptime('{}'.format(value)[:10], '%Y-%m-%d'))
+
+def applyEdit(service, row, change_user):
+#-------------------------------------------------------------------------------
+# Name:        Function - Apply Edit
+# Purpose:  Applies one pending install to a wServiceConnection row held as a
+#           dict, with the columns installChanges gives the row by row merge.
+#           With change_detection only the columns that differ are set, and an
+#           install already in place sets nothing.  Without it every column is
+#           set and a resend shifts, as the fixed install statements do.  Several installs for one
+#           facility apply in ObjectID order, each against the one before.
+#           SysChangeUser is set to change_user, the login the update
+#           statements record.  Returns the number of columns set.
+#-------------------------------------------------------------------------------
+
+    # Compared as the prefetch hands them over, dates as yyyy-mm-dd text.
+    service_row = tuple([service[column].strftime('%Y-%m-%d') if hasattr(service[column], 'strftime') else service[column]
+        for column in service_columns])
+
+    changes = installChanges(row, service_row, change_detection == False)
+    if change_detection == True:
+        current_values = dict(zip(service_columns, service_row))
+        changes = [(column, value) for column, value in changes if not sameValue(current_values[column], value)]
+
+    if len(changes) == 0:
+        print ("     No changes found.  Skipping update.")
+        with change_lock:
+            change_counts['skipped'] += 1
+        return (0)
+
+    print ("     Changed columns:  {0}".format(', '.join([column for column, value in changes])))
+
+    for column, value in changes:
+        service[column] = editDate(value) if column in service_date_columns else value
+    service['SysChangeDate'] = datetime.now()
+    service['SysChangeUser'] = change_user
+
+    with change_lock:
+        change_counts['written'] += 1
+        change_counts['columns'] += len(changes)
+
+    return (len(changes))
 
-    checked_updates = mc_update + me_update + ei_update
-    checked_updates_fail = mc_update_fail + me_update_fail + ei_update_fail
+# wServiceConnection fields the edit session reads and writes.
+edit_columns = service_columns + ('SysChangeDate', 'SysChangeUser')
 
-    print ("Found {0} completed installations for today.".format(checked_updates))
-    print ("Found {0} failed installations for today.".format(checked_updates_fail))
+def editInstalls(pull_update_return):
+#-------------------------------------------------------------------------------
+# Name:        Function - Edit Installs
+# Purpose:  Applies a batch of installs of every work type through one
+#           arcpy.da.Editor session on UTIL_sde, with an UpdateCursor pass per
+#           keyset_chunk_size FacilityIDs so no where clause grows with the
+#           batch.  The session runs in multiuser mode when wServiceConnection
+#           is versioned.  Statuses are only marked once the session saves, so
+#           a failed save leaves the batch pending.  Returns the count per
+#           merge stage.
+#-------------------------------------------------------------------------------
+
+    edit_counts = {}
+    facility_rows = {}
+    for row in pull_update_return:
+        facility_rows.setdefault('{}'.format(row['WorkOrderNumber']), []).append(row)
+
+    service_connection = UTIL_sde + '\\{0}.{1}'.format(target_schema, target_table)
+
+    edited_facilities = set()
+
+    # The update statements stamp the login without its domain; the edits do
+    # the same so both paths leave one SysChangeUser.
+    change_user = queryDB(UTIL_conn, "select REPLACE(system_user,'COBNT1\\','')")[0][0]
+
+    try:
+        edit = arcpy.da.Editor(UTIL_sde)
+        edit.startEditing(False, arcpy.Describe(service_connection).isVersioned)
+        edit.startOperation()
+
+        try:
+            for chunk in keysetChunks(list(facility_rows), keyset_chunk_size):
+                where_clause = "FacilityID in ({0})".format(', '.join(["'{0}'".format(FacilityID.replace("'", "''")) for FacilityID in chunk]))
+
+                with arcpy.da.UpdateCursor(service_connection, edit_columns, where_clause) as service_cursor:
+                    for service_row in service_cursor:
+                        FacilityID = '{}'.format(service_row[0])
+                        if FacilityID not in facility_rows or FacilityID in edited_facilities:
+                            continue
+
+                        service = dict(zip(edit_columns, service_row))
+                        facility_changes = 0
+                        for row in facility_rows[FacilityID]:
+                            print ("Attempting Update of Asset ID: {0}".format(FacilityID))
+                            facility_changes += applyEdit(service, row, change_user)
+
+                        # A facility whose installs are all in place is not written.
+                        if facility_changes > 0:
+                            service_cursor.updateRow([service[column] for column in edit_columns])
+                        edited_facilities.add(FacilityID)
+
+            edit.stopOperation()
+            edit.stopEditing(True)
+
+        except Exception:
+            edit.abortOperation()
+            edit.stopEditing(False)
+            raise
+
+    except Exception as error_edit_return:
+        print ("Status:  Failure to save the wServiceConnection edit session!  Leaving {0} installs pending.".format(len(pull_update_return)))
+        print (error_edit_return.args[0])
+        return (edit_counts)
+
+    for row in pull_update_return:
+        install_stage = install_handlers.get(row['CompletedWorkType'], install_handlers['MC'])[0]
+        if '{}'.format(row['WorkOrderNumber']) in edited_facilities:
+            status_writer.mark('object', 'Complete', (row['ObjectID'],))
+            edit_counts[install_stage] = edit_counts.get(install_stage, 0) + 1
+        else:
+            status_writer.mark('object', 'Failure', (row['ObjectID'],))
+
+    print ("\n\nEdited {0} of {1} facilities.\n\n".format(len(edited_facilities), len(facility_rows)))
+
+    return (edit_counts)
+
+def checkupdated():
+#-------------------------------------------------------------------------------
+# Name:        Function - Check Updated
+# Purpose:  Counts the run's completed and failed installs per work type with
+#           one grouped aggregate instead of pulling every row back to count it.
+#-------------------------------------------------------------------------------
+
+    print ("Entering Check Update Installations---->\n")
+
+    global checked_updates
+    global checked_updates_fail
+    global checked_breakdown
+    checked_updates = 0
+    checked_updates_fail = 0
+    checked_breakdown = {'MC': (0, 0), 'ME': (0, 0), 'EI': (0, 0)}
+
+    # Only the keyset this run set out to process is counted, so rows that
+    # arrived mid-run do not skew the totals against pending_update.
+    query_string = '''select
+    [CompletedWorkType]
+    , count(case when [SentToGIS_Status] = 'Complete' and [SentToGIS_Confirmed] = 'Yes' then 1 end) as [Complete]
+    , count(case when [SentToGIS_Status] <> 'Complete' and [SentToGIS_Confirmed] <> 'Yes' then 1 end) as [Failure]
+    from [UTIL].[TOHOST2GIS_AMI] where [CompletedWorkType] in ('MC', 'ME', 'EI') and [ObjectID] in ({0})
+    group by [CompletedWorkType]'''
+
+    try:
+        for chunk in keysetChunks(pending_keys, keyset_chunk_size):
+            for row in queryDB(WebGIS_conn, query_string.format(', '.join(['?'] * len(chunk))), chunk):
+                checked_breakdown[row[0]] = (checked_breakdown[row[0]][0] + int(row[1]), checked_breakdown[row[0]][1] + int(row[2]))
+    except Exception as error_check_return:
+        print ("Status:  Failure to count this run's installations!")
+        print (error_check_return.args[0])
+
+    for work_type in ('MC', 'ME', 'EI'):
+        checked_updates += checked_breakdown[work_type][0]
+        checked_updates_fail += checked_breakdown[work_type][1]
+        print ("   {0}:  {1} completed, {2} failed".format(work_type, checked_breakdown[work_type][0], checked_breakdown[work_type][1]))
+
+    print ("Found {0} completed installations for this run.".format(checked_updates))
+    print ("Found {0} failed installations for this run.".format(checked_updates_fail))
 
     print ("Leaving Check Update Installations----< \n\n")
 
-    return (checked_updates, checked_updates_fail)
+    return (checked_updates, checked_updates_fail, checked_breakdown)
 
-def sendcompletetioninfo(pending_update, email_target, mail_server, mail_from, checked_updates, checked_updates_fail, update_attempt_count):
+def sendcompletetioninfo(pending_update, email_target, mail_server, mail_from, checked_updates, checked_updates_fail, update_attempt_count, checked_breakdown=None):
 
     missedupdate = checked_updates_fail
 
     if checked_updates == pending_update and pending_update > 0:
         mail_priority = '5'
-        mail_subject = 'Test Success:  New AMI installations captured successfully'
-        mail_msg = ('{} out of {} meter updates were successfully completed.\n\n[SYSTEM AUTO GENERATED MESSAGE]'.format(checked_updates, pending_update))
+        mail_subject = mail_subject_prefix + 'Success:  New AMI installations captured successfully'
+        mail_msg = ('{} out of {} meter updates were successfully completed.'.format(checked_updates, pending_update))
 
     elif missedupdate == pending_update and pending_update > 0:
         mail_priority = '1'
-        mail_subject = 'Test Failure:  New AMI installs were not captured successfully'
-        mail_msg = ('There was a failure to update {} meters.  Please check the logs and scripts prior to attempting again.\n\n[SYSTEM AUTO GENERATED MESSAGE]'.format(missedupdate))
+        mail_subject = mail_subject_prefix + 'Failure:  New AMI installs were not captured successfully'
+        mail_msg = ('There was a failure to update {} meters.  Please check the logs and scripts prior to attempting again.'.format(missedupdate))
 
     else:
         mail_priority = '3'
-        mail_subject = 'Test Warning:  New AMI Meters were partially added successfully'
+        mail_subject = mail_subject_prefix + 'Warning:  New AMI Meters were partially added successfully'
 
         if missedupdate == 1:
-            mail_msg = ('{} out of {} meter captures were successfully completed. {} was unsuccessful.\n\n[SYSTEM AUTO GENERATED MESSAGE]'.format(checked_updates, pending_update, missedupdate))
+            mail_msg = ('{} out of {} meter captures were successfully completed. {} was unsuccessful.'.format(checked_updates, pending_update, missedupdate))
         else:
-            mail_msg = ('{} out of {} meter captures were successfully completed. {} were unsuccessful.\n\n[SYSTEM AUTO GENERATED MESSAGE]'.format(checked_updates, pending_update, missedupdate))
+            mail_msg = ('{} out of {} meter captures were successfully completed. {} were unsuccessful.'.format(checked_updates, pending_update, missedupdate))
+
+    if checked_breakdown != None:
+        mail_msg = mail_msg + '\n\nBy work type:'
+        for work_type in ('MC', 'ME', 'EI'):
+            mail_msg = mail_msg + '\n   {0}:  {1} completed, {2} failed'.format(work_type, checked_breakdown[work_type][0], checked_breakdown[work_type][1])
+
+    mail_msg = mail_msg + '\n\n[SYSTEM AUTO GENERATED MESSAGE]'
 
     # Set SMTP Server and configuration of message.
     server = smtplib.SMTP(mail_server)
@@ -1081,15 +2608,41 @@ def sendcompletetion_noUpdates(email_target, mail_server, mail_from):
 
     return
 
+def runMerge():
+#-------------------------------------------------------------------------------
+# Name:        Function - Run Merge
+# Purpose:  One full run on the configured backend, from the install date
+#           correction through the completion e-mail.
+#-------------------------------------------------------------------------------
+
+    global status_writer
+
+    connectBackend()
+    status_writer = StatusWriter(status_flush_size)
+
+    # Whatever is still buffered gets written back even if the run dies.
+    atexit.register(status_writer.flush)
+
+    loadWatermark()
+    correctInstallDates()
+    check4udpate ()
+    if pending_update == 0:
+        saveWatermark()
+        sendcompletetion_noUpdates(email_target, mail_server, mail_from)
+    else:
+        mergeODS2GIS()
+        saveWatermark()
+        checkupdated()
+        sendcompletetioninfo(pending_update, email_target, mail_server, mail_from, checked_updates, checked_updates_fail, update_attempt_count, checked_breakdown)
+    db_pool.closeall()
+    if db_backend == 'sde':
+        print ("SDE executors created:  {0}  (per statement: {1})".format(sde_counts['executors'], sde_counts['statements']))
+        print ("SDE commits:  {0}  (per statement: {1})\n".format(sde_counts['commits'], sde_counts['writes']))
+
+    return
+
 # ------ Main ------
 
-correctInstallDates()
-check4udpate ()
-if pending_update == 0:
-    sendcompletetion_noUpdates(email_target, mail_server, mail_from)
-    quit()
-else:
-    mergeODS2GIS()
-    checkupdated()
-    sendcompletetioninfo(pending_update, email_target, mail_server, mail_from, checked_updates, checked_updates_fail, update_attempt_count)
+if __name__ == '__main__':
+    runMerge()
     quit()
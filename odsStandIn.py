@@ -0,0 +1,521 @@
+#-------------------------------------------------------------------------------
+# Name:        ODS Stand In
+# Purpose:  Local stand in for the UTIL and WebGIS databases so the WARP merge
+#           can be timed without touching SQL Server.  A SQLite file plays the
+#           UTIL schema, every statement and commit is held up by a fixed
+#           latency to mimic the network round trip, and the T-SQL the merge
+#           sends is translated into something SQLite will run.
+#
+#           Run this file directly to build a synthetic backlog and time the
+#           pending install predicates before and after the sargable rewrite
+#           and installODSIndexes, then the merge row by row, with
+#           async_pipeline, on the sde backend and at each of
+#           stand_in_batch_sizes.  The sde run is checked against the pyodbc
+#           one row for row.
+#
+# Author:      John Spence
+#
+# Created:  18 October 2026
+# Modified:
+# Modification Purpose:
+#  18 October 2026  Added StandInSDEExecute so the merge can be timed and
+#                   checked on its sde backend as well as pyodbc.
+#
+#
+#-------------------------------------------------------------------------------
+
+# 888888888888888888888888888888888888888888888888888888888888888888888888888888
+# ------------------------------- Configuration --------------------------------
+# Pretty simple setup.  Just change your settings/configuration below.  Do not
+# go below the "DO NOT UPDATE...." line.
+#
+# 888888888888888888888888888888888888888888888888888888888888888888888888888888
+
+# SQLite file used as the UTIL schema.  Rebuilt for every timed run.
+stand_in_db = 'odsStandIn.sqlite'
+
+# Pending installs seeded into ToHost2GIS_AMI.  One in four is an EI.
+stand_in_installs = 400
+
+# Seconds added to every statement and commit.
+stand_in_latency = 0.005
+
+# Installs already sent to GIS seeded ahead of the pending ones for the
+# predicate timings.  Real tables are mostly history.
+stand_in_history = 200000
+
+# Times each predicate is run for the predicate timings.
+stand_in_repeats = 20
+
+# transaction_batch_size values timed against each other.
+stand_in_batch_sizes = (1, 10, 50, 200)
+
+# Keyset chunk size used for the timed runs, so the backlog spans several
+# chunks and the pipeline has something to overlap.
+stand_in_chunk_size = 100
+
+# ------------------------------------------------------------------------------
+# DO NOT UPDATE BELOW THIS LINE OR RISK DOOM AND DISPAIR!  Have a nice day!
+# ------------------------------------------------------------------------------
+
+# Import Python libraries
+import sqlite3, time, re, os, datetime
+
+# Update [alias] set ... from table [alias] inner join (values ...) [batch] (columns) on ...
+update_join = re.compile(
+    r'^\s*update\s+\[(?P<alias>\w+)\]\s+set\s+(?P<set>.*?)\s+from\s+(?P<table>\S+)\s+\[(?P=alias)\]'
+    r'\s+inner\s+join\s+\(values\s+(?P<values>.*)\)\s+\[(?P<batch>\w+)\]\s+\((?P<columns>[^)]*)\)'
+    r'\s+on\s+(?P<on>.*?)(?:\s+where\s+(?P<where>.*?))?\s*$', re.I | re.S)
+
+# save transaction [name] ahead of another statement, with or without an
+# if @@trancount = 0 begin transaction in front of it.
+leading_savepoint = re.compile(r'^\s*(?P<begin>if @@trancount = 0 begin transaction\s+)?save transaction\s+\[?(?P<name>\w+)\]?\s*\n(?=\s*\S)', re.I)
+
+# Statements that open no implicit transaction: the transaction statements
+# themselves and a select that reads no table.
+no_implicit = re.compile(r'^\s*(save transaction|rollback transaction|select\b(?![\s\S]*\bfrom\b))', re.I)
+
+service_columns = ('FacilityID', 'MeterManufacturer', 'MetSerialNum', 'MetInstDate', 'MetModel', 'ServiceType',
+    'PMeterManufacturer', 'PMetSerial', 'PMetFinalRead', 'PMeterSize', 'PMetInstDate', 'PMETModel', 'PServiceType',
+    'MetInitialRead', 'DialCount', 'MeterSize', 'InstallDate', 'BoxModel', 'BoxCover', 'XMTInstDate', 'XMTMFG',
+    'XMTModel', 'XMTSerialNum', 'XMTMTType', 'XMTShipDate', 'XMTPart', 'XMTPSerial', 'SysChangeDate', 'SysChangeUser')
+
+install_columns = ('ProvidedPremiseNumber', 'FoundMeterManufacturer', 'FoundMeterNumber', 'FoundMeterReading',
+    'FoundMeterSizeCode', 'NewMeterManufacturer', 'NewMeterNumber', 'NewMeterReading', 'NewMeterNumberOfDials',
+    'NewMeterSizeCode', 'Comments', 'WorkOrderNumber', 'InstallDate', 'XMTInstDate', 'XMTMFG', 'XMTModel',
+    'XMTSerialNum', 'XMTMTType', 'XMTShipDate', 'XMTPart', 'XMTPSerial', 'AsLeftQ1', 'AsLeftQ2', 'AsLeftQ9',
+    'NewMeterModel', 'NewEndpointType', 'CompletedWorkType', 'WorkEndDatetime', 'SentToGIS_Status',
+    'SentToGIS_Date', 'SentToGIS_Confirmed')
+
+def translateSQL(statement):
+#-------------------------------------------------------------------------------
+# Name:        Function - Translate SQL
+# Purpose:  Rewrites the T-SQL the merge sends into SQLite.  Covers the date
+#           functions, N'' literals, system_user, savepoints and the values join updates.  Temp tables
+#           and output clauses (bulk_write) are not covered.
+#-------------------------------------------------------------------------------
+
+    statement = re.sub(r"(\bN)?('(?:[^']|'')*')", r'\2', statement)
+    statement = re.sub(r'convert\s*\(\s*date\s*,\s*', 'date(', statement, flags=re.I)
+    statement = re.sub(r'getdate\(\)\s*([+-])\s*(\d+)', r"datetime('now', 'localtime', '\1\2 days')", statement, flags=re.I)
+    statement = re.sub(r'getdate\(\)|sysdatetime\(\)', "datetime('now', 'localtime')", statement, flags=re.I)
+    statement = re.sub(r'\bsystem_user\b', "'STANDIN'", statement, flags=re.I)
+    statement = re.sub(r'^\s*save transaction\s+\[?(\w+)\]?\s*$', r'savepoint \1', statement, flags=re.I)
+    statement = re.sub(r'^\s*rollback transaction\s+\[?(\w+)\]?\s*$', r'rollback to \1', statement, flags=re.I)
+
+    match = update_join.match(statement)
+    if match != None:
+        batch_columns = [column.strip() for column in match.group('columns').split(',')]
+        statement = '''update {0} as [{1}] set {2}
+        from (select {3} from (values {4})) as [{5}]
+        where {6}{7}'''.format(
+        match.group('table'), match.group('alias'), match.group('set'),
+        ', '.join(['column{0} as {1}'.format(position + 1, column) for position, column in enumerate(batch_columns)]),
+        match.group('values'), match.group('batch'), match.group('on'),
+        '' if match.group('where') == None else ' and ({0})'.format(match.group('where')))
+
+    return (statement)
+
+class StandInCursor(object):
+#-------------------------------------------------------------------------------
+# Name:        Class - Stand In Cursor
+# Purpose:  Takes pyodbc style execute calls, waits out the latency and runs
+#           the translated statement on SQLite.  Keeps @@TRANCOUNT on the
+#           connection as SQL Server does with implicit transactions on.
+#-------------------------------------------------------------------------------
+
+    def __init__(self, connection, cursor, latency):
+        self.connection = connection
+        self.cursor = cursor
+        self.latency = latency
+        self.fast_executemany = False
+
+    def countTransactions(self, statement):
+        # With implicit transactions on, begin transaction at a count of 0
+        # opens the implicit one as well.
+        if re.match(r'^\s*if @@trancount = 0 begin transaction', statement, re.I) != None:
+            if self.connection.trancount == 0:
+                self.connection.trancount = 2
+            return
+        if re.match(r'^\s*save transaction', statement, re.I) != None and self.connection.trancount == 0:
+            raise sqlite3.OperationalError('Cannot issue SAVE TRANSACTION when there is no active transaction.')
+        if self.connection.trancount == 0 and no_implicit.match(statement) == None:
+            self.connection.trancount = 1
+
+    def execute(self, statement, *params):
+        # pyodbc takes parameters either spread out or as one sequence.
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            params = params[0]
+        time.sleep(self.latency)
+
+        if re.match(r'^\s*select @@trancount\s*$', statement, re.I) != None:
+            self.cursor.execute('select ?', (self.connection.trancount,))
+            return self
+
+        # A savepoint sent in front of a statement shares its round trip.
+        savepoint = leading_savepoint.match(statement)
+        if savepoint != None:
+            if savepoint.group('begin') != None:
+                self.countTransactions(savepoint.group('begin'))
+            self.countTransactions('save transaction')
+            self.cursor.execute('savepoint {0}'.format(savepoint.group('name')))
+            statement = statement[savepoint.end():]
+
+        self.countTransactions(statement)
+        self.cursor.execute(translateSQL(statement), tuple(params))
+        return self
+
+    def executemany(self, statement, param_rows):
+        time.sleep(self.latency)
+        self.countTransactions(statement)
+        self.cursor.executemany(translateSQL(statement), [tuple(param_row) for param_row in param_rows])
+        return self
+
+    @property
+    def rowcount(self):
+        return self.cursor.rowcount
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchmany(self, size):
+        return self.cursor.fetchmany(size)
+
+    def close(self):
+        self.cursor.close()
+
+class StandInConnection(object):
+#-------------------------------------------------------------------------------
+# Name:        Class - Stand In Connection
+# Purpose:  One SQLite connection with the stand in file attached as UTIL.
+#           commit takes @@TRANCOUNT down by one, as SQLEndTran does, and
+#           only saves to SQLite once it reaches 0.  A commit that leaves a
+#           transaction open raises, since on SQL Server that work is lost
+#           when the pool rolls the connection back.
+#-------------------------------------------------------------------------------
+
+    def __init__(self, path, latency):
+        self.latency = latency
+        self.trancount = 0
+        # The pool hands connections between threads, one at a time.
+        self.conn = sqlite3.connect(':memory:', timeout=60, check_same_thread=False)
+        self.conn.execute("attach database ? as UTIL", (path,))
+
+    def cursor(self):
+        return StandInCursor(self, self.conn.cursor(), self.latency)
+
+    def commit(self):
+        time.sleep(self.latency)
+        if self.trancount > 1:
+            self.trancount -= 1
+            raise sqlite3.OperationalError('Stand in check:  commit left {0} transactions open.'.format(self.trancount))
+        self.trancount = 0
+        self.conn.commit()
+
+    def rollback(self):
+        time.sleep(self.latency)
+        self.trancount = 0
+        self.conn.rollback()
+
+    def close(self):
+        self.conn.close()
+
+class StandIn(object):
+#-------------------------------------------------------------------------------
+# Name:        Class - Stand In
+# Purpose:  Hands out stand in connections in place of pyodbc.connect.  Both
+#           UTIL_conn and WebGIS_conn land on the same file.
+#-------------------------------------------------------------------------------
+
+    def __init__(self, path, latency):
+        self.path = path
+        self.latency = latency
+
+    def connect(self, conn_string):
+        time.sleep(self.latency)
+        return StandInConnection(self.path, self.latency)
+
+class StandInSDEExecute(object):
+#-------------------------------------------------------------------------------
+# Name:        Class - Stand In SDE Execute
+# Purpose:  Takes the place of arcpy.ArcSDESQLExecute for the sde backend.
+#           Hands back what ArcSDESQLExecute does: True for a statement with
+#           no result, None for no rows, the value itself for a single value
+#           and a list of rows otherwise.  select @@ROWCOUNT returns the
+#           number of rows the statement before it changed.  Statements
+#           outside startTransaction commit as they go.
+#-------------------------------------------------------------------------------
+
+    def __init__(self, path, latency):
+        time.sleep(latency)
+        self.connection = StandInConnection(path, latency)
+        self.cursor = self.connection.cursor()
+        self.in_transaction = False
+        self.last_rowcount = -1
+
+    def execute(self, statement):
+        # A round trip of its own, like any other statement.
+        if re.match(r'\s*select @@ROWCOUNT\s*$', statement, re.I) != None:
+            time.sleep(self.connection.latency)
+            return (self.last_rowcount)
+
+        self.cursor.execute(statement)
+        self.last_rowcount = self.cursor.rowcount
+        if self.in_transaction == False:
+            self.connection.trancount = 0
+            self.connection.conn.commit()
+
+        if self.cursor.cursor.description == None:
+            return (True)
+
+        sde_rows = self.cursor.fetchall()
+        if len(sde_rows) == 0:
+            return (None)
+        if len(sde_rows) == 1 and len(sde_rows[0]) == 1:
+            return (sde_rows[0][0])
+        return ([list(row) for row in sde_rows])
+
+    def startTransaction(self):
+        # SQLite opens the transaction itself on the first write.
+        self.in_transaction = True
+
+    def commitTransaction(self):
+        self.in_transaction = False
+        self.connection.commit()
+
+    def rollbackTransaction(self):
+        self.in_transaction = False
+        self.connection.rollback()
+
+def buildStandIn(path, install_count, history_count=0):
+#-------------------------------------------------------------------------------
+# Name:        Function - Build Stand In
+# Purpose:  Creates a fresh stand in file with install_count pending installs
+#           in ToHost2GIS_AMI and a matching wServiceConnection row for each.
+#           history_count installs already sent to GIS over the last two years
+#           go in ahead of them.
+#-------------------------------------------------------------------------------
+
+    if os.path.exists(path):
+        os.remove(path)
+
+    build_conn = sqlite3.connect(path)
+
+    # WAL lets a streaming read stay open while the merge writes, much as
+    # SQL Server lets other sessions update rows already read.
+    build_conn.execute('pragma journal_mode=wal')
+
+    build_conn.execute('create table [wServiceConnection] ({0})'.format(', '.join(['[{0}] text'.format(column) for column in service_columns])))
+    build_conn.execute('create index [wServiceConnection_FacilityID] on [wServiceConnection] ([FacilityID])')
+    build_conn.execute('create table [ToHost2GIS_AMI] ([ObjectID] integer primary key, {0})'.format(', '.join(['[{0}] text'.format(column) for column in install_columns])))
+
+    service_rows = []
+    install_rows = []
+
+    for history in range(history_count):
+        sent_date = datetime.datetime.now() - datetime.timedelta(days=history % 730, minutes=history % 1440)
+        history_row = dict.fromkeys(install_columns)
+        history_row.update({'WorkOrderNumber': 'WSH{0:06d}'.format(history), 'CompletedWorkType': ('MC', 'ME', 'EI')[history % 3],
+            'InstallDate': sent_date.strftime('%Y-%m-%d'), 'SentToGIS_Date': sent_date.strftime('%Y-%m-%d %H:%M:%S'),
+            'SentToGIS_Status': 'Complete', 'SentToGIS_Confirmed': 'Yes'})
+        install_rows.append(tuple([history_row[column] for column in install_columns]))
+
+    for install in range(install_count):
+        facility = 'WSC{0:06d}'.format(install)
+        service_rows.append((facility, 'Badger', 'OLD{0:06d}'.format(install), '2001-05-01', 'M25', 'Domestic', 'XO{0:06d}'.format(install)))
+
+        work_type = 'EI' if install % 4 == 3 else 'MC'
+        install_rows.append(('{0}'.format(100000 + install), None, None, '1234', '5/8', 'Sensus', 'NEW{0:06d}'.format(install), '0', '6', '5/8',
+            'Stand in', facility, '2026-10-01', '2026-10-01', 'Sensus', 'SmartPoint', 'XN{0:06d}'.format(install), 'MIU', '2026-09-15',
+            'P520', None, 'Yes' if install % 2 == 0 else None, 'Yes' if install % 3 == 0 else None, None, 'iPERL', 'SmartPoint', work_type,
+            '10012026120000', None, None, None))
+
+    build_conn.executemany('insert into [wServiceConnection] ([FacilityID], [MeterManufacturer], [MetSerialNum], [MetInstDate], [MetModel], [ServiceType], [XMTSerialNum]) values (?, ?, ?, ?, ?, ?, ?)', service_rows)
+    build_conn.executemany('insert into [ToHost2GIS_AMI] ({0}) values ({1})'.format(', '.join(['[{0}]'.format(column) for column in install_columns]), ', '.join(['?'] * len(install_columns))), install_rows)
+    build_conn.commit()
+    build_conn.close()
+
+    return
+
+def standInIndexDDL(index):
+#-------------------------------------------------------------------------------
+# Name:        Function - Stand In Index DDL
+# Purpose:  SQLite version of installODSIndexes.indexDDL.  SQLite has no
+#           include list, so the included columns go on the end of the key.
+#-------------------------------------------------------------------------------
+
+    database, index_name, table, key_columns, include_columns, index_filter = index
+
+    create_string = 'create index [UTIL].[{0}] on [{1}] ({2})'.format(
+    index_name, table, ', '.join(['[{0}]'.format(column) for column in tuple(key_columns) + tuple(include_columns)]))
+
+    if index_filter != None:
+        create_string = create_string + ' where {0}'.format(index_filter)
+
+    return (create_string)
+
+def timePredicates():
+#-------------------------------------------------------------------------------
+# Name:        Function - Time Predicates
+# Purpose:  Times the queries the merge runs on ToHost2GIS_AMI as they were
+#           before the rewrites, as the engine runs them now, and as it runs
+#           them with the indexes from installODSIndexes in place.  The
+#           current forms run as an incremental run would, above a watermark
+#           at the last history row, and the keyset forms against one keyset
+#           chunk of the pending rows.
+#-------------------------------------------------------------------------------
+
+    from installODSIndexes import ods_indexes
+
+    watermark_floor = stand_in_history
+    chunk = list(range(stand_in_history + 1, stand_in_history + 1 + min(stand_in_chunk_size, stand_in_installs)))
+    chunk_list = ', '.join(['?'] * len(chunk))
+
+    # Label, query before, query now, parameters of the query now.
+    predicates = [
+        ('check4udpate count',
+        '''select count(*) from [UTIL].[TOHOST2GIS_AMI]
+        where convert(date, [InstallDate]) <= convert (date, getdate()) and [SentToGIS_Date] is NULL''',
+        '''select count(*) from [UTIL].[TOHOST2GIS_AMI]
+        where [InstallDate] < convert (date, getdate() + 1) and [SentToGIS_Date] is NULL
+        and [ObjectID] > ?''', (watermark_floor,)),
+        ('check4udpate keyset',
+        '''select [ObjectID], [WorkOrderNumber], [CompletedWorkType], [WorkEndDatetime] from [UTIL].[TOHOST2GIS_AMI]
+        where convert(date, [InstallDate]) <= convert (date, getdate()) and [SentToGIS_Date] is NULL''',
+        '''select [ObjectID], [WorkOrderNumber], [CompletedWorkType], [WorkEndDatetime] from [UTIL].[TOHOST2GIS_AMI]
+        where [InstallDate] < convert (date, getdate() + 1) and [SentToGIS_Date] is NULL
+        and [ObjectID] > ?
+        order by [ObjectID]''', (watermark_floor,)),
+        ('keyset lookup',
+        '''select [ObjectID], [WorkOrderNumber], [CompletedWorkType] from [UTIL].[TOHOST2GIS_AMI]
+        where [CompletedWorkType] <> 'EI' and convert(date, [InstallDate]) <= convert (date, getdate()) and [SentToGIS_Date] is NULL''',
+        '''select [ObjectID], [WorkOrderNumber], [CompletedWorkType] from [UTIL].[TOHOST2GIS_AMI]
+        where [SentToGIS_Date] is NULL and [ObjectID] in ({0})
+        order by [ObjectID]'''.format(chunk_list), chunk),
+        ('checkupdated',
+        '''select [CompletedWorkType], count(*) from [UTIL].[TOHOST2GIS_AMI]
+        where [CompletedWorkType] in ('MC', 'ME', 'EI') and convert(date, [SentToGIS_Date]) = convert (date, getdate())
+        group by [CompletedWorkType]''',
+        '''select [CompletedWorkType], count(*) from [UTIL].[TOHOST2GIS_AMI]
+        where [CompletedWorkType] in ('MC', 'ME', 'EI') and [ObjectID] in ({0})
+        group by [CompletedWorkType]'''.format(chunk_list), chunk),
+        ('appendGPS check4udpate',
+        '''select count(*) from [UTIL].[TOHOST2GIS_AMI]
+        where convert(date, [SentToGIS_Date]) >= convert (date, getdate()-0) and [SentToGIS_Status] = 'Complete'
+        ''',
+        '''select count(*) from [UTIL].[TOHOST2GIS_AMI]
+        where [SentToGIS_Date] >= convert (date, getdate()-0) and [SentToGIS_Status] = 'Complete'
+        ''', ())]
+
+    buildStandIn(stand_in_db, stand_in_installs, stand_in_history)
+    bench_conn = StandInConnection(stand_in_db, 0)
+    bench_cursor = bench_conn.cursor()
+
+    def timePredicate(query_string, params=()):
+        start_time = time.time()
+        for repeat in range(stand_in_repeats):
+            bench_cursor.execute(query_string, params).fetchall()
+        return ((time.time() - start_time) / stand_in_repeats * 1000)
+
+    before_timings = [(timePredicate(before), timePredicate(after, params)) for label, before, after, params in predicates]
+
+    for index in ods_indexes:
+        bench_conn.conn.execute(standInIndexDDL(index))
+    bench_conn.conn.execute('analyze UTIL')
+
+    print ("Rows:  {0}  Pending:  {1}  Watermark:  {2}\n".format(stand_in_history + stand_in_installs, stand_in_installs, watermark_floor))
+    print ("{0:<24}{1:>12}{2:>12}{3:>12}{4:>12}".format('Query (ms)', 'Before', 'Rewritten', 'Indexed', 'Speedup'))
+
+    for (label, before, after, params), (before_ms, rewritten_ms) in zip(predicates, before_timings):
+        indexed_ms = timePredicate(after, params)
+        print ("{0:<24}{1:>12.2f}{2:>12.2f}{3:>12.2f}{4:>11.1f}x".format(label, before_ms, rewritten_ms, indexed_ms, before_ms / max(indexed_ms, 0.001)))
+        for plan_row in bench_conn.conn.execute('explain query plan ' + translateSQL(after), tuple(params)):
+            print ("     {0}".format(plan_row[-1]))
+
+    print ("\n")
+
+    bench_conn.close()
+
+    return
+
+def timeMerge(merge, async_pipeline, db_backend='pyodbc'):
+#-------------------------------------------------------------------------------
+# Name:        Function - Time Merge
+# Purpose:  Rebuilds the stand in and times one pass of the merge against it
+#           on db_backend.
+#-------------------------------------------------------------------------------
+
+    buildStandIn(stand_in_db, stand_in_installs)
+
+    if db_backend == 'sde':
+        connect = lambda conn_string: merge.SDEConnection(StandInSDEExecute(stand_in_db, stand_in_latency))
+    else:
+        connect = StandIn(stand_in_db, stand_in_latency).connect
+
+    merge.db_backend = db_backend
+    merge.async_pipeline = async_pipeline
+    merge.watermark_file = ''
+    merge.missing_cache_file = ''
+    merge.keyset_chunk_size = stand_in_chunk_size
+    merge.db_pool = merge.ConnectionManager(merge.pool_size, merge.pool_health_check, connect)
+    merge.status_writer = merge.StatusWriter(merge.status_flush_size)
+
+    start_time = time.time()
+    merge.loadWatermark()
+    merge.check4udpate()
+    merge.mergeODS2GIS()
+    elapsed = time.time() - start_time
+
+    merge.checkupdated()
+    merge.db_pool.closeall()
+
+    return (elapsed)
+
+def snapshotStandIn():
+#-------------------------------------------------------------------------------
+# Name:        Function - Snapshot Stand In
+# Purpose:  Reads back wServiceConnection and the ToHost2GIS_AMI statuses
+#           left by the last timed run, less the change dates, so two runs
+#           can be compared.
+#-------------------------------------------------------------------------------
+
+    snapshot_conn = sqlite3.connect(stand_in_db)
+
+    service_rows = snapshot_conn.execute('select {0} from [wServiceConnection] order by [FacilityID]'.format(
+    ', '.join(['[{0}]'.format(column) for column in service_columns if column != 'SysChangeDate']))).fetchall()
+    status_rows = snapshot_conn.execute('select [ObjectID], [SentToGIS_Status], [SentToGIS_Confirmed] from [ToHost2GIS_AMI] order by [ObjectID]').fetchall()
+
+    snapshot_conn.close()
+
+    return (service_rows, status_rows)
+
+# ------ Main ------
+
+if __name__ == '__main__':
+    timePredicates()
+
+    import mergeODSWARP
+
+    row_elapsed = timeMerge(mergeODSWARP, False)
+    row_snapshot = snapshotStandIn()
+    pipeline_elapsed = timeMerge(mergeODSWARP, True)
+    sde_elapsed = timeMerge(mergeODSWARP, False, 'sde')
+    sde_snapshot = snapshotStandIn()
+
+    print ("Installs:  {0}  Latency:  {1}s".format(stand_in_installs, stand_in_latency))
+    print ("Row by row:  {0:.2f}s".format(row_elapsed))
+    print ("Async pipeline:  {0:.2f}s".format(pipeline_elapsed))
+    print ("Speedup:  {0:.2f}x".format(row_elapsed / pipeline_elapsed))
+    print ("SDE backend row by row:  {0:.2f}s  Matches pyodbc:  {1}\n".format(sde_elapsed, sde_snapshot == row_snapshot))
+
+    batch_timings = []
+    for batch_size in stand_in_batch_sizes:
+        mergeODSWARP.transaction_batch_size = batch_size
+        batch_timings.append(timeMerge(mergeODSWARP, False))
+    mergeODSWARP.transaction_batch_size = 1
+
+    for batch_size, batch_elapsed in zip(stand_in_batch_sizes, batch_timings):
+        print ("Transaction batch {0:>4}:  {1:.2f}s  {2:.1f} installs/s".format(batch_size, batch_elapsed, stand_in_installs / batch_elapsed))